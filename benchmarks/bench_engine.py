@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the comparison engine, with JSON baselines.
+
+Times the engine's per-color entry points on fixed seeded corpora:
+random colors, grays, and hues just either side of the boundaries between
+hue names. Each benchmark reports ops/sec and per-call percentiles. Results
+can be saved as a JSON baseline, and a later run compared against it fails
+(exit status 1) when any benchmark is slower than the baseline by more
+than the tolerance.
+
+Memoized functions have their cache cleared before every pass, and every
+corpus pair is distinct, so the numbers measure the uncached work.
+
+Usage:
+    python benchmarks/bench_engine.py [--size N] [--seed N] [--repeat N]
+        [--filter TEXT] [--save PATH] [--compare PATH] [--tolerance FRACTION]
+"""
+
+import argparse
+import colorsys
+import json
+import os
+import platform
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from utils.color_space import rgb_to_hsl
+from utils.compare_hues import compare_colours
+from utils.comparisonEngine import (
+    calculate_color_similarity,
+    clear_comparison_cache,
+    get_HSL_hue_analysis_first_neutral_only,
+    get_top_color_matches,
+)
+from utils.hues_lists import hues
+
+
+BASELINE_FORMAT = 1
+DEFAULT_TOLERANCE = 0.25
+PERCENTILES = (50, 90, 99)
+
+
+def random_corpus(rng, size):
+    """Uniformly random colors"""
+    return rng.integers(0, 256, (size, 3))
+
+
+def gray_corpus(rng, size):
+    """Grays and near-grays, where hue analysis takes its neutral paths"""
+    level = rng.integers(0, 256, (size, 1))
+    tint = rng.integers(-2, 3, (size, 3)) * (rng.random((size, 1)) < 0.5)
+    return np.clip(level + tint, 0, 255)
+
+
+def boundary_corpus(rng, size, subdivisions=12):
+    """Colors with hues within a degree of the boundaries between hue names"""
+    hue_values = hues[subdivisions][1]
+    boundaries = np.array([(a + b) / 2 for a, b in zip(hue_values, hue_values[1:])])
+    hue = (boundaries[rng.integers(0, len(boundaries), size)] + rng.uniform(-1, 1, size)) % 360
+    lightness = rng.uniform(0.2, 0.8, size)
+    saturation = rng.uniform(0.3, 1.0, size)
+    colors = [colorsys.hls_to_rgb(h / 360, l, s) for h, l, s in zip(hue, lightness, saturation)]
+    return np.rint(np.array(colors) * 255).astype(np.int64)
+
+
+CORPORA = {
+    'random': random_corpus,
+    'grays': gray_corpus,
+    'hue_boundaries': boundary_corpus,
+}
+
+
+def build_corpora(seed, size):
+    """
+    Build the seeded corpora of colors and color pairs.
+
+    Pairs are a corpus color and a nearby color, the common case when
+    comparing a picked color against a slightly tinted version.
+
+    Returns:
+        dict: Corpus name -> (colors, pairs), as lists of int tuples
+    """
+    corpora = {}
+    for index, (name, build) in enumerate(CORPORA.items()):
+        rng = np.random.default_rng([seed, index])
+        colors = build(rng, size)
+        nearby = np.clip(colors + rng.integers(-12, 13, colors.shape), 0, 255)
+        colors = [tuple(color) for color in colors.tolist()]
+        pairs = list(zip(colors, [tuple(color) for color in nearby.tolist()]))
+        corpora[name] = (colors, pairs)
+    return corpora
+
+
+# Benchmark name -> (uses pairs, function of one corpus item)
+BENCHMARKS = {
+    'rgb_to_hsl': (False, lambda color: rgb_to_hsl(*color)),
+    'get_top_color_matches': (False, lambda color: get_top_color_matches(color)),
+    'calculate_color_similarity': (True, lambda pair: calculate_color_similarity(*pair)),
+    'get_HSL_hue_analysis_first_neutral_only': (True, lambda pair: get_HSL_hue_analysis_first_neutral_only(*pair)),
+    'compare_colours': (True, lambda pair: compare_colours(*pair)),
+}
+
+
+def time_each(function, items, repeat):
+    """
+    Time every call of function over items, keeping each item's best time.
+
+    Returns:
+        numpy.ndarray: Best per-call times in seconds, one per item
+    """
+    best = np.full(len(items), np.inf)
+    clock = time.perf_counter
+    for _ in range(repeat):
+        clear_comparison_cache()
+        for i, item in enumerate(items):
+            start = clock()
+            function(item)
+            elapsed = clock() - start
+            if elapsed < best[i]:
+                best[i] = elapsed
+    return best
+
+
+def summarize(times):
+    """ops/sec from the total time plus per-call percentiles in microseconds"""
+    summary = {'ops_per_sec': len(times) / times.sum()}
+    for percentile, value in zip(PERCENTILES, np.percentile(times, PERCENTILES)):
+        summary[f'p{percentile}_us'] = value * 1e6
+    return summary
+
+
+def run_benchmarks(seed=0, size=500, repeat=3, name_filter=None):
+    """
+    Run every benchmark on every corpus.
+
+    Args:
+        seed (int): Corpus random seed
+        size (int): Colors (and pairs) per corpus
+        repeat (int): Passes over each corpus; each call keeps its best time
+        name_filter (str): Only run benchmarks whose "name/corpus" contains this
+
+    Returns:
+        dict: "benchmark/corpus" -> summary with ops_per_sec and percentiles
+    """
+    corpora = build_corpora(seed, size)
+    results = {}
+    for benchmark, (uses_pairs, function) in BENCHMARKS.items():
+        for corpus, (colors, pairs) in corpora.items():
+            key = f"{benchmark}/{corpus}"
+            if name_filter and name_filter not in key:
+                continue
+            results[key] = summarize(time_each(function, pairs if uses_pairs else colors, repeat))
+    return results
+
+
+def find_regressions(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compare results with a baseline's.
+
+    Args:
+        results (dict): Output of run_benchmarks
+        baseline (dict): Baseline "results" mapping in the same format
+        tolerance (float): Allowed slowdown as a fraction of baseline ops/sec
+
+    Returns:
+        list: (key, baseline ops/sec, current ops/sec) for each benchmark
+            slower than the baseline by more than the tolerance
+    """
+    regressions = []
+    for key, summary in results.items():
+        if key not in baseline:
+            continue
+        expected = baseline[key]['ops_per_sec']
+        if summary['ops_per_sec'] < expected * (1 - tolerance):
+            regressions.append((key, expected, summary['ops_per_sec']))
+    return regressions
+
+
+def save_baseline(path, results, seed, size, repeat):
+    """Write results with the settings and environment they were measured in"""
+    baseline = {
+        'format': BASELINE_FORMAT,
+        'settings': {'seed': seed, 'size': size, 'repeat': repeat},
+        'environment': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'system': platform.system(),
+        },
+        'results': results,
+    }
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as baseline_file:
+        json.dump(baseline, baseline_file, indent=2, sort_keys=True)
+
+
+def load_baseline(path):
+    """Read a baseline written by save_baseline"""
+    with open(path, encoding='utf-8') as baseline_file:
+        baseline = json.load(baseline_file)
+    if baseline.get('format') != BASELINE_FORMAT:
+        raise ValueError(f"unsupported baseline format in {path}")
+    return baseline
+
+
+def print_results(results, baseline_results=None):
+    print(f"{'benchmark':<58} {'ops/sec':>10} {'p50 us':>8} {'p90 us':>8} {'p99 us':>8} {'vs base':>8}")
+    for key, summary in results.items():
+        change = ""
+        if baseline_results and key in baseline_results:
+            change = f"{summary['ops_per_sec'] / baseline_results[key]['ops_per_sec'] - 1:+.0%}"
+        print(f"{key:<58} {summary['ops_per_sec']:>10.0f} {summary['p50_us']:>8.1f} "
+              f"{summary['p90_us']:>8.1f} {summary['p99_us']:>8.1f} {change:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the comparison engine against a baseline")
+    parser.add_argument('--size', type=int, default=500, help="colors and pairs per corpus")
+    parser.add_argument('--seed', type=int, default=0, help="corpus random seed")
+    parser.add_argument('--repeat', type=int, default=3, help="passes per corpus; each call keeps its best time")
+    parser.add_argument('--filter', default=None, help="only run benchmarks whose name/corpus contains this")
+    parser.add_argument('--save', metavar='PATH', help="write the results as a JSON baseline")
+    parser.add_argument('--compare', metavar='PATH', help="fail on regressions against this JSON baseline")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown as a fraction of baseline ops/sec (default %(default)s)")
+    args = parser.parse_args()
+
+    baseline = load_baseline(args.compare) if args.compare else None
+    if baseline and baseline['settings'] != {'seed': args.seed, 'size': args.size, 'repeat': args.repeat}:
+        print(f"warning: baseline was measured with {baseline['settings']}", file=sys.stderr)
+
+    results = run_benchmarks(args.seed, args.size, args.repeat, args.filter)
+    print_results(results, baseline['results'] if baseline else None)
+
+    if args.save:
+        save_baseline(args.save, results, args.seed, args.size, args.repeat)
+        print(f"\nBaseline saved to {args.save}")
+
+    if baseline:
+        regressions = find_regressions(results, baseline['results'], args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.tolerance:.0%}:")
+            for key, expected, actual in regressions:
+                print(f"  {key}: {expected:.0f} -> {actual:.0f} ops/sec")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark nearest-name matching and similarity across distance metrics.
+
+Compares Euclidean RGB with the perceptual CIE76 and CIEDE2000 metrics on
+a seeded random corpus, for single lookups and batch naming.
+
+Usage:
+    python benchmarks/bench_metrics.py [--pixels N] [--lookups N] [--seed N]
+"""
+
+import argparse
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from utils.comparisonEngine import (
+    get_css3_palette,
+    _compare_colors,
+    calculate_color_similarity_batch,
+)
+from utils.delta_e import METRICS
+
+
+def time_call(function, repeat=3):
+    """Best wall-clock time of several runs, in seconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare RGB and delta E matching speed")
+    parser.add_argument('--pixels', type=int, default=1 << 18, help="pixels per batch naming run")
+    parser.add_argument('--lookups', type=int, default=2000, help="single-color lookups per run")
+    parser.add_argument('--seed', type=int, default=0, help="corpus random seed")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    palette = get_css3_palette()
+    colors = [tuple(color) for color in rng.integers(0, 256, (args.lookups, 3)).tolist()]
+    pairs = [(color, tuple(np.clip(np.array(color) + rng.integers(-20, 20, 3), 0, 255).tolist())) for color in colors]
+    pixels = rng.integers(0, 256, (args.pixels, 3), dtype=np.uint8)
+    colors1 = np.array([pair[0] for pair in pairs])
+    colors2 = np.array([pair[1] for pair in pairs])
+
+    print(f"{'metric':<10} {'lookup us':>10} {'similarity us':>14} {'batch Mpx/s':>12} {'pair batch us':>14}")
+    for metric in METRICS:
+        lookup = time_call(lambda: [palette.top_matches(color, 3, metric) for color in colors])
+        # The uncached comparison, so repeated runs measure the work itself
+        similarity = time_call(lambda: [_compare_colors(a, b, metric).as_tuple() for a, b in pairs])
+        batch = time_call(lambda: palette.batch_top_matches(pixels, 1, metric=metric))
+        pair_batch = time_call(lambda: calculate_color_similarity_batch(colors1, colors2, metric=metric))
+        print(f"{metric:<10} {lookup / len(colors) * 1e6:>10.1f} {similarity / len(pairs) * 1e6:>14.1f} "
+              f"{len(pixels) / batch / 1e6:>12.2f} {pair_batch / len(pairs) * 1e6:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,73 +1,70 @@
+import argparse
+import sys
 import tkinter as tk
-from tkinter import ttk, messagebox
-import pyautogui
-import webcolors
+from tkinter import ttk, messagebox, filedialog
 import threading
 import time
+import numpy as np
 from PIL import Image, ImageTk
 from PIL.Image import Resampling
-import numpy as np
-import re
 from utils.platform_capture import PlatformScreenCapture
 from utils.macos_permissions import request_permission_if_needed
 from utils.comparisonEngine import calculate_color_similarity, get_simple_color_name
+from utils.color_space import rgb_to_hsl
+from utils.instrumentation import timed
+from utils.preview_scheduler import DEFAULT_MAX_RATE, DEFAULT_MIN_RATE, PreviewScheduler
+from utils.region_sampling import DEFAULT_REGION_SIZE, sample_region
+from utils.palette_registry import (
+    get_palette_registry, load_palette_file, set_active_palette, get_active_palette_name
+)
+
 
+# Screen pixels shown by the magnifier; the same grab gives the color readout
+MAGNIFIER_CAPTURE_SIZE = 15
+# Magnifier window size in pixels, a whole multiple of the capture size
+MAGNIFIER_VIEW_SIZE = 120
 
-def rgb_to_hsl(r, g, b):
+# pyautogui is imported on first use by get_pyautogui(); it is slow to
+# import and needs a display, which batch jobs importing this module lack
+_pyautogui = None
+
+
+def get_pyautogui():
     """
-    Convert RGB values to HSL (Hue, Saturation, Lightness).
-    
-    Args:
-        r, g, b (int): RGB values (0-255)
+    Import pyautogui on first use.
     
     Returns:
-        tuple: (hue, saturation, lightness) where:
-            - hue: 0-360 degrees
-            - saturation: 0-100 percent
-            - lightness: 0-100 percent
+        module: The pyautogui module
     """
-    # Normalize RGB values to 0-1 range
-    r_norm = r / 255.0
-    g_norm = g / 255.0
-    b_norm = b / 255.0
-    
-    # Find max and min values
-    max_val = max(r_norm, g_norm, b_norm)
-    min_val = min(r_norm, g_norm, b_norm)
-    
-    # Calculate lightness
-    lightness = (max_val + min_val) / 2.0
-    
-    # Calculate saturation and hue
-    if max_val == min_val:
-        # Achromatic (gray)
-        saturation = 0.0
-        hue = 0.0
-    else:
-        # Calculate saturation
-        if lightness < 0.5:
-            saturation = (max_val - min_val) / (max_val + min_val)
-        else:
-            saturation = (max_val - min_val) / (2.0 - max_val - min_val)
-        
-        # Calculate hue
-        delta = max_val - min_val
-        
-        if max_val == r_norm:
-            hue = ((g_norm - b_norm) / delta) % 6
-        elif max_val == g_norm:
-            hue = (b_norm - r_norm) / delta + 2
-        else:  # max_val == b_norm
-            hue = (r_norm - g_norm) / delta + 4
-        
-        hue *= 60  # Convert to degrees
+    global _pyautogui
+    if _pyautogui is None:
+        import pyautogui
+        _pyautogui = pyautogui
+    return _pyautogui
+
+
+def upscale_nearest(patch, out):
+    """
+    Nearest-neighbour upscale a patch into a preallocated buffer.
     
-    # Convert to percentages and ensure proper ranges
-    hue = round(hue, 1)
-    saturation = round(saturation * 100, 1)
-    lightness = round(lightness * 100, 1)
+    Every source pixel becomes a scale x scale block, written through a
+    broadcast view so no intermediate arrays are allocated.
+    
+    Args:
+        patch: uint8 array of shape (height, width, channels)
+        out: uint8 array of shape (height * scale, width * scale, channels
+            or more); extra channels (e.g. alpha) are left untouched
     
-    return hue, saturation, lightness
+    Returns:
+        numpy.ndarray: out
+    """
+    height, width, channels = patch.shape
+    scale = out.shape[0] // height
+    if out.shape[0] != height * scale or out.shape[1] != width * scale:
+        raise ValueError("output size must be a whole multiple of the patch size")
+    blocks = out.reshape(height, scale, width, scale, out.shape[2])
+    blocks[..., :channels] = patch[:, None, :, None, :]
+    return out
 
 
 def copy_to_clipboard(text):
@@ -125,6 +122,12 @@ class ColorPicker:
         self.dual_mode = False
         self.dual_pick_stage = 1  # 1 for first pick, 2 for second pick
         self.current_color_2 = None
+        # "pixel", "mean", "median" or "trimmed_mean"; read by the preview thread
+        self.sampling_mode = 'pixel'
+        # Live preview refresh rates: idle floor and while the cursor moves
+        self.preview_min_rate = DEFAULT_MIN_RATE
+        self.preview_max_rate = DEFAULT_MAX_RATE
+        self.preview_scheduler = None
         
         # Font scaling for resizable window
         self.base_font_size = 8
@@ -145,6 +148,9 @@ class ColorPicker:
         self.root.bind('<Configure>', self.on_window_resize)
         self.root.focus_set()
         
+        # Right-click menu for choosing the naming palette
+        self.create_palette_menu()
+        
     def on_window_resize(self, event):
         """Handle window resize events to update font sizes"""
         if event.widget == self.root:
@@ -606,22 +612,8 @@ class ColorPicker:
         # Update hex value 2
         self.hex_label_2.config(text=hex_color.upper())
         
-        # Get color matches (top 3)
-        color_matches = get_simple_color_name(rgb_color)
-        
         # Update the 3 color name labels for second color
-        for i, label in enumerate(self.color_name_labels_2):
-            if i < len(color_matches):
-                simple_name, css_name, distance = color_matches[i]
-                if i == 0:
-                    # Primary match - show CSS name with simple name and distance
-                    display_text = f"{css_name.title()} ({simple_name}, {distance:.0f})"
-                    label.config(text=display_text)
-                else:
-                    display_text = f"{css_name.title()} ({simple_name}, {distance:.0f})"
-                    label.config(text=display_text)
-            else:
-                label.config(text="")
+        self.update_color_name_labels(self.color_name_labels_2, rgb_color)
         
         # Reset cursor
         self.root.config(cursor="")
@@ -630,6 +622,126 @@ class ColorPicker:
         self.copy_rgb_btn_2.config(state="normal")
         self.copy_hex_btn_2.config(state="normal")
     
+    def update_color_name_labels(self, labels, rgb_color):
+        """Show the top color matches in the active palette on a panel's name labels"""
+        # Get color matches (top 3)
+        color_matches = get_simple_color_name(rgb_color)
+        
+        for i, label in enumerate(labels):
+            if i < len(color_matches):
+                # Show palette color name with simple name and distance
+                simple_name, css_name, distance = color_matches[i]
+                label.config(text=f"{css_name.title()} ({simple_name}, {distance:.0f})")
+            else:
+                label.config(text="")
+    
+    def create_palette_menu(self):
+        """Create the right-click menu for choosing the naming palette and sampling mode"""
+        self.palette_choice = tk.StringVar(value=get_active_palette_name())
+        self.sampling_choice = tk.StringVar(value=self.sampling_mode)
+        self.palette_menu = tk.Menu(self.root, tearoff=0, postcommand=self.refresh_palette_menu)
+        # macOS reports the secondary mouse button as Button-2
+        if self.screen_capture.get_info()['os_type'] == 'macos':
+            secondary_button = '<Button-2>'
+        else:
+            secondary_button = '<Button-3>'
+        self.root.bind(secondary_button, lambda event: self.palette_menu.tk_popup(event.x_root, event.y_root))
+    
+    def refresh_palette_menu(self):
+        """Rebuild the palette and sampling entries each time the menu opens"""
+        self.palette_menu.delete(0, "end")
+        self.palette_menu.add_command(label="Naming palette", state="disabled")
+        for name in get_palette_registry().names():
+            self.palette_menu.add_radiobutton(label=name, value=name, variable=self.palette_choice,
+                                              command=lambda name=name: self.select_palette(name))
+        self.palette_menu.add_separator()
+        self.palette_menu.add_command(label="Load palette file...", command=self.load_palette_file)
+        self.palette_menu.add_separator()
+        self.palette_menu.add_command(label="Sampling", state="disabled")
+        size = DEFAULT_REGION_SIZE
+        for mode, label in (('pixel', "Single pixel"), ('mean', f"Mean {size}x{size}"),
+                            ('median', f"Median {size}x{size}"), ('trimmed_mean', f"Trimmed mean {size}x{size}")):
+            self.palette_menu.add_radiobutton(label=label, value=mode, variable=self.sampling_choice,
+                                              command=lambda mode=mode: self.select_sampling_mode(mode))
+    
+    def load_palette_file(self):
+        """Load a JSON or GIMP palette file and make it the naming palette"""
+        path = filedialog.askopenfilename(title="Load palette",
+                                          filetypes=[("Palettes", "*.json *.gpl"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            name = load_palette_file(path)
+        except (OSError, ValueError) as e:
+            self.show_error(f"Could not load palette: {str(e)}")
+            return
+        self.select_palette(name)
+    
+    def select_palette(self, name):
+        """Switch the naming palette and rename the picked colors"""
+        set_active_palette(name)
+        self.palette_choice.set(name)
+        if self.current_color:
+            self.update_color_name_labels(self.color_name_labels, self.current_color)
+        if self.current_color_2:
+            self.update_color_name_labels(self.color_name_labels_2, self.current_color_2)
+        if self.preview_scheduler:
+            self.preview_scheduler.invalidate()
+    
+    def select_sampling_mode(self, mode):
+        """Switch between single-pixel picks and region statistics"""
+        self.sampling_mode = mode
+        self.sampling_choice.set(mode)
+        if self.preview_scheduler:
+            self.preview_scheduler.invalidate()
+    
+    def read_color(self, x, y):
+        """Read the color at the coordinates with the selected sampling mode"""
+        area = self.capture_magnifier_area(x, y)
+        if area is not None:
+            return self.color_from_area(area)
+        return self.screen_capture.get_pixel_color(x, y, magnifier_size=MAGNIFIER_CAPTURE_SIZE)
+    
+    def capture_magnifier_area(self, x, y):
+        """Capture the magnifier area centered on the coordinates, or None if every method fails"""
+        capture_size = MAGNIFIER_CAPTURE_SIZE
+        try:
+            # Use the platform-optimized screen capture
+            screenshot = self.screen_capture.capture_screen_area(x, y, capture_size)
+            
+            if screenshot is None:
+                # If platform capture fails, use basic fallback
+                full_screenshot = get_pyautogui().screenshot()
+                img_width, img_height = full_screenshot.size
+                half_size = capture_size // 2
+                
+                start_x = max(0, min(x - half_size, img_width - capture_size))
+                start_y = max(0, min(y - half_size, img_height - capture_size))
+                end_x = min(img_width, start_x + capture_size)
+                end_y = min(img_height, start_y + capture_size)
+                
+                screenshot = full_screenshot.crop((start_x, start_y, end_x, end_y))
+            return screenshot
+        except Exception:
+            return None
+    
+    def color_from_area(self, area):
+        """Color of a captured magnifier area with the selected sampling mode
+        
+        "pixel" is the center pixel, exactly what the magnifier's center
+        highlight shows; the other modes summarize the central
+        DEFAULT_REGION_SIZE square.
+        """
+        width, height = area.size
+        center_x, center_y = width // 2, height // 2
+        if self.sampling_mode == 'pixel':
+            if area.mode != 'RGB':
+                area = area.convert('RGB')
+            return area.getpixel((center_x, center_y))
+        half = DEFAULT_REGION_SIZE // 2
+        region = area.crop((center_x - half, center_y - half, center_x + half + 1, center_y + half + 1))
+        return sample_region(region).color(self.sampling_mode)
+    
     def clear_color_display_2(self):
         """Clear the second color display"""
         if hasattr(self, 'color_preview_2'):
@@ -655,6 +767,16 @@ class ColorPicker:
         self.mag_canvas = tk.Canvas(self.magnifier, width=120, height=120, bg="black", highlightthickness=2, highlightbackground="red")
         self.mag_canvas.pack()
         
+        # One photo image and canvas item, updated in place every tick. The
+        # PIL image shares the RGBA buffer's memory (alpha stays opaque), so
+        # upscaling into the buffer is all that changes between frames.
+        size = MAGNIFIER_VIEW_SIZE
+        self.mag_buffer = np.full((size, size, 4), 255, dtype=np.uint8)
+        self.mag_buffer[..., :3] = 0
+        self.mag_image = Image.frombuffer('RGBA', (size, size), self.mag_buffer, 'raw', 'RGBA', 0, 1)
+        self.mag_photo = ImageTk.PhotoImage('RGBA', (size, size))
+        self.mag_canvas.create_image(60, 60, image=self.mag_photo, tags="image")
+        
         # Add crosshair lines
         self.mag_canvas.create_line(60, 0, 60, 120, fill="red", width=1, tags="crosshair")
         self.mag_canvas.create_line(0, 60, 120, 60, fill="red", width=1, tags="crosshair")
@@ -665,14 +787,21 @@ class ColorPicker:
         # Position magnifier initially
         self.update_magnifier_position()
     
-    def update_magnifier_position(self):
-        """Update magnifier position and content"""
+    @timed('gui.update_magnifier_position')
+    def update_magnifier_position(self, x=None, y=None, screenshot=None):
+        """Update magnifier position and content
+        
+        The live preview passes the area it already captured for the color
+        readout, so both show the same frame; without it the area under
+        the mouse is captured here.
+        """
         if not self.picking or not self.magnifier:
             return
             
         try:
-            # Get mouse position
-            x, y = pyautogui.position()
+            if x is None:
+                # Get mouse position
+                x, y = get_pyautogui().position()
             
             # Position magnifier window offset from mouse
             mag_x = x + 30
@@ -693,44 +822,19 @@ class ColorPicker:
                 except:
                     pass
             
-            # Platform-aware screenshot approach
-            capture_size = 15
-            
-            try:
-                # Use the platform-optimized screen capture
-                screenshot = self.screen_capture.capture_screen_area(x, y, capture_size)
-                
+            if screenshot is None:
+                screenshot = self.capture_magnifier_area(x, y)
                 if screenshot is None:
-                    # If platform capture fails, use basic fallback
-                    full_screenshot = pyautogui.screenshot()
-                    img_width, img_height = full_screenshot.size
-                    half_size = capture_size // 2
-                    
-                    start_x = max(0, min(x - half_size, img_width - capture_size))
-                    start_y = max(0, min(y - half_size, img_height - capture_size))
-                    end_x = min(img_width, start_x + capture_size)
-                    end_y = min(img_height, start_y + capture_size)
-                    
-                    screenshot = full_screenshot.crop((start_x, start_y, end_x, end_y))
-                    
-            except Exception as e:
-                # Ultimate fallback
-                try:
-                    screenshot = pyautogui.screenshot().crop((x-7, y-7, x+8, y+8))
-                except:
                     return  # Skip this update if all methods fail
             
-            # Resize and display
-            screenshot = screenshot.resize((120, 120), Resampling.NEAREST)
-            self.mag_photo = ImageTk.PhotoImage(screenshot)
-            
-            # Update canvas
-            self.mag_canvas.delete("image")
-            self.mag_canvas.create_image(60, 60, image=self.mag_photo, tags="image")
-            
-            # Bring crosshair and center to front
-            self.mag_canvas.tag_raise("crosshair")
-            self.mag_canvas.tag_raise("center")
+            # Upscale into the persistent buffer and refresh the photo in place
+            if screenshot.mode != 'RGB':
+                screenshot = screenshot.convert('RGB')
+            if screenshot.size != (MAGNIFIER_CAPTURE_SIZE, MAGNIFIER_CAPTURE_SIZE):
+                # Clipped at a screen edge by a fallback capture
+                screenshot = screenshot.resize((MAGNIFIER_CAPTURE_SIZE, MAGNIFIER_CAPTURE_SIZE), Resampling.NEAREST)
+            upscale_nearest(np.asarray(screenshot), self.mag_buffer)
+            self.mag_photo.paste(self.mag_image)
             
         except Exception as e:
             pass  # Ignore errors during magnifier update
@@ -776,24 +880,48 @@ class ColorPicker:
         thread.start()
         
     def show_live_preview(self):
-        """Show live preview of color under mouse"""
+        """Show live preview of color under mouse
+        
+        Frames where neither the cursor nor the captured patch changed are
+        skipped, and the tick rate adapts between the min and max preview
+        rates (see PreviewScheduler).
+        """
+        scheduler = self.preview_scheduler = PreviewScheduler(self.preview_min_rate, self.preview_max_rate)
+        try:
+            self._run_live_preview(scheduler)
+        finally:
+            # Each pick starts a new preview thread; its capture session ends with it
+            self.screen_capture.release_thread_session()
+    
+    def _run_live_preview(self, scheduler):
+        """Preview loop of show_live_preview, until picking stops"""
         while self.picking:
             try:
-                x, y = pyautogui.position()
-                # Use same area size as magnifier for perfect consistency
-                pixel_color = self.screen_capture.get_pixel_color(x, y, magnifier_size=15)
+                x, y = get_pyautogui().position()
+                
+                # One grab per tick feeds both the readout and the magnifier
+                area = self.capture_magnifier_area(x, y)
+                if not scheduler.observe((x, y), area.tobytes() if area is not None else None):
+                    time.sleep(scheduler.interval)
+                    continue
+                
+                if area is not None:
+                    pixel_color = self.color_from_area(area)
+                else:
+                    pixel_color = self.screen_capture.get_pixel_color(x, y, magnifier_size=MAGNIFIER_CAPTURE_SIZE)
                 
                 # Update status with current position
                 self.root.after(0, self.update_preview_status, x, y, pixel_color)
                 
                 # Update magnifier
-                self.root.after(0, self.update_magnifier_position)
+                self.root.after(0, self.update_magnifier_position, x, y, area)
                 
-                time.sleep(0.05)  # Update 20 times per second for smooth magnifier
+                time.sleep(scheduler.interval)
                 
             except Exception as e:
                 break
                 
+    @timed('gui.update_preview_status')
     def update_preview_status(self, x, y, rgb_color):
         """Update status with preview information"""
         if self.picking:
@@ -816,9 +944,11 @@ class ColorPicker:
         """Pick color at current mouse position when spacebar is pressed"""
         if self.picking:
             try:
-                x, y = pyautogui.position()
-                # Use same area size as magnifier for perfect consistency  
-                pixel_color = self.screen_capture.get_pixel_color(x, y, magnifier_size=15)
+                x, y = get_pyautogui().position()
+                pixel_color = self.read_color(x, y)
+                if self.preview_scheduler:
+                    # The preview switches panels in dual mode; show it there right away
+                    self.preview_scheduler.invalidate()
                 
                 if self.dual_mode:
                     if self.dual_pick_stage == 1:
@@ -903,23 +1033,8 @@ class ColorPicker:
         # Update hex value
         self.hex_label.config(text=hex_color.upper())
         
-        # Get color matches (top 3)
-        color_matches = get_simple_color_name(rgb_color)
-        
         # Update the 3 color name labels
-        for i, label in enumerate(self.color_name_labels):
-            if i < len(color_matches):
-                simple_name, css_name, distance = color_matches[i]
-                if i == 0:
-                    # Primary match - show CSS name with simple name and distance
-                    display_text = f"{css_name.title()} ({simple_name}, {distance:.0f})"
-                    label.config(text=display_text)
-                else:
-                    # Secondary matches - show CSS name with simple name and distance
-                    display_text = f"{css_name.title()} ({simple_name}, {distance:.0f})"
-                    label.config(text=display_text)
-            else:
-                label.config(text="")
+        self.update_color_name_labels(self.color_name_labels, rgb_color)
         
         # Reset button and cursor
         self.pick_button.config(state="normal", text="Pick")
@@ -998,7 +1113,18 @@ class ColorPicker:
 
 def main():
     # Disable pyautogui fail-safe (optional)
-    pyautogui.FAILSAFE = False
+    get_pyautogui().FAILSAFE = False
+    
+    # Unknown arguments (e.g. the -psn_... process serial number macOS adds) are ignored
+    parser = argparse.ArgumentParser(description="Pick and compare screen colors")
+    parser.add_argument('--palette', action='append', default=[], metavar='FILE',
+                        help="JSON or GIMP .gpl palette to load; the last one names colors (repeatable)")
+    args, _ = parser.parse_known_args()
+    for path in args.palette:
+        try:
+            set_active_palette(load_palette_file(path))
+        except (OSError, ValueError) as e:
+            print(f"Could not load palette {path}: {e}", file=sys.stderr)
     
     root = tk.Tk()
     app = ColorPicker(root)
@@ -1009,7 +1135,10 @@ def main():
     y = (root.winfo_screenheight() // 2) - (root.winfo_height() // 2)
     root.geometry(f"+{x}+{y}")
     
-    root.mainloop()
+    try:
+        root.mainloop()
+    finally:
+        app.screen_capture.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Headless command-line color naming for image files.
+
+Analyzes image files and directories without a display and writes one
+result per image as JSON Lines or CSV: dominant colors with their names,
+the hue composition, and optionally per-pixel name maps.
+
+Usage:
+    python color_picker_cli.py IMAGE_OR_DIR [...] [--output results.jsonl]
+        [--format jsonl|csv] [--colors 5] [--hue-subdivisions 12]
+        [--metric rgb|cie76|ciede2000] [--palette brand.gpl]
+        [--name-maps DIR] [--workers N] [--tile-pixels N] [--no-recursive]
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+
+from utils.delta_e import METRICS
+from utils.image_batch import (
+    CSV_FIELDS,
+    DEFAULT_TILE_PIXELS,
+    analyze_images,
+    format_csv_row,
+    iter_image_paths,
+)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Name the colors of image files without the GUI")
+    parser.add_argument('paths', nargs='+', help="image files or directories")
+    parser.add_argument('--output', '-o', default=None, help="output file (default: stdout)")
+    parser.add_argument('--format', default='jsonl', choices=('jsonl', 'csv'), help="output format (default: jsonl)")
+    parser.add_argument('--colors', type=int, default=5, help="dominant colors per image (default: 5)")
+    parser.add_argument('--hue-subdivisions', type=int, default=12, choices=(6, 12, 24),
+                        help="hue names for the composition (default: 12)")
+    parser.add_argument('--metric', default='rgb', choices=METRICS, help="naming distance metric (default: rgb)")
+    parser.add_argument('--palette', default=None, help="JSON or GIMP .gpl palette to name colors with")
+    parser.add_argument('--name-maps', default=None, metavar='DIR', help="write per-pixel name maps to DIR")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--tile-pixels', type=int, default=DEFAULT_TILE_PIXELS,
+                        help=f"pixels per processing tile (default: {DEFAULT_TILE_PIXELS})")
+    parser.add_argument('--no-recursive', action='store_true', help="do not descend into subdirectories")
+    args = parser.parse_args(argv)
+
+    output = open(args.output, 'w', encoding='utf-8', newline='') if args.output else sys.stdout
+    writer = None
+    if args.format == 'csv':
+        writer = csv.DictWriter(output, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+
+    start = time.perf_counter()
+    processed = failed = 0
+    try:
+        results = analyze_images(
+            iter_image_paths(args.paths, recursive=not args.no_recursive),
+            workers=args.workers,
+            palette_path=args.palette,
+            colors=args.colors,
+            hue_subdivisions=args.hue_subdivisions,
+            metric=args.metric,
+            name_map_dir=args.name_maps,
+            tile_pixels=args.tile_pixels,
+        )
+        for result in results:
+            processed += 1
+            if 'error' in result:
+                failed += 1
+                print(f"{result['path']}: {result['error']}", file=sys.stderr)
+            if writer:
+                writer.writerow(format_csv_row(result))
+            else:
+                output.write(json.dumps(result) + '\n')
+            output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    print(f"{processed} images ({failed} failed) in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Test script for the engine benchmark suite's corpora and baseline checks
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+from bench_engine import build_corpora, run_benchmarks, find_regressions, save_baseline, load_baseline
+from utils.color_space import rgb_to_hsl
+
+
+def test_corpora_are_seeded():
+    """The same seed gives the same corpora; grays and boundary hues are what they claim"""
+    corpora = build_corpora(seed=1, size=50)
+    assert corpora == build_corpora(seed=1, size=50)
+    assert corpora != build_corpora(seed=2, size=50)
+
+    for color in corpora['grays'][0]:
+        assert max(color) - min(color) <= 4
+    # 12-name boundaries sit halfway between list values, e.g. 15 or 45 degrees
+    boundaries = [15, 45, 70, 100, 135, 165, 187.5, 217.5, 255, 285, 315, 345]
+    for color in corpora['hue_boundaries'][0]:
+        hue = rgb_to_hsl(*color)[0]
+        assert min(min(abs(hue - b), 360 - abs(hue - b)) for b in boundaries) < 3, (color, hue)
+
+
+def test_baseline_round_trip_and_regressions():
+    """Saved baselines load back and slowdowns beyond the tolerance are reported"""
+    results = run_benchmarks(size=5, repeat=1, name_filter='rgb_to_hsl/')
+    assert set(results) == {'rgb_to_hsl/random', 'rgb_to_hsl/grays', 'rgb_to_hsl/hue_boundaries'}
+    for summary in results.values():
+        assert summary['ops_per_sec'] > 0
+        assert summary['p50_us'] <= summary['p90_us'] <= summary['p99_us']
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'baseline.json')
+        save_baseline(path, results, seed=0, size=5, repeat=1)
+        baseline = load_baseline(path)['results']
+    assert find_regressions(results, baseline) == []
+
+    slower = {key: dict(summary, ops_per_sec=summary['ops_per_sec'] * 0.7) for key, summary in results.items()}
+    assert find_regressions(slower, baseline, tolerance=0.5) == []
+    assert len(find_regressions(slower, baseline, tolerance=0.25)) == 3
+
+
+if __name__ == "__main__":
+    test_corpora_are_seeded()
+    test_baseline_round_trip_and_regressions()
+    print("✅ Benchmark suite works")
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test script for the persistent MSS capture session
+"""
+
+import sys
+import os
+import threading
+import types
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.platform_capture import PlatformScreenCapture
+
+
+class _FakeShot:
+    def __init__(self, monitor):
+        self.size = (monitor['width'], monitor['height'])
+        # BGRX bytes of a (10, 20, 30) screen
+        self.bgra = bytes([30, 20, 10, 255]) * (self.size[0] * self.size[1])
+
+    def pixel(self, x, y):
+        return (30, 20, 10)
+
+
+class _FakeSession:
+    """Records grabs; fails once when told to, like a dropped display connection"""
+    opened = []
+
+    def __init__(self):
+        self.monitors = [{'left': 0, 'top': 0, 'width': 1920, 'height': 1080}]
+        self.grabs = 0
+        self.closed = False
+        self.fail_next = False
+        _FakeSession.opened.append(self)
+
+    def grab(self, monitor):
+        if self.closed:
+            raise RuntimeError("session closed")
+        if self.fail_next:
+            self.fail_next = False
+            raise RuntimeError("display connection lost")
+        self.grabs += 1
+        return _FakeShot(monitor)
+
+    def close(self):
+        self.closed = True
+
+
+def _capture_with_fake_mss():
+    sys.modules['mss'] = types.SimpleNamespace(mss=_FakeSession)
+    _FakeSession.opened = []
+    capture = PlatformScreenCapture()
+    capture.capture_method = 'mss'
+    return capture
+
+
+def test_session_reused_and_closed():
+    saved = sys.modules.get('mss')
+    try:
+        with _capture_with_fake_mss() as capture:
+            assert capture.capture_screen_area(100, 100, 5).getpixel((2, 2)) == (10, 20, 30)
+            assert capture.get_pixel_color(100, 100) == (10, 20, 30)
+            assert capture.capture_rectangle(0, 0, 8, 4).size == (8, 4)
+            assert capture.get_virtual_screen() == {'left': 0, 'top': 0, 'width': 1920, 'height': 1080}
+            assert len(_FakeSession.opened) == 1 and _FakeSession.opened[0].grabs == 3
+
+            # A failed grab reconnects once and retries
+            _FakeSession.opened[0].fail_next = True
+            assert capture.get_pixel_color(1, 1) == (10, 20, 30)
+            assert len(_FakeSession.opened) == 2 and _FakeSession.opened[0].closed
+
+            # Each thread gets its own session and closes it when it is done
+            def preview_thread():
+                try:
+                    capture.get_pixel_color(1, 1)
+                finally:
+                    capture.release_thread_session()
+            for _ in range(3):
+                thread = threading.Thread(target=preview_thread)
+                thread.start()
+                thread.join()
+            assert len(_FakeSession.opened) == 5
+            assert all(session.closed for session in _FakeSession.opened[2:])
+
+            # close() leaves other threads' sessions to those threads
+            started, finish = threading.Event(), threading.Event()
+
+            def busy_thread():
+                capture.get_pixel_color(1, 1)
+                started.set()
+                finish.wait(timeout=30)
+                capture.release_thread_session()
+            thread = threading.Thread(target=busy_thread)
+            thread.start()
+            assert started.wait(timeout=30)
+            capture.close()
+            assert _FakeSession.opened[1].closed and not _FakeSession.opened[5].closed
+            finish.set()
+            thread.join()
+        assert all(session.closed for session in _FakeSession.opened)
+
+        # Capturing after close() opens a fresh session
+        assert capture.get_pixel_color(1, 1) == (10, 20, 30)
+        assert len(_FakeSession.opened) == 7
+        capture.close()
+    finally:
+        if saved is None:
+            sys.modules.pop('mss', None)
+        else:
+            sys.modules['mss'] = saved
+
+
+def test_grabs_fit_the_virtual_screen():
+    """Grabs past the desktop edge are shifted (magnifier) or clipped (rectangles)"""
+    saved = sys.modules.get('mss')
+    try:
+        with _capture_with_fake_mss() as capture:
+            grabs = []
+            session = capture._get_mss_session()
+            grab = session.grab
+            session.grab = lambda monitor: grabs.append(dict(monitor)) or grab(monitor)
+
+            assert capture.capture_screen_area(1918, 2, 5).size == (5, 5)
+            assert grabs[-1] == {'top': 0, 'left': 1915, 'width': 5, 'height': 5}
+            assert capture.capture_rectangle(1900, 1070, 40, 40).size == (20, 10)
+            assert grabs[-1] == {'top': 1070, 'left': 1900, 'width': 20, 'height': 10}
+            assert capture.capture_rectangle(-50, 0, 20, 20) is None
+            assert len(grabs) == 2
+    finally:
+        if saved is None:
+            sys.modules.pop('mss', None)
+        else:
+            sys.modules['mss'] = saved
+
+
+if __name__ == "__main__":
+    test_session_reused_and_closed()
+    test_grabs_fit_the_virtual_screen()
+    print("✅ Persistent capture session works")
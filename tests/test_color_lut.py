@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test script for the exhaustive 24-bit nearest-color lookup table
+"""
+
+import sys
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from utils.color_lut import build_lookup_table, load_lookup_table, get_lut_path
+from utils.comparisonEngine import get_css3_palette, get_color_names_batch
+from utils.palette_index import PaletteIndex
+
+
+class _StopBuild(Exception):
+    pass
+
+
+def test_interrupted_build_resumes():
+    """An interrupted build resumes and matches the batch matcher"""
+    palette = get_css3_palette()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        path = get_lut_path(palette, cache_dir)
+
+        def stop_after_some_blocks(done, total):
+            if done == 10:
+                raise _StopBuild()
+
+        try:
+            build_lookup_table(palette, path, workers=1, progress=stop_after_some_blocks)
+        except _StopBuild:
+            pass
+        assert not os.path.exists(path)
+        assert os.path.exists(path + '.progress')
+
+        resumed_blocks = []
+        build_lookup_table(palette, path, workers=1, progress=lambda done, total: resumed_blocks.append(done))
+        assert resumed_blocks[0] == 11
+        assert not os.path.exists(path + '.partial')
+
+        lookup_table = load_lookup_table(palette, path, build=False)
+        rng = np.random.default_rng(7)
+        pixels = np.vstack([rng.integers(0, 256, (20000, 3), dtype=np.uint8), palette.rgb])
+        css_indices, simple_indices = lookup_table.lookup(pixels)
+        expected_css, expected_simple, _ = get_color_names_batch(pixels)
+        assert (css_indices == expected_css[:, 0]).all()
+        assert (simple_indices == expected_simple[:, 0]).all()
+        del lookup_table, css_indices, simple_indices
+
+
+def _build_small_table(path):
+    palette = PaletteIndex(['black', 'white'], [(0, 0, 0), (255, 255, 255)], ['black', 'white'])
+    return build_lookup_table(palette, path, workers=1)
+
+
+def test_concurrent_builds():
+    """Processes building the same table at once all get the finished table"""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        path = os.path.join(cache_dir, 'lut', 'small.u8')
+        with ProcessPoolExecutor(3) as executor:
+            assert list(executor.map(_build_small_table, [path] * 3)) == [path] * 3
+        assert not os.path.exists(path + '.partial')
+        assert not os.path.exists(path + '.progress')
+
+        palette = PaletteIndex(['black', 'white'], [(0, 0, 0), (255, 255, 255)], ['black', 'white'])
+        lookup_table = load_lookup_table(palette, path, build=False)
+        css_indices, _ = lookup_table.lookup(np.array([[10, 10, 10], [250, 240, 245]], dtype=np.uint8))
+        assert [palette.names[i] for i in css_indices] == ['black', 'white']
+        del lookup_table
+
+
+def test_cache_path_tracks_palette():
+    """Different palette contents map to different cache files"""
+    palette = get_css3_palette()
+    other = type(palette)(['black', 'white'], [(0, 0, 0), (255, 255, 255)], ['black', 'white'])
+    assert get_lut_path(palette, 'cache') != get_lut_path(other, 'cache')
+    assert get_lut_path(palette, 'cache') != get_lut_path(palette, 'cache', metric='ciede2000')
+    assert load_lookup_table(other, os.path.join(tempfile.gettempdir(), 'missing.u8'), build=False) is None
+
+
+if __name__ == "__main__":
+    test_interrupted_build_resumes()
+    test_concurrent_builds()
+    test_cache_path_tracks_palette()
+    print("✅ Lookup table build, resume and lookup work")
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Test script for the local HTTP/JSON color-analysis service
+"""
+
+import sys
+import os
+import asyncio
+import http.client
+import json
+import socket
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from PIL import Image
+
+from utils import instrumentation
+from utils.color_service import ColorService
+from utils.comparisonEngine import calculate_color_similarity, get_top_color_matches
+
+
+def _start_service():
+    """Run a service on a free port in a background event loop"""
+    # A long batch window makes the concurrent requests below batch reliably
+    service = ColorService(port=0, workers=1, batch_delay=0.2)
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    asyncio.run_coroutine_threadsafe(service.start(), loop).result(timeout=30)
+    return service, loop
+
+
+def _stop_service(service, loop):
+    asyncio.run_coroutine_threadsafe(service.close(), loop).result(timeout=30)
+    loop.call_soon_threadsafe(loop.stop)
+
+
+def _request(port, method, path, payload=None):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    try:
+        body = json.dumps(payload) if payload is not None else None
+        connection.request(method, path, body, {'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+
+def test_rejects_non_local_host():
+    try:
+        ColorService(host='0.0.0.0')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("binding to all interfaces must be refused")
+
+
+def test_service_endpoints():
+    """Endpoints match the engine functions and concurrent requests are batched"""
+    instrumentation.reset()
+    service, loop = _start_service()
+    try:
+        port = service.port
+        assert _request(port, 'GET', '/health') == (200, {'status': 'ok'})
+
+        colors = [(255, 128, 0), (12, 34, 56), (200, 200, 210), (0, 255, 0)]
+        with ThreadPoolExecutor(len(colors)) as pool:
+            responses = list(pool.map(
+                lambda color: _request(port, 'POST', '/v1/names', {'color': color, 'top_n': 2}), colors))
+        for color, (status, response) in zip(colors, responses):
+            assert status == 200
+            expected = [[s, n, d] for s, n, d in get_top_color_matches(color, 2)]
+            assert [[s, n] for s, n, _ in response['matches'][0]] == [[s, n] for s, n, _ in expected]
+            assert np.allclose([d for _, _, d in response['matches'][0]], [d for _, _, d in expected], atol=1e-3)
+
+        counters = _request(port, 'GET', '/v1/stats')[1]['counters']
+        assert counters['service.names.batched_requests'] == len(colors)
+        assert counters['service.names.batches'] < len(colors)
+
+        pair = [[128, 128, 128], [150, 128, 100]]
+        status, response = _request(port, 'POST', '/v1/similarity', {'pairs': [pair]})
+        assessment_text, display_color, clipboard_text = calculate_color_similarity(*map(tuple, pair))
+        assert status == 200
+        assert response['results'][0]['assessment_text'] == assessment_text
+        assert response['results'][0]['clipboard_text'] == clipboard_text
+        assert response['results'][0]['display_color'] == display_color
+
+        pixels = np.full((5, 5, 3), (10, 20, 30)).tolist()
+        status, response = _request(port, 'POST', '/v1/region', {'pixels': pixels, 'colors': 2})
+        assert status == 200
+        assert response['sample']['median'] == [10, 20, 30]
+        assert response['dominant_colors'][0]['rgb'] == [10, 20, 30]
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'flat.png')
+            Image.new('RGB', (32, 16), (255, 0, 0)).save(path)
+            status, response = _request(port, 'POST', '/v1/image', {'path': path, 'colors': 1})
+        assert status == 200
+        assert (response['width'], response['height']) == (32, 16)
+        assert response['dominant_colors'][0]['name'] == 'red'
+
+        assert _request(port, 'POST', '/v1/names', {'color': [300, 0, 0]})[0] == 400
+        assert _request(port, 'POST', '/v1/names', {'color': [1, 2, 3], 'palette': 'missing'})[0] == 400
+        assert _request(port, 'POST', '/v1/image', {'path': '/no/such/file.png'})[0] == 404
+        assert _request(port, 'GET', '/v1/names')[0] == 405
+        assert _request(port, 'GET', '/v1/unknown')[0] == 404
+
+        timers = _request(port, 'GET', '/v1/stats')[1]['timers']
+        assert timers['service.names']['count'] == len(colors) + 2
+        assert 'p90_ms' in timers['service.image']
+    finally:
+        _stop_service(service, loop)
+        instrumentation.disable()
+        instrumentation.reset()
+
+
+def test_region_response_ends_with_eof():
+    """A closing first region request reaches EOF; workers hold no sockets"""
+    service, loop = _start_service()
+    try:
+        body = json.dumps({'pixels': np.full((3, 3, 3), 40).tolist(), 'colors': 1}).encode()
+        with socket.create_connection(('127.0.0.1', service.port), timeout=30) as connection:
+            connection.sendall(b"POST /v1/region HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n"
+                               + f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+            response = b""
+            while True:
+                chunk = connection.recv(65536)
+                if not chunk:
+                    break
+                response += chunk
+        head, _, payload = response.partition(b"\r\n\r\n")
+        assert head.startswith(b"HTTP/1.1 200")
+        assert json.loads(payload)['sample']['median'] == [40, 40, 40]
+    finally:
+        _stop_service(service, loop)
+        instrumentation.disable()
+        instrumentation.reset()
+
+
+def test_batches_do_not_block_the_loop():
+    """Other requests are served while a batch is being computed"""
+    service, loop = _start_service()
+    compute = service._similarity.compute
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_compute(key, pairs):
+        started.set()
+        release.wait(timeout=30)
+        return compute(key, pairs)
+
+    service._similarity.compute = slow_compute
+    try:
+        port = service.port
+        with ThreadPoolExecutor(1) as pool:
+            pending = pool.submit(_request, port, 'POST', '/v1/similarity',
+                                  {'pairs': [[[0, 0, 0], [10, 0, 0]]]})
+            assert started.wait(timeout=30)
+            assert _request(port, 'GET', '/health') == (200, {'status': 'ok'})
+            assert not pending.done()
+            release.set()
+            status, response = pending.result(timeout=30)
+        assert status == 200
+        assert response['results'][0]['distance'] == 10.0
+    finally:
+        release.set()
+        _stop_service(service, loop)
+        instrumentation.disable()
+        instrumentation.reset()
+
+
+if __name__ == "__main__":
+    test_rejects_non_local_host()
+    test_service_endpoints()
+    test_region_response_ends_with_eof()
+    test_batches_do_not_block_the_loop()
+    print("✅ Color service works")
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test script for the vectorized color similarity comparison
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from utils.comparisonEngine import calculate_color_similarity, calculate_color_similarity_batch, rgb_to_hsl
+
+
+def make_pairs(count=400, seed=11):
+    """Random reference/sample pairs, including identical and bucket-boundary pairs"""
+    rng = np.random.default_rng(seed)
+    colors1 = rng.integers(0, 256, (count, 3))
+    colors2 = np.clip(colors1 + rng.integers(-60, 60, (count, 3)), 0, 255)
+    colors2[:20] = colors1[:20]
+    # Near-grays take the neutral and achromatic paths of the hue analysis
+    grays = rng.integers(0, 256, (40, 1))
+    colors1[20:60] = grays
+    colors2[20:60] = np.clip(grays + rng.integers(-4, 5, (40, 3)), 0, 255)
+    # Distances of exactly 10, 25, 50, 100 and 150 sit on bucket limits
+    boundary = np.array([[0, 0, 0]] * 5)
+    colors1 = np.vstack([colors1, boundary])
+    colors2 = np.vstack([colors2, [[10, 0, 0], [0, 25, 0], [0, 0, 50], [100, 0, 0], [0, 150, 0]]])
+    return colors1, colors2
+
+
+def test_batch_matches_scalar():
+    """Buckets, display colors and text must match the scalar comparison"""
+    colors1, colors2 = make_pairs()
+    result = calculate_color_similarity_batch(colors1, colors2, include_text=True)
+
+    for i, (color1, color2) in enumerate(zip(colors1.tolist(), colors2.tolist())):
+        assessment_text, display_color, clipboard_text = calculate_color_similarity(tuple(color1), tuple(color2))
+        assert result['assessment_text'][i] == assessment_text
+        assert result['display_color'][i] == display_color
+        assert result['clipboard_text'][i] == clipboard_text
+        assert assessment_text.startswith(result['assessment'][i])
+
+
+def test_batch_deltas():
+    """Structured deltas are the HSL differences, with hue wrapped to [-180, 180]"""
+    colors1 = np.array([[255, 0, 0], [128, 128, 128]])
+    colors2 = np.array([[255, 0, 40], [64, 64, 64]])
+    result = calculate_color_similarity_batch(colors1, colors2)
+
+    h1, s1, l1 = rgb_to_hsl(255, 0, 0)
+    h2, s2, l2 = rgb_to_hsl(255, 0, 40)
+    assert result['hue_diff'][0] == (h2 - h1) - 360
+    assert result['saturation_diff'][0] == s2 - s1
+    assert result['lightness_diff'][1] == rgb_to_hsl(64, 64, 64)[2] - rgb_to_hsl(128, 128, 128)[2]
+    assert 'assessment_text' not in result
+
+
+if __name__ == "__main__":
+    test_batch_matches_scalar()
+    test_batch_deltas()
+    print("✅ Batch similarity matches scalar comparison")
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared RGB to HSL conversions
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from PIL import Image
+from utils.color_space import quantizer_hue_array, rgb_to_hsl, rgb_to_hsl_array
+
+
+def test_array_matches_scalar():
+    """The NumPy kernel must give exactly the scalar values, rounding included"""
+    rng = np.random.default_rng(3)
+    pixels = np.vstack([rng.integers(0, 256, (20000, 3)), [[255, 0, 0], [0, 0, 0], [255, 255, 255], [80, 66, 73]]])
+
+    for ndigits in (1, None):
+        hsl = rgb_to_hsl_array(pixels, ndigits)
+        for rgb, row in zip(pixels.tolist(), hsl.tolist()):
+            assert tuple(row) == rgb_to_hsl(*rgb, ndigits=ndigits)
+
+
+def test_known_values():
+    """Primary colors and grays"""
+    assert rgb_to_hsl(255, 0, 0) == (0.0, 100.0, 50.0)
+    assert rgb_to_hsl(0, 255, 0) == (120.0, 100.0, 50.0)
+    assert rgb_to_hsl(128, 128, 128) == (0.0, 0.0, 50.2)
+
+
+def test_image_input():
+    """Images convert with their (height, width) layout"""
+    image = Image.new('RGB', (3, 2), (0, 0, 255))
+    hsl = rgb_to_hsl_array(image)
+    assert hsl.shape == (2, 3, 3)
+    assert (hsl == (240.0, 100.0, 50.0)).all()
+
+
+def test_quantizer_hue():
+    """The quantizer hue is the HSL hue, with reds in (0, 360] and 0 only for grays"""
+    rng = np.random.default_rng(8)
+    pixels = np.vstack([rng.integers(0, 256, (5000, 3)), [[255, 0, 0], [128, 128, 128], [0, 0, 0]]])
+    hue = quantizer_hue_array(pixels)
+    expected = rgb_to_hsl_array(pixels, ndigits=None)[:, 0]
+    expected = np.where(expected == 0, 360.0, expected)
+    gray = (pixels.max(axis=1) == pixels.min(axis=1))
+    assert (hue[gray] == 0).all()
+    assert np.allclose(hue[~gray], expected[~gray], rtol=0, atol=1e-9)
+    assert quantizer_hue_array([255, 0, 0]) == 360.0
+    # A bin midpoint the quantizer's bins rely on, exact in this formula
+    assert quantizer_hue_array([80, 66, 73]) == 330.0
+
+
+if __name__ == "__main__":
+    test_array_matches_scalar()
+    test_known_values()
+    test_image_input()
+    test_quantizer_hue()
+    print("✅ HSL kernel matches scalar conversion")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test script for the array hue quantizer and batch hue comparisons
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from utils.compare_hues import (
+    hue_quantize,
+    compare_colours,
+    hue_name_table,
+    hue_quantize_array,
+    compare_colours_array,
+    decode_colour_comparisons,
+)
+
+
+def _sample_colours(seed=3, count=3000):
+    """Random colours plus grays, pure reds and a coarse grid that hits list values exactly"""
+    rng = np.random.default_rng(seed)
+    grid = np.stack(np.meshgrid(*[np.arange(0, 256, 51)] * 3, indexing='ij'), axis=-1).reshape(-1, 3)
+    special = np.array([[255, 0, 0], [255, 0, 1], [255, 1, 0], [0, 0, 0], [255, 255, 255], [128, 128, 128]])
+    return np.concatenate([rng.integers(0, 256, (count, 3)), grid, special])
+
+
+def test_quantize_matches_scalar():
+    """Every element equals hue_quantize, for all hue lists"""
+    colours = _sample_colours()
+    for subdivisions in (6, 12, 24):
+        names = hue_name_table(subdivisions)
+        quantized = hue_quantize_array(colours, subdivisions)
+        for i, colour in enumerate(colours):
+            expected = hue_quantize(list(colour), subdivisions)
+            actual = [quantized['hue'][i], names[quantized['index'][i]], quantized['value'][i]]
+            assert actual == expected, f"{colour} ({subdivisions}): {actual} != {expected}"
+
+
+def test_quantize_image_shape():
+    """Images keep their height and width"""
+    image = np.random.default_rng(0).integers(0, 256, (4, 5, 3), dtype=np.uint8)
+    quantized = hue_quantize_array(image)
+    assert quantized['index'].shape == (4, 5)
+    assert np.array_equal(quantized['value'].ravel(), hue_quantize_array(image.reshape(-1, 3))['value'])
+
+
+def test_batch_compare_matches_scalar():
+    """Decoded batch comparisons equal compare_colours, including same-hue leans"""
+    rng = np.random.default_rng(5)
+    first = _sample_colours(seed=7)
+    # Nearby second colours exercise the three-element "leaning" results
+    second = np.clip(first + rng.integers(-8, 9, first.shape), 0, 255)
+    second[:20] = first[:20]
+    for subdivisions in (6, 12, 24):
+        result = compare_colours_array(first, second, subdivisions)
+        assert set(np.unique(result['length'])) == {1, 2, 3}
+        decoded = decode_colour_comparisons(result, subdivisions)
+        for i in range(len(first)):
+            expected = compare_colours(list(first[i]), list(second[i]), subdivisions)
+            assert decoded[i] == expected, f"{first[i]}, {second[i]}: {decoded[i]} != {expected}"
+
+
+def test_quantize_bin_midpoints():
+    """Hues exactly between two list values keep the lower value, as the original formula did"""
+    cases = [
+        ((80, 66, 73), 6, [330.0, "Magenta", 300]),
+        ((116, 102, 109), 6, [330.0, "Magenta", 300]),
+        ((146, 122, 131), 24, [337.5, "Rose", 330]),
+    ]
+    for colour, subdivisions, expected in cases:
+        assert hue_quantize(list(colour), subdivisions) == expected, colour
+        quantized = hue_quantize_array([colour], subdivisions)
+        actual = [quantized['hue'][0], hue_name_table(subdivisions)[quantized['index'][0]], quantized['value'][0]]
+        assert actual == expected, colour
+
+
+def test_unknown_subdivisions():
+    """Array functions reject hue lists that do not exist"""
+    try:
+        hue_quantize_array([[255, 0, 0]], 7)
+        assert False, "unknown hue list accepted"
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    test_quantize_matches_scalar()
+    test_quantize_image_shape()
+    test_batch_compare_matches_scalar()
+    test_quantize_bin_midpoints()
+    test_unknown_subdivisions()
+    print("✅ Array hue quantizer matches compare_hues")
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test script for the memoized color comparisons
+"""
+
+import sys
+import os
+import threading
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.comparison_cache import ComparisonCache, pack_color_pair
+from utils.comparisonEngine import (
+    calculate_color_similarity,
+    get_HSL_hue_analysis_first_neutral_only,
+    get_comparison_cache_stats,
+    set_comparison_cache_size,
+    clear_comparison_cache,
+    _compare_colors,
+)
+
+
+def test_pack_color_pair():
+    """Pairs pack into 48 bits; anything that is not two RGB colors is rejected"""
+    assert pack_color_pair((1, 2, 3), (4, 5, 6)) == 0x010203040506
+    assert pack_color_pair((255, 255, 255), (255, 255, 255)) == (1 << 48) - 1
+    assert pack_color_pair((256, 0, 0), (0, 0, 0)) is None
+    assert pack_color_pair((0.5, 0, 0), (0, 0, 0)) is None
+    assert pack_color_pair((0, 0), (0, 0, 0)) is None
+
+
+def test_lru_eviction_and_counters():
+    """Least recently used entries are evicted first"""
+    cache = ComparisonCache(maxsize=2)
+    cache.get_or_compute('a', lambda: 1)
+    cache.get_or_compute('b', lambda: 2)
+    assert cache.get_or_compute('a', lambda: None) == 1
+    cache.get_or_compute('c', lambda: 3)
+    assert cache.get_or_compute('b', lambda: 'recomputed') == 'recomputed'
+    assert cache.stats() == {'hits': 1, 'misses': 4, 'evictions': 2, 'size': 2, 'maxsize': 2}
+
+    cache.resize(0)
+    assert cache.stats()['size'] == 0
+    cache.get_or_compute('a', lambda: 1)
+    assert cache.stats()['size'] == 0
+
+
+def test_engine_results_are_memoized():
+    """Cached results equal fresh ones and repeated pairs hit the cache"""
+    pairs = [((200, 100, 50), (190, 110, 60)), ((128, 128, 128), (255, 0, 0)), ((0, 0, 0), (0, 0, 0))]
+    expected_results = [_compare_colors(color1, color2).as_tuple() for color1, color2 in pairs]
+    clear_comparison_cache()
+    for (color1, color2), expected in zip(pairs, expected_results):
+        assert calculate_color_similarity(color1, color2) == expected
+        assert calculate_color_similarity(list(color1), list(color2)) == expected
+
+    stats = get_comparison_cache_stats()
+    assert stats['hits'] == 3
+    # Each similarity miss also looks up the HSL analysis once
+    assert stats['misses'] == 6
+
+    # Different thresholds are cached separately
+    color1, color2 = pairs[0]
+    assert get_HSL_hue_analysis_first_neutral_only(color1, color2) != \
+        get_HSL_hue_analysis_first_neutral_only(color1, color2, saturation_threshold=1)
+
+    set_comparison_cache_size(1)
+    assert get_comparison_cache_stats()['size'] == 1
+    set_comparison_cache_size(4096)
+    clear_comparison_cache()
+    assert get_comparison_cache_stats()['hits'] == 0
+
+
+def test_concurrent_access():
+    """Threads sharing the cache see consistent results and counters"""
+    cache = ComparisonCache(maxsize=64)
+    errors = []
+
+    def worker(offset):
+        for i in range(2000):
+            key = (i + offset) % 100
+            if cache.get_or_compute(key, lambda: key * 2) != key * 2:
+                errors.append(key)
+
+    threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = cache.stats()
+    assert not errors
+    assert stats['hits'] + stats['misses'] == 8000
+    assert stats['size'] <= 64
+
+
+if __name__ == "__main__":
+    test_pack_color_pair()
+    test_lru_eviction_and_counters()
+    test_engine_results_are_memoized()
+    test_concurrent_access()
+    print("✅ Comparison cache works")
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test script for structured comparison results and their lazy text rendering
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from utils.comparison_result import HueTransition
+from utils.comparisonEngine import (
+    compare_colors,
+    create_clipboard_text,
+    analyze_hue_direction_first_neutral_only,
+    analyze_hue_transition_first_neutral_only,
+    rgb_to_hsl,
+)
+
+
+def test_structured_fields():
+    """Results expose the numbers behind the assessment"""
+    comparison = compare_colors((200, 100, 50), (180, 120, 50))
+    h1, s1, l1 = rgb_to_hsl(200, 100, 50)
+    h2, s2, l2 = rgb_to_hsl(180, 120, 50)
+    assert comparison.distance == 800 ** 0.5
+    assert comparison.bucket == 3 and comparison.assessment == "Similar"
+    assert comparison.hue_delta == h2 - h1
+    assert comparison.saturation_diff == s2 - s1
+    assert comparison.lightness_diff == l2 - l1
+    assert comparison.hue_transition == HueTransition("shift", "orange", "yellow", h2 - h1)
+
+    identical = compare_colors((10, 20, 30), (10, 20, 30))
+    assert identical.bucket == 0 and identical.clipboard_text == ""
+
+
+def test_rendering_matches_text_parsing():
+    """Clipboard text rendered from fields equals parsing the rendered analysis"""
+    rng = np.random.default_rng(17)
+    colors1 = rng.integers(0, 256, (500, 3)).tolist()
+    colors2 = np.clip(np.array(colors1) + rng.integers(-50, 50, (500, 3)), 0, 255).tolist()
+    for color1, color2 in zip(colors1, colors2):
+        comparison = compare_colors(tuple(color1), tuple(color2))
+        assert comparison.clipboard_text == create_clipboard_text(comparison.hue_analysis_text)
+        assert comparison.assessment_text.startswith(f"{comparison.assessment} (hue: ")
+        assert comparison.assessment_text.endswith(f"(D{comparison.distance:.1f})")
+
+
+def test_hue_transition_render():
+    """The string API renders the structured transition"""
+    for hue1, hue2, saturation1 in [(0, 0, 0), (10, 12, 50), (30, 200, 5), (20, 40, 80), (350, 5, 60)]:
+        transition = analyze_hue_transition_first_neutral_only(hue1, hue2, 5, saturation1=saturation1, saturation2=50)
+        assert transition.render() == analyze_hue_direction_first_neutral_only(hue1, hue2, 5, saturation1=saturation1, saturation2=50)
+    assert HueTransition("shift", "neutral", "orange", 15.94).render() == "neutral -> orange (+15.9deg)"
+    assert HueTransition("neutral").clipboard_text() == "tinted background: neutral"
+
+
+if __name__ == "__main__":
+    test_structured_fields()
+    test_rendering_matches_text_parsing()
+    test_hue_transition_render()
+    print("✅ Structured comparison results render correctly")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test script for perceptual (CIELAB delta E) color matching
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from utils.color_space import rgb_to_lab, rgb_to_lab_array
+from utils.delta_e import delta_e_76, delta_e_2000
+from utils.comparisonEngine import (
+    get_css3_palette,
+    get_top_color_matches,
+    calculate_color_similarity,
+    calculate_color_similarity_batch,
+)
+
+
+# Reference pairs from Sharma, Wu and Dalal, "The CIEDE2000 Color-Difference Formula"
+CIEDE2000_PAIRS = [
+    ((50.0, 2.6772, -79.7751), (50.0, 0.0, -82.7485), 2.0425),
+    ((50.0, 3.1571, -77.2803), (50.0, 0.0, -82.7485), 2.8615),
+    ((50.0, -1.0, 2.0), (50.0, 0.0, 0.0), 2.3669),
+    ((50.0, 2.49, -0.001), (50.0, -2.49, 0.0009), 7.1792),
+    ((50.0, 2.5, 0.0), (73.0, 25.0, -18.0), 27.1492),
+    ((2.0776, 0.0795, -1.135), (0.9033, -0.0636, -0.5514), 0.9082),
+    ((63.0109, -31.0961, -5.8663), (62.8187, -29.7946, -4.0864), 1.2630),
+]
+
+
+def test_lab_conversion():
+    """Known sRGB colors convert to their standard Lab values"""
+    assert np.allclose(rgb_to_lab(255, 255, 255), (100, 0, 0), atol=1e-3)
+    assert np.allclose(rgb_to_lab(255, 0, 0), (53.2408, 80.0925, 67.2032), atol=1e-3)
+    assert rgb_to_lab(0, 0, 0) == (0.0, 0.0, 0.0)
+    image = np.random.default_rng(3).integers(0, 256, (4, 5, 3))
+    lab = rgb_to_lab_array(image)
+    assert lab.shape == (4, 5, 3)
+    assert tuple(lab[2, 3]) == rgb_to_lab(*image[2, 3])
+
+
+def test_delta_e_reference_values():
+    """CIEDE2000 reproduces the published test data, in both directions"""
+    for lab1, lab2, expected in CIEDE2000_PAIRS:
+        assert round(delta_e_2000(lab1, lab2), 4) == expected
+        assert round(delta_e_2000(lab2, lab1), 4) == expected
+    assert delta_e_76((50, 0, 0), (53, 4, 0)) == 5.0
+
+    labs1 = np.array([pair[0] for pair in CIEDE2000_PAIRS])
+    labs2 = np.array([pair[1] for pair in CIEDE2000_PAIRS])
+    assert np.round(delta_e_2000(labs1, labs2), 4).tolist() == [pair[2] for pair in CIEDE2000_PAIRS]
+
+
+def test_perceptual_batch_matches_scalar():
+    """Batch perceptual naming gives the scalar ranking for every pixel"""
+    palette = get_css3_palette()
+    rng = np.random.default_rng(5)
+    pixels = np.vstack([rng.integers(0, 256, (300, 3), dtype=np.uint8), palette.rgb[:20], palette.rgb[:20]])
+
+    for metric in ('cie76', 'ciede2000'):
+        for top_n in (1, 3):
+            indices, distances = palette.batch_top_matches(pixels, top_n, metric=metric)
+            for pixel, pixel_indices, pixel_distances in zip(pixels, indices, distances):
+                matches = get_top_color_matches(tuple(pixel), top_n, metric=metric)
+                assert [palette.names[i] for i in pixel_indices] == [name for _, name, _ in matches]
+                assert np.allclose(pixel_distances, [distance for _, _, distance in matches], atol=1e-4)
+
+    # Palette colors match themselves exactly
+    assert get_top_color_matches(tuple(palette.rgb[7]), 1, metric='ciede2000')[0][1:] == (palette.names[7], 0.0)
+
+
+def test_perceptual_similarity():
+    """Perceptual similarity uses delta E buckets and matches its batch form"""
+    rng = np.random.default_rng(9)
+    colors1 = rng.integers(0, 256, (150, 3))
+    colors2 = np.clip(colors1 + rng.integers(-15, 15, (150, 3)), 0, 255)
+    colors2[:5] = colors1[:5]
+
+    for metric in ('cie76', 'ciede2000'):
+        result = calculate_color_similarity_batch(colors1, colors2, include_text=True, metric=metric)
+        for i, (color1, color2) in enumerate(zip(colors1.tolist(), colors2.tolist())):
+            assessment_text, display_color, _ = calculate_color_similarity(tuple(color1), tuple(color2), metric=metric)
+            assert result['assessment_text'][i] == assessment_text
+            assert result['display_color'][i] == display_color
+        assert (result['bucket'][:5] == 0).all()
+
+    assessment_text, _, _ = calculate_color_similarity((200, 30, 30), (203, 30, 30), metric='ciede2000')
+    assert "(dE" in assessment_text
+
+
+if __name__ == "__main__":
+    test_lab_conversion()
+    test_delta_e_reference_values()
+    test_perceptual_batch_matches_scalar()
+    test_perceptual_similarity()
+    print("✅ Perceptual delta E matching works")
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test script for dominant-color extraction
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from PIL import Image
+
+from utils.dominant_colors import extract_dominant_colors, capture_dominant_colors, median_cut
+from utils.platform_capture import PlatformScreenCapture
+
+
+def _three_region_frame(height=1080, width=1920):
+    """Blue background, white top band and a red box, with slight noise"""
+    frame = np.zeros((height, width, 3), dtype=np.int64)
+    frame[:] = (30, 30, 200)
+    frame[:height * 4 // 10] = (240, 240, 240)
+    frame[height * 4 // 10:height * 6 // 10, :width * 4 // 10] = (200, 50, 40)
+    noise = np.random.default_rng(0).integers(-6, 7, frame.shape)
+    return np.clip(frame + noise, 0, 255).astype(np.uint8)
+
+
+def test_main_colors_and_shares():
+    """A 1080p frame yields its three areas, largest first, named by the engine"""
+    frame = _three_region_frame()
+    start = time.perf_counter()
+    colors = extract_dominant_colors(frame, k=5)
+    elapsed = time.perf_counter() - start
+
+    assert [color.simple_name for color in colors] == ['blue', 'white', 'red']
+    for color, expected_share in zip(colors, (0.52, 0.40, 0.08)):
+        assert abs(color.share - expected_share) < 0.01, colors
+    assert abs(sum(color.share for color in colors) - 1) < 1e-9
+    # Generous interactive budget; about 0.1 s here
+    assert elapsed < 2.0, f"{elapsed:.2f}s"
+
+
+def test_flat_image_and_repeatability():
+    """A flat image is one color; a fixed seed gives the same answer"""
+    colors = extract_dominant_colors(Image.new('RGB', (64, 64), (255, 0, 0)), k=4)
+    assert len(colors) == 1 and colors[0].rgb == (255, 0, 0) and colors[0].share == 1.0
+    frame = _three_region_frame(120, 160)
+    assert extract_dominant_colors(frame, sample_size=500) == extract_dominant_colors(frame, sample_size=500)
+    assert len(median_cut(np.array([[0.0, 0, 0], [255, 255, 255]]), 8)) == 2
+
+
+def test_capture_rectangle_once():
+    """Screen regions are captured with a single rectangle grab"""
+    capture = PlatformScreenCapture()
+    calls = []
+
+    def fake_capture(left, top, width, height):
+        calls.append((left, top, width, height))
+        return Image.fromarray(_three_region_frame(height, width))
+
+    capture.capture_rectangle = fake_capture
+    colors = capture_dominant_colors(capture, 10, 20, 320, 200, k=3)
+    assert calls == [(10, 20, 320, 200)]
+    assert colors[0].simple_name == 'blue'
+
+
+if __name__ == "__main__":
+    test_main_colors_and_shares()
+    test_flat_image_and_repeatability()
+    test_capture_rectangle_once()
+    print("✅ Dominant colors work")
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test script for the compiled hue wheels
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from utils.hue_wheel import HueWheel, get_hue_wheel
+from utils.hues_lists import hues
+
+
+def scan_index(hue, subdivisions):
+    """Original linear circular-distance scan, used as the reference"""
+    min_distance = 360
+    closest_index = 0
+    for i, hue_value in enumerate(hues[subdivisions][1]):
+        distance = abs(hue % 360 - hue_value)
+        if distance > 180:
+            distance = 360 - distance
+        if distance < min_distance:
+            min_distance = distance
+            closest_index = i
+    return closest_index
+
+
+def test_index_matches_scan():
+    """Table lookups agree with the scan for scalars and arrays, ties included"""
+    rng = np.random.default_rng(5)
+    test_hues = np.concatenate([np.arange(0, 360, 0.1).round(1), np.arange(0, 361, 0.5), rng.random(2000) * 360])
+
+    for subdivisions in (6, 12, 24):
+        wheel = get_hue_wheel(subdivisions)
+        array_indices = wheel.index_of(test_hues)
+        for hue, array_index in zip(test_hues.tolist(), array_indices.tolist()):
+            expected = scan_index(hue, subdivisions)
+            assert wheel.index_of(hue) == expected
+            assert array_index == expected
+
+
+def test_neighbours():
+    """Direction tables skip apexes with the same simple name"""
+    wheel = get_hue_wheel(12)
+    assert wheel.name_of(352.0) == "Red"
+    assert wheel.next_simple_name(10.0, clockwise=True) == "orange"
+    assert wheel.next_simple_name(10.0, clockwise=False) == "pink"
+    assert wheel.adjacent_name(100.0, clockwise=True) == "Green"
+    assert list(wheel.name_of(np.array([0.0, 60.0, 240.0]))) == ["Red", "Yellow", "Blue"]
+
+
+def test_validation():
+    """Malformed wheels are rejected when compiled"""
+    bad_wheels = [
+        (["Red", "Green", "Red'"], [0.0, 120.0]),
+        (["Red", "Green", "Blue", "Red'"], [0.0, 240.0, 120.0, 360.0]),
+        (["Red", "Green", "Blue", "Red'"], [0.0, 120.0, 240.0, 350.0]),
+        (["Red", "Green", "Blue", "Red"], [0.0, 120.0, 240.0, 360.0]),
+    ]
+    for hue_names, hue_values in bad_wheels:
+        try:
+            HueWheel(hue_names, hue_values)
+        except ValueError:
+            continue
+        raise AssertionError(f"wheel {hue_names} should be rejected")
+
+
+if __name__ == "__main__":
+    test_index_matches_scan()
+    test_neighbours()
+    test_validation()
+    print("✅ Hue wheel lookups match the linear scan")
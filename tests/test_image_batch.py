@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Test script for the headless batch image analysis
+"""
+
+import sys
+import os
+import json
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from PIL import Image
+
+from utils.image_batch import analyze_images, analyze_image, format_csv_row, iter_image_paths
+from utils.comparisonEngine import get_css3_palette
+import color_picker_cli
+
+
+def _make_images(directory):
+    """A flat red image, a blue/gray split image in a subdirectory and a broken file"""
+    os.makedirs(os.path.join(directory, 'sub'))
+    Image.new('RGB', (60, 40), (255, 0, 0)).save(os.path.join(directory, 'red.png'))
+    split = np.zeros((50, 80, 3), dtype=np.uint8)
+    split[:25] = (0, 0, 255)
+    split[25:] = (128, 128, 128)
+    Image.fromarray(split).save(os.path.join(directory, 'sub', 'split.png'))
+    with open(os.path.join(directory, 'broken.png'), 'w') as broken:
+        broken.write('not an image')
+
+
+def test_discovery_and_results():
+    """Directories are walked in order; tiles add up to the whole image"""
+    with tempfile.TemporaryDirectory() as directory:
+        _make_images(directory)
+        paths = list(iter_image_paths([directory]))
+        assert [os.path.relpath(p, directory) for p in paths] == ['broken.png', 'red.png', os.path.join('sub', 'split.png')]
+        assert len(list(iter_image_paths([directory], recursive=False))) == 2
+
+        results = list(analyze_images(paths, workers=1, tile_pixels=500))
+        assert 'error' in results[0]
+        red, split = results[1], results[2]
+        assert red['dominant_colors'][0]['name'] == 'red' and red['hue_composition'] == {'Red': 1.0}
+        assert split['hue_composition'] == {'Blue': 0.5, 'neutral': 0.5}
+        assert {color['simple_name'] for color in split['dominant_colors']} == {'blue', 'gray'}
+
+        # Small tiles and one big tile give the same composition
+        assert analyze_image(paths[2], tile_pixels=1 << 20)['hue_composition'] == split['hue_composition']
+        row = format_csv_row(split)
+        assert row['hue_composition'] == 'Blue:0.5;neutral:0.5' and row['error'] == ''
+
+
+def test_name_maps():
+    """Per-pixel name maps index the palette names written next to them"""
+    with tempfile.TemporaryDirectory() as directory:
+        _make_images(directory)
+        maps = os.path.join(directory, 'maps')
+        result = list(analyze_images([os.path.join(directory, 'sub', 'split.png')], workers=1,
+                                     name_map_dir=maps, tile_pixels=700))[0]
+        name_map = np.load(result['name_map'])
+        with open(os.path.join(maps, 'names.json')) as names_file:
+            names = json.load(names_file)['names']
+        assert name_map.shape == (50, 80)
+        assert names == list(get_css3_palette().names)
+        assert names[name_map[0, 0]] == 'blue' and names[name_map[-1, -1]] == 'gray'
+
+
+PALETTE_GPL = """GIMP Palette
+Name: Two tone
+  0   0 200	Brand Blue
+120 120 120	Brand Gray
+"""
+
+
+def test_palette_in_process_pool():
+    """Pool workers name pixels with the palette compiled once in the parent"""
+    with tempfile.TemporaryDirectory() as directory:
+        _make_images(directory)
+        palette_path = os.path.join(directory, 'two.gpl')
+        with open(palette_path, 'w') as palette_file:
+            palette_file.write(PALETTE_GPL)
+        maps = os.path.join(directory, 'maps')
+        paths = [os.path.join(directory, 'sub', 'split.png'), os.path.join(directory, 'red.png')]
+        results = list(analyze_images(paths, workers=2, palette_path=palette_path, name_map_dir=maps))
+        with open(os.path.join(maps, 'names.json')) as names_file:
+            names = json.load(names_file)['names']
+        name_map = np.load(results[0]['name_map'])
+    assert sorted(names) == ['Brand Blue', 'Brand Gray']
+    assert names[name_map[0, 0]] == 'Brand Blue' and names[name_map[-1, -1]] == 'Brand Gray'
+    assert results[0]['dominant_colors'][0]['name'] in ('Brand Blue', 'Brand Gray')
+
+
+def test_names_file_follows_palette():
+    """Rerunning into the same name-map directory with another palette rewrites names.json"""
+    with tempfile.TemporaryDirectory() as directory:
+        _make_images(directory)
+        palette_path = os.path.join(directory, 'two.gpl')
+        with open(palette_path, 'w') as palette_file:
+            palette_file.write(PALETTE_GPL)
+        maps = os.path.join(directory, 'maps')
+        path = os.path.join(directory, 'sub', 'split.png')
+        names_path = os.path.join(maps, 'names.json')
+
+        list(analyze_images([path], workers=2, name_map_dir=maps))
+        with open(names_path) as names_file:
+            assert json.load(names_file)['names'] == list(get_css3_palette().names)
+
+        result = list(analyze_images([path], workers=2, palette_path=palette_path, name_map_dir=maps))[0]
+        with open(names_path) as names_file:
+            data = json.load(names_file)
+        assert data['palette'] == 'Two tone'
+        assert data['names'][np.load(result['name_map'])[0, 0]] == 'Brand Blue'
+
+
+def test_cli_with_process_pool():
+    """The CLI streams JSON Lines from a process pool and reports failures"""
+    with tempfile.TemporaryDirectory() as directory:
+        _make_images(directory)
+        output = os.path.join(directory, 'results.jsonl')
+        status = color_picker_cli.main([directory, '--output', output, '--workers', '2'])
+        with open(output) as results_file:
+            results = [json.loads(line) for line in results_file]
+    assert status == 1
+    assert [os.path.basename(result['path']) for result in results] == ['broken.png', 'red.png', 'split.png']
+    assert results[1]['dominant_colors'][0]['hex'] == '#ff0000'
+
+
+if __name__ == "__main__":
+    test_discovery_and_results()
+    test_name_maps()
+    test_palette_in_process_pool()
+    test_names_file_follows_palette()
+    test_cli_with_process_pool()
+    print("✅ Batch image analysis works")
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test script for image-vs-image tint comparison
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from PIL import Image
+
+from utils.image_comparison import compare_images, get_transition_names, TRANSITION_KINDS
+from utils.comparisonEngine import analyze_HSL_first_neutral_only
+
+
+def test_pixels_match_scalar_analysis():
+    """Every pixel's transition equals analyze_HSL_first_neutral_only for that pair"""
+    rng = np.random.default_rng(4)
+    first = rng.integers(0, 256, (40, 50, 3))
+    first[:10] = rng.integers(0, 256, (10, 50, 1))  # grays
+    second = np.clip(first + rng.integers(-30, 31, first.shape), 0, 255)
+    result = compare_images(first.astype(np.uint8), second.astype(np.uint8), include_maps=True, chunk_pixels=300)
+
+    names = get_transition_names()
+    maps = result.maps
+    for y in range(first.shape[0]):
+        for x in range(first.shape[1]):
+            color1 = tuple(int(v) for v in first[y, x])
+            color2 = tuple(int(v) for v in second[y, x])
+            expected = analyze_HSL_first_neutral_only(color1, color2).hue
+            source, target = maps['source'][y, x], maps['target'][y, x]
+            actual = (TRANSITION_KINDS[maps['transition'][y, x]],
+                      names[source] if source >= 0 else None, names[target] if target >= 0 else None)
+            assert actual == (expected.kind, expected.source, expected.target), (color1, color2, actual, expected)
+            assert abs(maps['delta_hsl'][y, x, 0] - expected.delta) < 1e-3
+    assert np.array_equal(maps['delta_rgb'], (second - first).astype(np.int16))
+    assert abs(sum(result.summary['kinds'].values()) - 1) < 1e-9
+
+
+def test_tint_verdict_and_heatmap():
+    """A gray photo against an orange-tinted frame gives the clipboard verdict"""
+    photo = Image.new('RGB', (64, 48), (128, 128, 128))
+    frame = Image.new('RGB', (64, 48), (150, 128, 100))
+    result = compare_images(photo, frame)
+
+    assert result.clipboard_text == "tinted background: neutral (photos) -> orange (video)"
+    assert result.assessment_text.startswith("hue: neutral -> orange")
+    assert result.summary['transitions'] == [('neutral', 'orange', 1.0)]
+    assert result.summary['mean_color1'] == (128, 128, 128)
+    assert result.maps is None
+    assert result.heatmap.size == (64, 48)
+
+    identical = compare_images(photo, photo)
+    assert identical.summary['assessment'] == "Identical colors"
+    assert identical.heatmap.getextrema() == ((0, 0), (0, 0), (0, 0))
+
+
+def test_verdict_uses_subdivisions():
+    """The verdict names hues with the same hue list as the per-pixel transitions"""
+    photo = Image.new('RGB', (8, 8), (128, 128, 128))
+    frame = Image.new('RGB', (8, 8), (150, 140, 100))
+    for subdivisions, target in ((12, 'yellow'), (24, 'amber')):
+        result = compare_images(photo, frame, subdivisions=subdivisions)
+        assert result.summary['transitions'] == [('neutral', target, 1.0)]
+        assert result.clipboard_text == f"tinted background: neutral (photos) -> {target} (video)"
+
+
+def test_size_mismatch():
+    """Images must be aligned"""
+    try:
+        compare_images(np.zeros((4, 4, 3), np.uint8), np.zeros((4, 5, 3), np.uint8))
+        assert False, "misaligned images accepted"
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    test_pixels_match_scalar_analysis()
+    test_tint_verdict_and_heatmap()
+    test_verdict_uses_subdivisions()
+    test_size_mismatch()
+    print("✅ Image comparison works")
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test script for the import cost of the comparison engine
+"""
+
+import sys
+import os
+import subprocess
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Measured at about 0.12 s (mostly NumPy); the budget leaves room for slow machines
+IMPORT_BUDGET_SECONDS = 0.5
+
+# Modules the engine must not pull in
+DEFERRED_MODULES = ('PIL', 'webcolors', 'tkinter', 'pyautogui', 'utils.platform_capture', 'utils.macos_permissions')
+
+MEASURE_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import utils.comparisonEngine
+elapsed = time.perf_counter() - start
+print(elapsed)
+print(','.join(name for name in {modules!r} if name in sys.modules))
+"""
+
+
+def _measure_import():
+    """Import the engine in a fresh interpreter; returns (seconds, loaded deferred modules)"""
+    output = subprocess.run(
+        [sys.executable, '-c', MEASURE_SCRIPT.format(modules=DEFERRED_MODULES)],
+        cwd=PACKAGE_DIR, capture_output=True, text=True, check=True,
+    ).stdout.splitlines()
+    loaded = output[1].split(',') if len(output) > 1 and output[1] else []
+    return float(output[0]), loaded
+
+
+def test_engine_import_is_lean():
+    """Importing the engine loads neither the GUI, capture nor webcolors modules"""
+    _, loaded = _measure_import()
+    assert loaded == [], f"utils.comparisonEngine imported {loaded}"
+
+
+def test_engine_import_budget():
+    """Importing the engine stays within the import-time budget"""
+    # Best of three smooths over a cold disk cache
+    elapsed = min(_measure_import()[0] for _ in range(3))
+    assert elapsed < IMPORT_BUDGET_SECONDS, f"import took {elapsed:.3f}s"
+
+
+def test_lazy_package_attributes():
+    """Package-level names still resolve, importing their module on demand"""
+    import utils
+    from utils.comparisonEngine import get_simple_color_name
+    assert utils.get_simple_color_name is get_simple_color_name
+    assert 'PlatformScreenCapture' in dir(utils)
+    try:
+        utils.no_such_name
+        assert False, "missing attribute resolved"
+    except AttributeError:
+        pass
+
+
+if __name__ == "__main__":
+    test_engine_import_is_lean()
+    test_engine_import_budget()
+    test_lazy_package_attributes()
+    print("✅ Engine imports within budget")
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test script for the opt-in timers and counters
+"""
+
+import sys
+import os
+import json
+import subprocess
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import instrumentation
+from utils.comparisonEngine import calculate_color_similarity, get_simple_color_name
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_disabled_records_nothing():
+    """While disabled, timers, decorators and counters leave no trace"""
+    instrumentation.disable()
+    instrumentation.reset()
+    with instrumentation.timer('block'):
+        pass
+    instrumentation.count('events')
+    get_simple_color_name((255, 0, 0))
+    data = instrumentation.snapshot()
+    assert data['timers'] == {} and data['counters'] == {}
+
+
+def test_timers_and_counters():
+    """Enabled timers record calls of instrumented engine functions"""
+    instrumentation.reset()
+    instrumentation.enable()
+    try:
+        for _ in range(3):
+            get_simple_color_name((10, 200, 30))
+        calculate_color_similarity((200, 100, 50), (190, 110, 60))
+        with instrumentation.timer('block'):
+            pass
+        instrumentation.count('events', 2)
+        instrumentation.count('events')
+        data = instrumentation.snapshot()
+    finally:
+        instrumentation.disable()
+        instrumentation.reset()
+
+    name_timer = data['timers']['engine.get_simple_color_name']
+    assert name_timer['count'] == 3
+    assert name_timer['min_ms'] <= name_timer['p50_ms'] <= name_timer['p99_ms'] <= name_timer['max_ms']
+    assert data['timers']['engine.calculate_color_similarity']['count'] == 1
+    assert data['timers']['block']['count'] == 1
+    assert data['counters'] == {'events': 3}
+
+
+def test_environment_variable_dumps_at_exit():
+    """COLOR_PICKER_INSTRUMENT=<path> profiles a whole process into a JSON file"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'profile.json')
+        env = dict(os.environ, COLOR_PICKER_INSTRUMENT=path)
+        subprocess.run([sys.executable, '-c', 'from utils.comparisonEngine import get_simple_color_name; '
+                        'get_simple_color_name((1, 2, 3))'], cwd=PACKAGE_DIR, env=env, check=True)
+        with open(path, encoding='utf-8') as profile_file:
+            data = json.load(profile_file)
+    assert data['enabled']
+    assert data['timers']['engine.get_simple_color_name']['count'] == 1
+
+
+if __name__ == "__main__":
+    test_disabled_records_nothing()
+    test_timers_and_counters()
+    test_environment_variable_dumps_at_exit()
+    print("✅ Instrumentation works")
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Test script for the compiled palette index used by the comparison engine
+"""
+
+import sys
+import os
+import random
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import webcolors
+from PIL import Image
+from utils.palette_index import PaletteIndex
+from utils.comparisonEngine import (
+    get_top_color_matches, map_css_to_simple, get_color_names_batch, get_css3_palette,
+    CSS_TO_SIMPLE, check_css_to_simple
+)
+
+
+def reference_top_matches(rgb, top_n=3):
+    """Original loop-and-sort matcher, used as the reference result"""
+    distances = []
+    seen_rgb = set()
+    for name in webcolors.names('css3'):
+        css_rgb = tuple(webcolors.name_to_rgb(name, spec='css3'))
+        if css_rgb in seen_rgb:
+            continue
+        seen_rgb.add(css_rgb)
+        distance = sum((a - b) ** 2 for a, b in zip(rgb, css_rgb)) ** 0.5
+        distances.append((distance, map_css_to_simple(name), name, css_rgb))
+    distances.sort()
+    return [(simple, name, distance) for distance, simple, name, _ in distances[:top_n]]
+
+
+def test_top_matches_match_reference():
+    """Palette index must reproduce the original ordering, ties included"""
+    random.seed(1234)
+    samples = [tuple(random.randrange(256) for _ in range(3)) for _ in range(200)]
+    # Exact palette colors and grays produce distance ties
+    samples += [tuple(webcolors.name_to_rgb(name)) for name in webcolors.names('css3')]
+    samples += [(v, v, v) for v in range(0, 256, 5)]
+
+    for rgb in samples:
+        for top_n in (1, 3, 10):
+            assert get_top_color_matches(rgb, top_n) == reference_top_matches(rgb, top_n)
+
+
+def test_top_matches_bounds():
+    """top_n larger than the palette returns every entry, zero returns none"""
+    assert get_top_color_matches((10, 20, 30), 0) == []
+    assert len(get_top_color_matches((10, 20, 30), 1000)) == 138
+
+
+def test_batch_matches_scalar():
+    """Batch naming must agree with the scalar matcher for every pixel"""
+    palette = get_css3_palette()
+    rng = np.random.default_rng(42)
+    pixels = rng.integers(0, 256, (300, 3), dtype=np.uint8)
+    # Include exact palette colors and grays, which produce distance ties
+    pixels = np.vstack([pixels, palette.rgb, np.repeat(np.arange(0, 256, 5, dtype=np.uint8)[:, None], 3, axis=1)])
+
+    for top_n in (1, 3):
+        css_indices, simple_indices, distances = get_color_names_batch(pixels, top_n, chunk_size=64)
+        assert css_indices.shape == (len(pixels), top_n)
+        for rgb, css_row, simple_row, distance_row in zip(pixels, css_indices, simple_indices, distances):
+            expected = get_top_color_matches(tuple(int(c) for c in rgb), top_n)
+            assert [palette.names[i] for i in css_row] == [name for _, name, _ in expected]
+            assert [palette.simple_vocabulary[i] for i in simple_row] == [simple for simple, _, _ in expected]
+            assert np.allclose(distance_row, [distance for _, _, distance in expected])
+
+
+def test_batch_accepts_image():
+    """PIL images keep their (height, width) layout"""
+    image = Image.new('RGB', (4, 2), (255, 0, 0))
+    css_indices, _, distances = get_color_names_batch(image)
+    assert css_indices.shape == (2, 4, 1)
+    assert (get_css3_palette().names[css_indices] == 'red').all()
+    assert (distances == 0).all()
+
+
+def test_simple_name_table():
+    """Every CSS3 name is mapped, and the compiled tables are read-only"""
+    check_css_to_simple()
+    try:
+        check_css_to_simple(['red', 'notacolor'])
+    except ValueError as error:
+        assert 'notacolor' in str(error)
+    else:
+        raise AssertionError("unmapped name was accepted")
+
+    # Names without a category keep their baseline output: their own name
+    for name in ('bisque', 'blanchedalmond', 'cornsilk', 'mediumaquamarine', 'mediumvioletred', 'palevioletred'):
+        assert CSS_TO_SIMPLE[name] == map_css_to_simple(name) == name
+
+    try:
+        CSS_TO_SIMPLE['red'] = 'blue'
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("CSS_TO_SIMPLE is writable")
+
+    palette = get_css3_palette()
+    assert not palette.simple_ids.flags.writeable
+    for name, simple_id in zip(palette.names, palette.simple_ids):
+        assert palette.simple_vocabulary[simple_id] == CSS_TO_SIMPLE[name] == map_css_to_simple(name.upper())
+
+
+def test_large_palette_indices():
+    """Palettes beyond the int16 range return correct entry indices"""
+    count = 40000
+    packed = np.random.default_rng(5).choice(1 << 24, count, replace=False)
+    rgb = np.stack([packed >> 16, (packed >> 8) & 0xFF, packed & 0xFF], axis=1)
+    palette = PaletteIndex([f"c{i}" for i in range(count)], rgb, [f"s{i}" for i in range(count)])
+    assert palette.index_dtype == np.int32
+    assert palette.simple_vocabulary[palette.simple_ids[-1]] == palette.simple_names[-1]
+
+    # The last entries have indices above 32767
+    pixels = palette.rgb[-20:]
+    indices, distances = palette.batch_top_matches(pixels, 2, metric='cie76')
+    assert np.array_equal(indices[:, 0], np.arange(count - 20, count))
+    assert (distances[:, 0] == 0).all()
+    for pixel, row in zip(pixels, indices):
+        assert [name for _, name, _ in palette.top_matches(tuple(pixel), 2, 'cie76')] == list(palette.names[row])
+
+
+if __name__ == "__main__":
+    test_top_matches_match_reference()
+    test_top_matches_bounds()
+    test_batch_matches_scalar()
+    test_batch_accepts_image()
+    test_simple_name_table()
+    test_large_palette_indices()
+    print("✅ Palette index matches reference matcher")
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Test script for loading named palettes from JSON and GIMP palette files
+"""
+
+import sys
+import os
+import json
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from utils import palette_registry
+from utils.palette_index import PaletteIndex
+from utils.palette_registry import PaletteRegistry, get_palette_registry, parse_palette
+from utils.comparisonEngine import get_simple_color_name
+
+
+GPL_PALETTE = """GIMP Palette
+Name: Studio
+Columns: 4
+# Brand colors
+200   0   0	Dark Red
+ 10 200  30	Leaf
+  0   0 255
+"""
+
+
+def _write(directory, file_name, content):
+    path = os.path.join(directory, file_name)
+    with open(path, 'w', encoding='utf-8') as palette_file:
+        palette_file.write(content)
+    return path
+
+
+def test_parse_formats():
+    """GPL rows and the JSON list/object layouts parse to the same entries"""
+    name, names, rgb_values, simple_names = parse_palette(GPL_PALETTE.encode(), 'studio.gpl')
+    assert name == "Studio"
+    assert names == ["Dark Red", "Leaf", "#0000ff"]
+    assert rgb_values == [(200, 0, 0), (10, 200, 30), (0, 0, 255)]
+    assert simple_names == [None, None, None]
+
+    as_list = json.dumps([{"name": "Brand", "hex": "#f80", "simple": "orange"}, {"name": "Ink", "rgb": [1, 2, 3]}])
+    as_object = json.dumps({"name": "Brand set", "colors": {"Brand": "#ff8800", "Ink": [1, 2, 3]}})
+    _, names, rgb_values, simple_names = parse_palette(as_list.encode(), 'brand.json')
+    assert names == ["Brand", "Ink"] and rgb_values == [(255, 136, 0), (1, 2, 3)]
+    assert simple_names == ["orange", None]
+    name, names, rgb_values, _ = parse_palette(as_object.encode(), 'brand.json')
+    assert name == "Brand set" and names == ["Brand", "Ink"] and rgb_values == [(255, 136, 0), (1, 2, 3)]
+
+    for bad in ('[{"hex": "#12"}]', '[[1, 2, 300]]', '"red"', '[{"name": 5, "hex": "#123"}]',
+                '[{"hex": "#123", "simple": ["red"]}]', '{"name": {}, "colors": ["#123"]}'):
+        try:
+            parse_palette(bad.encode(), 'bad.json')
+            assert False, f"accepted {bad}"
+        except ValueError:
+            pass
+
+
+def test_load_cache_and_lookup():
+    """Loaded palettes are cached by content and used for name lookups"""
+    with tempfile.TemporaryDirectory() as directory:
+        registry = PaletteRegistry(cache_dir=directory)
+        path = _write(directory, 'studio.gpl', GPL_PALETTE)
+        assert registry.load_file(path) == "Studio"
+
+        cache_path = registry.get_cache_path(GPL_PALETTE.encode(), path)
+        assert os.path.exists(cache_path)
+        palette = registry.get("Studio")
+        # Simple names come from the CSS3 mapping or the nearest CSS3 color
+        assert dict(zip(palette.names, palette.simple_names)) == {"Dark Red": "red", "Leaf": "green", "#0000ff": "blue"}
+
+        assert registry.load_file(path, name="Reloaded") == "Reloaded"
+        reloaded = registry.get("Reloaded")
+        assert reloaded is not palette
+        assert np.array_equal(reloaded.rgb, palette.rgb)
+        assert list(reloaded.names) == list(palette.names)
+
+        matches = get_simple_color_name((190, 10, 5), palette=palette)
+        assert matches[0][:2] == ("red", "Dark Red")
+        assert registry.names() == ["Reloaded", "Studio"]
+
+        registry.set_active("Studio")
+        assert registry.get() is palette
+        try:
+            registry.set_active("missing")
+            assert False, "unknown palette accepted"
+        except KeyError:
+            pass
+
+
+def test_same_content_keeps_file_names():
+    """Unnamed palettes with identical contents load under their own file names"""
+    content = json.dumps([{"name": "Ink", "hex": "#123456"}])
+    with tempfile.TemporaryDirectory() as directory:
+        registry = PaletteRegistry(cache_dir=directory)
+        assert registry.load_file(_write(directory, 'first.json', content)) == "first"
+        assert registry.load_file(_write(directory, 'second.json', content)) == "second"
+        assert PaletteRegistry(cache_dir=directory).load_file(os.path.join(directory, 'second.json')) == "second"
+
+
+def test_cache_hit_skips_compiling():
+    """A cache hit neither parses the file nor rebuilds candidate grids built earlier"""
+    rng = np.random.default_rng(3)
+    colors = [{"name": f"Color {i}", "rgb": rgb.tolist()} for i, rgb in enumerate(rng.integers(0, 256, (300, 3)))]
+    pixels = rng.integers(0, 256, (1000, 3), dtype=np.uint8)
+    with tempfile.TemporaryDirectory() as directory:
+        path = _write(directory, 'large.json', json.dumps({"name": "Large", "colors": colors}))
+        palette = PaletteRegistry(cache_dir=directory)
+        palette = palette.get(palette.load_file(path))
+        expected = palette.batch_top_matches(pixels, 1)
+
+        original_parse = palette_registry.parse_palette
+        palette_registry.parse_palette = None
+        try:
+            registry = PaletteRegistry(cache_dir=directory)
+            assert registry.load_file(path) == "Large"
+        finally:
+            palette_registry.parse_palette = original_parse
+        cached = registry.get("Large")
+        assert 1 in cached._grids
+        assert list(cached.names) == list(palette.names) and list(cached.simple_names) == list(palette.simple_names)
+        for got, want in zip(cached.batch_top_matches(pixels, 1), expected):
+            assert np.array_equal(got, want)
+
+
+def _load_in_process(cache_dir, path):
+    registry = PaletteRegistry(cache_dir=cache_dir)
+    return list(registry.get(registry.load_file(path)).names)
+
+
+def test_cache_recovery_and_concurrent_writers():
+    """A corrupt cache file is rebuilt, and processes missing the cache together all succeed"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = _write(directory, 'studio.gpl', GPL_PALETTE)
+        registry = PaletteRegistry(cache_dir=directory)
+        cache_path = registry.get_cache_path(GPL_PALETTE.encode(), path)
+        os.makedirs(os.path.dirname(cache_path))
+        with open(cache_path, 'wb') as cache_file:
+            cache_file.write(b'PK\x03\x04 truncated')
+
+        assert registry.load_file(path) == "Studio"
+        assert list(PaletteIndex.load(cache_path).names) == list(registry.get("Studio").names)
+
+        os.remove(cache_path)
+        with ProcessPoolExecutor(4) as executor:
+            results = list(executor.map(_load_in_process, [directory] * 8, [path] * 8))
+        assert all(names == results[0] for names in results)
+        assert os.listdir(os.path.dirname(cache_path)) == [os.path.basename(cache_path)]
+
+
+def test_shared_registry_default():
+    """The shared registry starts on the built-in CSS3 palette"""
+    registry = get_palette_registry()
+    assert "css3" in registry.names()
+    assert get_simple_color_name((255, 0, 0), palette="css3")[0][:2] == ("red", "red")
+
+
+def test_large_palette_lookup_speed():
+    """Single lookups in a 2000-color palette fit the live preview frame budget"""
+    rng = np.random.default_rng(7)
+    colors = [{"name": f"Color {i}", "rgb": rgb.tolist()} for i, rgb in enumerate(rng.integers(0, 256, (2000, 3)))]
+    with tempfile.TemporaryDirectory() as directory:
+        registry = PaletteRegistry(cache_dir=directory)
+        name = registry.load_file(_write(directory, 'large.json', json.dumps(colors)))
+        palette = registry.get(name)
+
+        samples = [tuple(int(c) for c in rgb) for rgb in rng.integers(0, 256, (200, 3))]
+        get_simple_color_name(samples[0], palette=palette)
+        start = time.perf_counter()
+        for rgb in samples:
+            get_simple_color_name(rgb, palette=palette)
+        per_lookup = (time.perf_counter() - start) / len(samples)
+        # Generous bound; a 30 fps preview has 33 ms per frame
+        assert per_lookup < 0.005, f"{per_lookup * 1000:.2f} ms per lookup"
+
+
+if __name__ == "__main__":
+    test_parse_formats()
+    test_load_cache_and_lookup()
+    test_same_content_keeps_file_names()
+    test_cache_recovery_and_concurrent_writers()
+    test_cache_hit_skips_compiling()
+    test_shared_registry_default()
+    test_large_palette_lookup_speed()
+    print("✅ Palette registry works")
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test script for the single-grab color readout and the magnifier rendering
+"""
+
+import sys
+import os
+import types
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from PIL import Image
+
+from color_picker import MAGNIFIER_CAPTURE_SIZE, MAGNIFIER_VIEW_SIZE, ColorPicker, upscale_nearest
+
+
+class _RecordingCapture:
+    """Screen capture returning a fixed area and recording every grab"""
+
+    def __init__(self, area):
+        self.area = area
+        self.calls = []
+
+    def capture_screen_area(self, x, y, capture_size=15):
+        self.calls.append(('area', x, y, capture_size))
+        return self.area
+
+    def get_pixel_color(self, x, y, magnifier_size=21):
+        self.calls.append(('pixel', x, y))
+        return (0, 0, 0)
+
+
+def _picker(mode, area):
+    """The state read_color needs, without creating any windows"""
+    picker = types.SimpleNamespace(sampling_mode=mode, screen_capture=_RecordingCapture(area))
+    for name in ('read_color', 'capture_magnifier_area', 'color_from_area'):
+        setattr(picker, name, getattr(ColorPicker, name).__get__(picker))
+    return picker
+
+
+def test_one_grab_per_read():
+    """The readout comes from the magnifier-sized area grabbed once"""
+    size = MAGNIFIER_CAPTURE_SIZE
+    pixels = np.full((size, size, 3), 100, dtype=np.uint8)
+    pixels[size // 2, size // 2] = (250, 10, 10)
+    area = Image.fromarray(pixels)
+
+    picker = _picker('pixel', area)
+    assert picker.read_color(300, 200) == (250, 10, 10)
+    assert picker.screen_capture.calls == [('area', 300, 200, size)]
+
+    # Region modes summarize the central square of the same grab
+    picker = _picker('median', area)
+    assert picker.read_color(300, 200) == (100, 100, 100)
+    assert len(picker.screen_capture.calls) == 1
+    assert _picker('mean', area).read_color(0, 0) == (106, 96, 96)
+
+
+def test_magnifier_upscale_in_place():
+    """The upscale writes into the shared RGBA buffer, matching PIL's nearest resize"""
+    size = MAGNIFIER_CAPTURE_SIZE
+    patch = np.random.default_rng(0).integers(0, 256, (size, size, 3), dtype=np.uint8)
+    buffer = np.full((MAGNIFIER_VIEW_SIZE, MAGNIFIER_VIEW_SIZE, 4), 255, dtype=np.uint8)
+    view = Image.frombuffer('RGBA', buffer.shape[1::-1], buffer, 'raw', 'RGBA', 0, 1)
+
+    assert upscale_nearest(patch, buffer) is buffer
+    expected = Image.fromarray(patch).resize((MAGNIFIER_VIEW_SIZE, MAGNIFIER_VIEW_SIZE), Image.Resampling.NEAREST)
+    assert np.array_equal(np.asarray(view)[..., :3], np.asarray(expected))
+    assert (buffer[..., 3] == 255).all()
+
+    try:
+        upscale_nearest(patch, np.zeros((100, 100, 4), dtype=np.uint8))
+        assert False, "mismatched buffer accepted"
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    test_one_grab_per_read()
+    test_magnifier_upscale_in_place()
+    print("✅ Preview capture works")
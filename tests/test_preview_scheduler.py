@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test script for the motion-gated live preview scheduler
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import instrumentation
+from utils.preview_scheduler import PreviewScheduler
+
+
+def test_skips_and_adapts_rate():
+    """Identical frames are skipped and slow down; movement boosts the rate"""
+    instrumentation.reset()
+    instrumentation.enable()
+    try:
+        scheduler = PreviewScheduler(min_rate=5, max_rate=50, normal_rate=20)
+        assert scheduler.observe((10, 10), b'a')
+        assert scheduler.rate == 50
+
+        # Still cursor, same patch: skipped, backing off down to the minimum rate
+        rates = []
+        for _ in range(10):
+            assert not scheduler.observe((10, 10), b'a')
+            rates.append(scheduler.rate)
+        assert rates == sorted(rates, reverse=True) and rates[-1] == 5
+
+        # Content changing under a still cursor runs at the normal rate
+        assert scheduler.observe((10, 10), b'b')
+        assert scheduler.rate == 20
+        # Failed captures always update
+        assert scheduler.observe((10, 10), None)
+
+        assert scheduler.observe((11, 10), b'b')
+        assert scheduler.rate == 50
+
+        scheduler.invalidate()
+        assert scheduler.observe((11, 10), b'b')
+        data = instrumentation.snapshot()
+    finally:
+        instrumentation.disable()
+        instrumentation.reset()
+
+    assert data['counters'] == {'gui.preview.frames': 15, 'gui.preview.skipped': 10}
+    assert data['gauges'] == {'gui.preview.rate': 50}
+
+
+def test_rate_validation():
+    for min_rate, max_rate in ((0, 10), (30, 10)):
+        try:
+            PreviewScheduler(min_rate, max_rate)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("invalid rates accepted")
+    # The normal rate is clamped into [min_rate, max_rate]
+    assert PreviewScheduler(1, 10, normal_rate=20).rate == 10
+
+
+if __name__ == "__main__":
+    test_skips_and_adapts_rate()
+    test_rate_validation()
+    print("✅ Preview scheduler works")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test script for region mean/median/trimmed-mean sampling
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from PIL import Image
+
+from utils.region_sampling import sample_region, SAMPLING_MODES
+from utils.platform_capture import PlatformScreenCapture
+
+
+def test_statistics():
+    """Outliers move the mean but not the median or trimmed mean"""
+    region = np.full((5, 5, 3), 100, dtype=np.uint8)
+    region[0, 0] = (255, 255, 255)
+    region[4, 4] = (0, 0, 0)
+    region[0, 4] = (255, 0, 0)
+    region[2, 2] = (101, 99, 100)
+    sample = sample_region(region, trim_fraction=0.1)
+
+    assert sample.center == (101, 99, 100)
+    assert sample.median == (100, 100, 100)
+    assert sample.trimmed_mean == (100, 100, 100)
+    assert sample.mean == tuple(int(v) for v in np.rint(region.reshape(-1, 3).mean(axis=0)))
+    assert sample.pixel_count == 25
+    assert all(spread > 0 for spread in sample.spread)
+    for mode in SAMPLING_MODES:
+        assert len(sample.color(mode)) == 3
+
+
+def test_flat_image_and_errors():
+    """A flat PIL image has no spread; bad input is rejected"""
+    sample = sample_region(Image.new('RGBA', (4, 4), (10, 20, 30, 255)))
+    assert sample.mean == sample.median == sample.trimmed_mean == (10, 20, 30)
+    assert sample.spread == (0.0, 0.0, 0.0)
+    for bad_call in (lambda: sample_region(np.zeros((3, 3))), lambda: sample_region(np.zeros((3, 3, 3)), 0.5),
+                     lambda: sample.color('mode')):
+        try:
+            bad_call()
+            assert False, "bad input accepted"
+        except ValueError:
+            pass
+
+
+def test_single_capture_per_sample():
+    """PlatformScreenCapture.sample_region grabs the area exactly once"""
+    capture = PlatformScreenCapture()
+    calls = []
+
+    def fake_capture(x, y, capture_size=15):
+        calls.append((x, y, capture_size))
+        return Image.new('RGB', (capture_size, capture_size), (1, 2, 3))
+
+    capture.capture_screen_area = fake_capture
+    assert capture.sample_region(40, 50, size=7).median == (1, 2, 3)
+    assert calls == [(40, 50, 7)]
+
+
+if __name__ == "__main__":
+    test_statistics()
+    test_flat_image_and_errors()
+    test_single_capture_per_sample()
+    print("✅ Region sampling works")
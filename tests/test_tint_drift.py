@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test script for frame-sequence tint drift analysis
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from PIL import Image
+
+from utils.tint_drift import analyze_tint_drift, summarize_drift, iter_frames, background_tint
+from utils.comparisonEngine import analyze_hue_direction_first_neutral_only
+from utils.color_space import rgb_to_hsl
+
+REFERENCE = (128, 128, 128)
+# Frames drift from neutral gray toward orange
+FRAME_COLORS = [(128, 128, 128), (131, 128, 125), (140, 128, 116), (150, 128, 100)]
+
+
+def _frame(color, size=(48, 32)):
+    """Background color with a small foreground object that must not count as the tint"""
+    frame = np.zeros((size[1], size[0], 3), dtype=np.uint8)
+    frame[:] = color
+    frame[4:10, 4:10] = (0, 200, 0)
+    return frame
+
+
+def test_background_tint_ignores_foreground():
+    """The largest dominant color is the tint"""
+    assert background_tint(_frame((150, 128, 100))) == (150, 128, 100)
+
+
+def test_directory_sequence():
+    """Folder frames stream in name order with engine hue-direction wording"""
+    with tempfile.TemporaryDirectory() as directory:
+        for index, color in enumerate(FRAME_COLORS):
+            Image.fromarray(_frame(color)).save(os.path.join(directory, f"frame_{index:03d}.png"))
+        assert [label for _, label, _ in iter_frames(directory)] == [f"frame_{i:03d}.png" for i in range(4)]
+
+        drifts = list(analyze_tint_drift(_frame(REFERENCE), directory))
+        parallel = list(analyze_tint_drift(_frame(REFERENCE), directory, workers=2))
+    assert drifts == parallel
+    assert [drift.tint for drift in drifts] == FRAME_COLORS
+    for drift, color in zip(drifts, FRAME_COLORS):
+        h1, s1, _ = rgb_to_hsl(*REFERENCE)
+        h2, s2, _ = rgb_to_hsl(*color)
+        expected = analyze_hue_direction_first_neutral_only(h1, h2, 5, saturation1=s1, saturation2=s2,
+                                                            color1_rgb=REFERENCE, color2_rgb=color)
+        assert drift.hue_text == expected
+    assert drifts[0].hue_text == "same"
+    assert drifts[-1].clipboard_text == "tinted background: neutral (photos) -> orange (video)"
+
+    summary = summarize_drift(drifts)
+    assert summary['frames'] == 4 and summary['drifted_frames'] == 2
+    assert summary['first_drifted'] == "frame_002.png"
+    assert summary['worst']['label'] == "frame_003.png"
+
+
+def test_animated_gif():
+    """Every frame of an animated file is analyzed"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'export.gif')
+        frames = [Image.fromarray(_frame(color)) for color in (REFERENCE, (150, 128, 100))]
+        frames[0].save(path, save_all=True, append_images=frames[1:], duration=40)
+        drifts = list(analyze_tint_drift(path, path))
+    assert [drift.label for drift in drifts] == ["export.gif#0", "export.gif#1"]
+    assert drifts[0].distance == 0
+    assert drifts[1].hue_text.startswith("neutral -> orange")
+
+
+if __name__ == "__main__":
+    test_background_tint_ignores_foreground()
+    test_directory_sequence()
+    test_animated_gif()
+    print("✅ Tint drift analysis works")
@@ -2,24 +2,44 @@
 Utility modules for the Color Picker application.
 
 This package contains platform-specific functionality and helper modules.
+
+The names below are imported from their submodules on first access, so
+importing one submodule (e.g. utils.comparisonEngine for batch jobs) does
+not also load the screen capture and permission modules.
 """
 
-from .platform_capture import PlatformScreenCapture
-from .macos_permissions import request_permission_if_needed
-from .comparisonEngine import (
-    calculate_color_similarity,
-    analyze_color_components,
-    get_simple_color_name,
-    get_top_color_matches,
-    map_css_to_simple
-)
-
-__all__ = [
-    'PlatformScreenCapture', 
-    'request_permission_if_needed',
-    'calculate_color_similarity',
-    'analyze_color_components', 
-    'get_simple_color_name',
-    'get_top_color_matches',
-    'map_css_to_simple'
-]
+import importlib
+
+# Public name -> submodule that defines it
+_LAZY_ATTRIBUTES = {
+    'PlatformScreenCapture': 'platform_capture',
+    'request_permission_if_needed': 'macos_permissions',
+    'calculate_color_similarity': 'comparisonEngine',
+    'analyze_color_components': 'comparisonEngine',
+    'get_simple_color_name': 'comparisonEngine',
+    'get_top_color_matches': 'comparisonEngine',
+    'map_css_to_simple': 'comparisonEngine',
+    'RegionSample': 'region_sampling',
+    'sample_region': 'region_sampling',
+    'DominantColor': 'dominant_colors',
+    'extract_dominant_colors': 'dominant_colors',
+    'compare_images': 'image_comparison',
+    'analyze_tint_drift': 'tint_drift',
+    'ColorService': 'color_service',
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
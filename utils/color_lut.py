@@ -0,0 +1,311 @@
+"""
+Exhaustive 24-bit nearest-color lookup table.
+
+Every possible RGB value is mapped ahead of time to its nearest palette
+entry (and that entry's simple name), so naming a pixel becomes a single
+index into a memory-mapped file. Tables are cached on disk under a path
+keyed on the format version, the palette contents and the distance metric.
+Perceptual metrics (see utils.delta_e) are expensive per pixel, so their
+tables are the fast path for naming whole frames.
+
+The builder can also be run directly:
+
+    python -m utils.color_lut --workers 4 [--metric ciede2000]
+"""
+
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+import numpy as np
+
+from .delta_e import METRICS, check_metric
+from .palette_index import PaletteIndex
+
+
+LUT_FORMAT_VERSION = 1
+LUT_SIZE = 1 << 24
+
+# The sweep is split into one block per red value so it can be resumed
+_BLOCK_SIZE = 1 << 16
+_BLOCK_COUNT = LUT_SIZE // _BLOCK_SIZE
+
+# Palette and metric used by pool workers, set by _init_worker()
+_worker_palette = None
+_worker_metric = 'rgb'
+
+
+def palette_fingerprint(palette, metric='rgb'):
+    """
+    Get a stable hash of a palette's contents.
+
+    Args:
+        palette (PaletteIndex): Compiled palette
+        metric (str): Distance metric the table is built with
+
+    Returns:
+        str: Hex digest that changes whenever names, colors, simple names
+            or the metric change
+    """
+    digest = hashlib.sha256(f"color-lut-v{LUT_FORMAT_VERSION}\n".encode())
+    # RGB tables predate metric selection and keep their original hash
+    if metric != 'rgb':
+        digest.update(f"metric\t{metric}\n".encode())
+    for name, simple_name, rgb in zip(palette.names, palette.simple_names, palette.rgb):
+        digest.update(f"{name}\t{simple_name}\t{rgb[0]},{rgb[1]},{rgb[2]}\n".encode())
+    return digest.hexdigest()[:16]
+
+
+def get_cache_dir():
+    """
+    Get the directory used for cached lookup tables.
+
+    Returns:
+        str: $COLOR_PICKER_CACHE_DIR if set, otherwise ~/.cache/color_picker
+    """
+    cache_dir = os.environ.get('COLOR_PICKER_CACHE_DIR')
+    if not cache_dir:
+        cache_dir = os.path.join(os.path.expanduser('~'), '.cache', 'color_picker')
+    return cache_dir
+
+
+def get_lut_path(palette, cache_dir=None, metric='rgb'):
+    """
+    Get the versioned cache path of a palette's lookup table.
+
+    Args:
+        palette (PaletteIndex): Compiled palette
+        cache_dir (str): Cache root, defaults to get_cache_dir()
+        metric (str): Distance metric the table is built with
+
+    Returns:
+        str: Path of the table file
+    """
+    cache_dir = cache_dir or get_cache_dir()
+    return os.path.join(cache_dir, f"lut-v{LUT_FORMAT_VERSION}", f"{palette_fingerprint(palette, metric)}.u8")
+
+
+class ColorLookupTable:
+    """
+    Memory-mapped table of nearest palette entries for all 24-bit colors.
+
+    The file holds two uint8 planes of LUT_SIZE entries: nearest palette
+    index, then the simple-name id of that entry.
+    """
+
+    def __init__(self, path, palette):
+        self.path = path
+        self.palette = palette
+        self.table = np.memmap(path, dtype=np.uint8, mode='r', shape=(2, LUT_SIZE))
+        self.css_indices = self.table[0]
+        self.simple_indices = self.table[1]
+
+    def lookup(self, pixels):
+        """
+        Look up the nearest palette entry for every pixel.
+
+        Args:
+            pixels (numpy.ndarray): uint8 array of shape (..., 3)
+
+        Returns:
+            tuple: (css_indices, simple_indices) uint8 arrays of shape (...)
+        """
+        pixels = np.asarray(pixels, dtype=np.uint8)
+        codes = pack_rgb(pixels)
+        return self.css_indices[codes], self.simple_indices[codes]
+
+    def lookup_rgb(self, rgb):
+        """
+        Look up a single (r, g, b) color.
+
+        Returns:
+            tuple: (css_index, simple_index)
+        """
+        r, g, b = rgb
+        code = (int(r) << 16) | (int(g) << 8) | int(b)
+        return int(self.css_indices[code]), int(self.simple_indices[code])
+
+
+def pack_rgb(pixels):
+    """
+    Pack uint8 (..., 3) pixels into 24-bit integer codes.
+
+    Returns:
+        numpy.ndarray: int32 array of shape (...)
+    """
+    pixels = np.asarray(pixels)
+    return ((pixels[..., 0].astype(np.int32) << 16)
+            | (pixels[..., 1].astype(np.int32) << 8)
+            | pixels[..., 2].astype(np.int32))
+
+
+def build_lookup_table(palette, path=None, workers=None, progress=None, metric='rgb'):
+    """
+    Build (or finish building) the lookup table for a palette.
+
+    Blocks are written to a '.partial' file and recorded in a '.progress'
+    file as they complete, so an interrupted build resumes where it
+    stopped. The finished table is moved into place atomically.
+
+    Builders of the same table in other processes wait on a '.lock' file
+    and then find the finished table instead of building it again.
+
+    Args:
+        palette (PaletteIndex): Compiled palette, at most 256 entries
+        path (str): Output path, defaults to get_lut_path(palette)
+        workers (int): Number of worker processes, defaults to the CPU count;
+            1 builds in the current process
+        progress (callable): Optional callback(done_blocks, total_blocks)
+        metric (str): 'rgb', 'cie76' or 'ciede2000'
+
+    Returns:
+        str: Path of the finished table
+    """
+    check_metric(metric)
+    if len(palette) > 256 or len(palette.simple_vocabulary) > 256:
+        raise ValueError("lookup tables store uint8 indices, palette has more than 256 entries")
+
+    path = path or get_lut_path(palette, metric=metric)
+    if os.path.exists(path):
+        return path
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with _exclusive_lock(path + '.lock'):
+        # Another process may have finished the table while we waited
+        if not os.path.exists(path):
+            _build_locked(palette, path, workers, progress, metric)
+    return path
+
+
+def _build_locked(palette, path, workers, progress, metric):
+    """build_lookup_table's sweep, run while holding the table's lock"""
+    partial_path = path + '.partial'
+    progress_path = path + '.progress'
+
+    if os.path.exists(partial_path) and os.path.exists(progress_path):
+        with open(progress_path, 'rb') as progress_file:
+            done = bytearray(progress_file.read().ljust(_BLOCK_COUNT, b'\0'))
+        table = np.memmap(partial_path, dtype=np.uint8, mode='r+', shape=(2, LUT_SIZE))
+    else:
+        done = bytearray(_BLOCK_COUNT)
+        table = np.memmap(partial_path, dtype=np.uint8, mode='w+', shape=(2, LUT_SIZE))
+
+    pending = [block for block in range(_BLOCK_COUNT) if not done[block]]
+
+    def store(block, css_indices):
+        start = block * _BLOCK_SIZE
+        table[0, start:start + _BLOCK_SIZE] = css_indices
+        table[1, start:start + _BLOCK_SIZE] = palette.simple_ids[css_indices]
+        table.flush()
+        # Only mark the block once its data is on disk
+        done[block] = 1
+        with open(progress_path, 'wb') as progress_file:
+            progress_file.write(done)
+        if progress:
+            progress(sum(done), _BLOCK_COUNT)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for block in pending:
+            store(block, _compute_block(block, palette, metric))
+    else:
+        init_args = (palette.names.tolist(), palette.rgb.tolist(), palette.simple_names.tolist(), metric)
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=init_args) as executor:
+            for block, css_indices in executor.map(_compute_worker_block, pending):
+                store(block, css_indices)
+
+    table.flush()
+    del table
+    os.replace(partial_path, path)
+    os.remove(progress_path)
+
+
+@contextmanager
+def _exclusive_lock(lock_path):
+    """Hold an OS lock on lock_path; it is released even if the process dies"""
+    with open(lock_path, 'a+b') as lock_file:
+        if os.name == 'nt':
+            import msvcrt
+            lock_file.seek(0)
+            while True:
+                try:
+                    # LK_LOCK gives up after about 10 seconds, so keep waiting
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+            try:
+                yield
+            finally:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def load_lookup_table(palette, path=None, build=True, workers=None, metric='rgb'):
+    """
+    Memory-map a palette's lookup table, building it first if needed.
+
+    Args:
+        palette (PaletteIndex): Compiled palette
+        path (str): Table path, defaults to get_lut_path(palette)
+        build (bool): Build the table when missing instead of returning None
+        workers (int): Worker processes used if a build is needed
+        metric (str): 'rgb', 'cie76' or 'ciede2000'
+
+    Returns:
+        ColorLookupTable: Mapped table, or None if missing and build is False
+    """
+    path = path or get_lut_path(palette, metric=metric)
+    if not os.path.exists(path):
+        if not build:
+            return None
+        build_lookup_table(palette, path, workers, metric=metric)
+    return ColorLookupTable(path, palette)
+
+
+def _compute_block(block, palette, metric='rgb'):
+    """Nearest palette indices for every color whose red channel equals block"""
+    codes = np.arange(block * _BLOCK_SIZE, (block + 1) * _BLOCK_SIZE, dtype=np.int32)
+    pixels = np.stack([codes >> 16, (codes >> 8) & 0xFF, codes & 0xFF], axis=1).astype(np.uint8)
+    indices, _ = palette.batch_top_matches(pixels, top_n=1, metric=metric)
+    return indices[:, 0].astype(np.uint8)
+
+
+def _init_worker(names, rgb_values, simple_names, metric='rgb'):
+    """Rebuild the palette once per worker process"""
+    global _worker_palette, _worker_metric
+    _worker_palette = PaletteIndex(names, rgb_values, simple_names)
+    _worker_metric = metric
+
+
+def _compute_worker_block(block):
+    return block, _compute_block(block, _worker_palette, _worker_metric)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    from .comparisonEngine import get_css3_palette
+
+    parser = argparse.ArgumentParser(description="Build the 24-bit CSS3 nearest-color lookup table")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--output', default=None, help="output path (default: versioned cache path)")
+    parser.add_argument('--metric', default='rgb', choices=METRICS, help="distance metric (default: rgb)")
+    args = parser.parse_args()
+
+    css3_palette = get_css3_palette()
+    start_time = time.time()
+    output = build_lookup_table(
+        css3_palette, args.output, args.workers,
+        progress=lambda done, total: print(f"\r{done}/{total} blocks", end="", flush=True),
+        metric=args.metric
+    )
+    print(f"\nLookup table ready: {output} ({time.time() - start_time:.1f}s)")
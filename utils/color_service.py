@@ -0,0 +1,417 @@
+"""
+Local HTTP/JSON color-analysis service.
+
+Serves the engine's naming and comparison to tools that cannot import the
+GUI (web QA dashboards, render farm checks). It uses only asyncio and the
+existing dependencies and binds to the loopback interface.
+
+Endpoints (JSON request and response bodies):
+
+    POST /v1/names       {"colors": [[r, g, b], ...], "top_n": 3, "metric": "rgb", "palette": null}
+    POST /v1/similarity  {"pairs": [[[r, g, b], [r, g, b]], ...], "metric": "rgb"}
+    POST /v1/region      {"pixels": [[[r, g, b], ...], ...], "colors": 5, "trim_fraction": 0.1}
+    POST /v1/image       {"path": "/abs/image.png", "colors": 5, "hue_subdivisions": 12}
+    GET  /v1/stats       per-endpoint latency, batch counters and engine timers
+    GET  /health
+
+Small naming and similarity requests that arrive together are coalesced
+into one call of the vectorized batch functions, which runs on a worker
+thread. Region and image analysis run in a process pool. Neither blocks
+the event loop.
+
+Usage:
+    python -m utils.color_service [--port 8765] [--workers N] [--palette brand.gpl]
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http import HTTPStatus
+
+import numpy as np
+
+from . import instrumentation
+from .comparisonEngine import calculate_color_similarity_batch, get_color_names_batch
+from .delta_e import check_metric
+from .dominant_colors import DEFAULT_COLOR_COUNT, extract_dominant_colors
+from .image_batch import _init_worker, analyze_image, load_worker_palette
+from .palette_registry import get_palette
+from .region_sampling import DEFAULT_TRIM_FRACTION, sample_region
+
+
+DEFAULT_PORT = 8765
+LOOPBACK_HOSTS = ('127.0.0.1', 'localhost', '::1')
+MAX_BODY_BYTES = 64 << 20
+# How long the first request of a batch waits for others, and the batch cap
+DEFAULT_BATCH_DELAY = 0.002
+DEFAULT_MAX_BATCH = 1 << 16
+IMAGE_OPTIONS = ('colors', 'hue_subdivisions', 'metric', 'tile_pixels', 'sample_size', 'seed')
+
+
+class ServiceError(Exception):
+    """A request error reported to the client with an HTTP status"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class _Batcher:
+    """
+    Coalesce concurrent requests into one vectorized call.
+
+    Requests with the same key (e.g. metric and top_n) are queued for up to
+    `delay` seconds, or until `max_size` items are waiting, and computed
+    together. compute(key, items) receives the concatenated (N, ...) array
+    and returns a sequence of N per-item results. It runs on `executor` (the
+    loop's default executor if None), so a large batch never stalls the
+    event loop.
+    """
+
+    def __init__(self, name, compute, delay=DEFAULT_BATCH_DELAY, max_size=DEFAULT_MAX_BATCH):
+        self.name = name
+        self.compute = compute
+        self.delay = delay
+        self.max_size = max_size
+        self.executor = None
+        self._pending = {}
+        self._running = set()
+
+    async def submit(self, key, items):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = self._pending[key] = {'requests': [], 'size': 0}
+            batch['handle'] = loop.call_later(self.delay, self._flush, key)
+        batch['requests'].append((items, future))
+        batch['size'] += len(items)
+        if batch['size'] >= self.max_size:
+            batch['handle'].cancel()
+            self._flush(key)
+        return await future
+
+    def _flush(self, key):
+        batch = self._pending.pop(key)
+        requests = [(items, future) for items, future in batch['requests'] if not future.cancelled()]
+        if not requests:
+            return
+        instrumentation.count(f'service.{self.name}.batches')
+        instrumentation.count(f'service.{self.name}.batched_requests', len(requests))
+        # Keep a reference so the task is not collected while it runs
+        task = asyncio.get_running_loop().create_task(self._run(key, requests))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, key, requests):
+        loop = asyncio.get_running_loop()
+        items = np.concatenate([items for items, _ in requests])
+        try:
+            results = await loop.run_in_executor(self.executor, self._timed_compute, key, items)
+        except Exception as e:
+            for _, future in requests:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        offset = 0
+        for items, future in requests:
+            if not future.done():
+                future.set_result(results[offset:offset + len(items)])
+            offset += len(items)
+
+    def _timed_compute(self, key, items):
+        with instrumentation.timer(f'service.{self.name}.batch'):
+            return self.compute(key, items)
+
+
+class ColorService:
+    """
+    Asyncio HTTP server for the color-analysis endpoints.
+
+    Args:
+        host (str): Loopback address to bind
+        port (int): Port, 0 for any free port
+        workers (int): Processes for region and image analysis (default: CPU count)
+        palette_path (str): Palette file made active here and in every worker
+        batch_delay (float): Seconds a request waits for others to batch with
+        max_batch (int): Colors or pairs computed in one batch at most
+    """
+
+    def __init__(self, host='127.0.0.1', port=DEFAULT_PORT, workers=None, palette_path=None,
+                 batch_delay=DEFAULT_BATCH_DELAY, max_batch=DEFAULT_MAX_BATCH):
+        if host not in LOOPBACK_HOSTS:
+            raise ValueError(f"the service only binds to the local machine, one of {LOOPBACK_HOSTS}")
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.palette_path = palette_path
+        self._names = _Batcher('names', _compute_names, batch_delay, max_batch)
+        self._similarity = _Batcher('similarity', _compute_similarity, batch_delay, max_batch)
+        self._routes = {
+            ('POST', '/v1/names'): ('names', self._handle_names),
+            ('POST', '/v1/similarity'): ('similarity', self._handle_similarity),
+            ('POST', '/v1/region'): ('region', self._handle_region),
+            ('POST', '/v1/image'): ('image', self._handle_image),
+            ('GET', '/v1/stats'): ('stats', self._handle_stats),
+            ('GET', '/health'): ('health', self._handle_health),
+        }
+        self._server = None
+        self._executor = None
+        self._batch_executor = None
+
+    async def start(self):
+        """
+        Start listening.
+
+        Returns:
+            int: The bound port
+        """
+        # Latency reporting is part of the service
+        instrumentation.enable()
+        initargs = load_worker_palette(self.palette_path)
+        _init_worker(*initargs)
+        # Spawned, not forked: the workers start on the first region or image
+        # request, and forked ones would inherit that client's socket and the
+        # listening socket, keeping both open for the life of the pool
+        self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'),
+                                             initializer=_init_worker, initargs=initargs)
+        # One thread: batches run in order and share the engine's lazy caches
+        self._batch_executor = ThreadPoolExecutor(1, thread_name_prefix='color-service-batch')
+        self._names.executor = self._similarity.executor = self._batch_executor
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """Stop listening and shut the worker processes down"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._batch_executor is not None:
+            self._batch_executor.shutdown(wait=True)
+            self._batch_executor = None
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                    headers = await _read_headers(reader)
+                    length = int(headers.get('content-length', 0))
+                except ValueError:
+                    await _write_response(writer, HTTPStatus.BAD_REQUEST, {'error': "malformed request"}, False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await _write_response(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                          {'error': f"body larger than {MAX_BODY_BYTES} bytes"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                status, payload = await self._dispatch(method, target.partition('?')[0], body)
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                await _write_response(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method, path, body):
+        route = self._routes.get((method, path))
+        if route is None:
+            if any(route_path == path for _, route_path in self._routes):
+                return HTTPStatus.METHOD_NOT_ALLOWED, {'error': f"{method} not allowed on {path}"}
+            return HTTPStatus.NOT_FOUND, {'error': f"no endpoint {path}"}
+
+        name, handler = route
+        with instrumentation.timer(f'service.{name}'):
+            try:
+                request = json.loads(body) if body else {}
+                if not isinstance(request, dict):
+                    raise ServiceError(HTTPStatus.BAD_REQUEST, "request body must be a JSON object")
+                return HTTPStatus.OK, await handler(request)
+            except ServiceError as e:
+                status, message = e.status, str(e)
+            except (ValueError, TypeError, KeyError) as e:
+                # Includes json.JSONDecodeError and the engine's input checks
+                status, message = HTTPStatus.BAD_REQUEST, f"{type(e).__name__}: {e}"
+            except OSError as e:
+                status, message = HTTPStatus.NOT_FOUND, f"{type(e).__name__}: {e}"
+        instrumentation.count(f'service.{name}.errors')
+        return status, {'error': message}
+
+    async def _handle_names(self, request):
+        colors = _colors_array(request.get('colors', [request.get('color')]), 'colors')
+        top_n = int(request.get('top_n', 3))
+        if top_n < 1:
+            raise ValueError("top_n must be at least 1")
+        metric = request.get('metric', 'rgb')
+        check_metric(metric)
+        palette = get_palette(request.get('palette'))
+        matches = await self._names.submit((top_n, metric, palette), colors)
+        return {'matches': list(matches)}
+
+    async def _handle_similarity(self, request):
+        pairs = request.get('pairs')
+        if pairs is None:
+            pairs = [[request.get('color1'), request.get('color2')]]
+        pairs = _colors_array(pairs, 'pairs').reshape(-1, 2, 3) if len(pairs) else np.empty((0, 2, 3), np.int64)
+        metric = request.get('metric', 'rgb')
+        check_metric(metric)
+        results = await self._similarity.submit(metric, pairs)
+        return {'results': list(results)}
+
+    async def _handle_region(self, request):
+        pixels = np.asarray(request['pixels'], dtype=np.int64)
+        if pixels.ndim != 3 or pixels.shape[2] != 3 or pixels.size == 0:
+            raise ValueError("pixels must have shape (height, width, 3)")
+        if pixels.min() < 0 or pixels.max() > 255:
+            raise ValueError("pixel values must be in the 0-255 range")
+        options = {
+            'colors': int(request.get('colors', DEFAULT_COLOR_COUNT)),
+            'trim_fraction': float(request.get('trim_fraction', DEFAULT_TRIM_FRACTION)),
+            'metric': request.get('metric', 'rgb'),
+        }
+        check_metric(options['metric'])
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, _analyze_region, pixels.astype(np.uint8), options)
+
+    async def _handle_image(self, request):
+        path = request['path']
+        if not isinstance(path, str) or not os.path.isabs(path):
+            raise ValueError("path must be an absolute file path")
+        if not os.path.isfile(path):
+            raise ServiceError(HTTPStatus.NOT_FOUND, f"no such file: {path}")
+        options = {key: request[key] for key in IMAGE_OPTIONS if key in request}
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, _analyze_image_file, path, options)
+
+    async def _handle_stats(self, request):
+        return instrumentation.snapshot()
+
+    async def _handle_health(self, request):
+        return {'status': 'ok'}
+
+
+async def _read_headers(reader):
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            return headers
+        name, separator, value = line.decode('latin-1').partition(':')
+        if not separator:
+            raise ValueError("malformed header line")
+        headers[name.strip().lower()] = value.strip()
+
+
+async def _write_response(writer, status, payload, keep_alive):
+    body = json.dumps(payload).encode('utf-8')
+    head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    writer.write(head.encode('latin-1') + body)
+    await writer.drain()
+
+
+def _colors_array(colors, field):
+    """Validate a JSON list of RGB colors (or color pairs) as an int array"""
+    try:
+        array = np.asarray(colors, dtype=np.int64)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field} must be a list of [r, g, b] colors") from None
+    if array.ndim < 2 or array.shape[-1] != 3:
+        raise ValueError(f"{field} must be a list of [r, g, b] colors")
+    if array.size and (array.min() < 0 or array.max() > 255):
+        raise ValueError("color values must be in the 0-255 range")
+    return array
+
+
+def _compute_names(key, colors):
+    """Batch get_top_color_matches: (simple_name, name, distance) lists per color"""
+    top_n, metric, palette = key
+    css_indices, _, distances = get_color_names_batch(colors.astype(np.uint8), top_n, metric=metric,
+                                                      palette=palette)
+    return [
+        [[str(palette.simple_names[i]), str(palette.names[i]), float(distance)]
+         for i, distance in zip(row_indices, row_distances)]
+        for row_indices, row_distances in zip(css_indices.tolist(), distances.tolist())
+    ]
+
+
+def _compute_similarity(metric, pairs):
+    """Batch calculate_color_similarity: one result dict per pair"""
+    result = calculate_color_similarity_batch(pairs[:, 0], pairs[:, 1], include_text=True, metric=metric)
+    return [
+        {
+            'distance': float(result['distance'][i]),
+            'assessment': result['assessment'][i],
+            'display_color': result['display_color'][i],
+            'assessment_text': result['assessment_text'][i],
+            'clipboard_text': result['clipboard_text'][i],
+            'hue_diff': float(result['hue_diff'][i]),
+            'saturation_diff': float(result['saturation_diff'][i]),
+            'lightness_diff': float(result['lightness_diff'][i]),
+        }
+        for i in range(len(pairs))
+    ]
+
+
+def _analyze_region(pixels, options):
+    """Region statistics and dominant colors, run in a worker process"""
+    sample = sample_region(pixels, options['trim_fraction'])
+    dominant = extract_dominant_colors(pixels, k=options['colors'], metric=options['metric'])
+    return {
+        'sample': sample._asdict(),
+        'dominant_colors': [color._asdict() for color in dominant],
+    }
+
+
+def _analyze_image_file(path, options):
+    """analyze_image in a worker process"""
+    return analyze_image(path, **options)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve color naming and comparison over local HTTP/JSON")
+    parser.add_argument('--host', default='127.0.0.1', choices=LOOPBACK_HOSTS, help="loopback address to bind")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f"port (default: {DEFAULT_PORT})")
+    parser.add_argument('--workers', type=int, default=None, help="analysis worker processes (default: CPU count)")
+    parser.add_argument('--palette', default=None, help="JSON or GIMP .gpl palette to name colors with")
+    parser.add_argument('--batch-delay-ms', type=float, default=DEFAULT_BATCH_DELAY * 1e3,
+                        help="time a request waits to be batched with others (default: 2)")
+    args = parser.parse_args()
+
+    service = ColorService(args.host, args.port, args.workers, args.palette, args.batch_delay_ms / 1e3)
+
+    async def run():
+        port = await service.start()
+        print(f"Color service listening on http://{args.host}:{port}", flush=True)
+        try:
+            await service.serve_forever()
+        finally:
+            await service.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,322 @@
+"""
+Color space conversions shared by the GUI and the comparison engine.
+
+Provides a scalar RGB to HSL conversion for single picks and a NumPy
+kernel that converts whole arrays or images with identical results, the
+hue kernel of the compare_hues quantizer, and table-driven RGB to CIELAB
+conversion for perceptual color distances.
+"""
+
+import numpy as np
+
+
+def rgb_to_hsl(r, g, b, ndigits=1):
+    """
+    Convert RGB values to HSL (Hue, Saturation, Lightness).
+
+    Args:
+        r, g, b (int): RGB values (0-255)
+        ndigits (int): Decimal places to round to, or None for unrounded values
+
+    Returns:
+        tuple: (hue, saturation, lightness) where:
+            - hue: 0-360 degrees
+            - saturation: 0-100 percent
+            - lightness: 0-100 percent
+    """
+    # Normalize RGB values to 0-1 range
+    r_norm = r / 255.0
+    g_norm = g / 255.0
+    b_norm = b / 255.0
+
+    # Find max and min values
+    max_val = max(r_norm, g_norm, b_norm)
+    min_val = min(r_norm, g_norm, b_norm)
+
+    # Calculate lightness
+    lightness = (max_val + min_val) / 2.0
+
+    # Calculate saturation and hue
+    if max_val == min_val:
+        # Achromatic (gray)
+        saturation = 0.0
+        hue = 0.0
+    else:
+        # Calculate saturation
+        if lightness < 0.5:
+            saturation = (max_val - min_val) / (max_val + min_val)
+        else:
+            saturation = (max_val - min_val) / (2.0 - max_val - min_val)
+
+        # Calculate hue
+        delta = max_val - min_val
+
+        if max_val == r_norm:
+            hue = ((g_norm - b_norm) / delta) % 6
+        elif max_val == g_norm:
+            hue = (b_norm - r_norm) / delta + 2
+        else:  # max_val == b_norm
+            hue = (r_norm - g_norm) / delta + 4
+
+        hue *= 60  # Convert to degrees
+
+    # Convert to percentages
+    saturation *= 100
+    lightness *= 100
+
+    if ndigits is not None:
+        hue = round(hue, ndigits)
+        saturation = round(saturation, ndigits)
+        lightness = round(lightness, ndigits)
+
+    return hue, saturation, lightness
+
+
+def rgb_to_hsl_array(rgb, ndigits=1, chunk_size=1 << 16):
+    """
+    Convert an array or image of RGB values to HSL.
+
+    Gives exactly the same values as rgb_to_hsl for every element,
+    including the rounding.
+
+    Args:
+        rgb: Array of shape (..., 3) with RGB values (0-255), or a PIL image
+        ndigits (int): Decimal places to round to, or None for unrounded values
+        chunk_size (int): Number of colors converted at once; small chunks
+            keep temporaries in cache
+
+    Returns:
+        numpy.ndarray: float64 array of shape (..., 3) with hue, saturation, lightness
+    """
+    if hasattr(rgb, 'getbands'):
+        rgb = np.asarray(rgb.convert('RGB'))
+    rgb = np.asarray(rgb)
+    if rgb.shape[-1:] != (3,):
+        raise ValueError("rgb must have shape (..., 3)")
+
+    flat = rgb.reshape(-1, 3)
+    hsl = np.empty(flat.shape, dtype=np.float64)
+    for start in range(0, len(flat), chunk_size):
+        planes = _hsl_planes(flat[start:start + chunk_size])
+        if ndigits is not None:
+            planes = round_like_python(planes, ndigits)
+        hsl[start:start + chunk_size] = planes.T
+    return hsl.reshape(rgb.shape)
+
+
+def _hsl_planes(rgb):
+    """Unrounded HSL of an (N, 3) chunk, returned as a (3, N) array"""
+    # Same floating point operations as rgb_to_hsl, giving identical values.
+    # Branches are selected by multiplying with 0/1 masks, which is exact
+    # for finite values and much cheaper than masked assignment.
+    rgb_norm = np.ascontiguousarray(np.asarray(rgb).T, dtype=np.float64)
+    rgb_norm /= 255.0
+    r_norm, g_norm, b_norm = rgb_norm
+    max_val = np.maximum(np.maximum(r_norm, g_norm), b_norm)
+    min_val = np.minimum(np.minimum(r_norm, g_norm), b_norm)
+    delta = max_val - min_val
+    # Grays have a zero numerator; a unit divisor makes their hue and saturation 0
+    achromatic = delta == 0
+
+    planes = np.empty((3, len(r_norm)), dtype=np.float64)
+    hue, saturation, lightness = planes
+    total = max_val + min_val
+    np.divide(total, 2.0, out=lightness)
+
+    # Saturation: delta / (max + min) below half lightness, else delta / (2 - max - min)
+    high = lightness >= 0.5
+    np.multiply(total, ~high, out=saturation)
+    saturation += (2.0 - max_val - min_val) * high
+    saturation += achromatic
+    np.divide(delta, saturation, out=saturation)
+
+    # Hue sector by which channel is the max (red, then green, then blue).
+    # For a red max, x % 6 equals x + 6 when x is negative.
+    red_max = max_val == r_norm
+    green_max = (max_val == g_norm) & ~red_max
+    blue_max = ~(red_max | green_max)
+    np.multiply(g_norm - b_norm, red_max, out=hue)
+    hue += (b_norm - r_norm) * green_max
+    hue += (r_norm - g_norm) * blue_max
+    hue /= delta + achromatic
+    offset = green_max * 2.0
+    offset += blue_max * 4.0
+    offset += (red_max & (hue < 0)) * 6.0
+    hue += offset
+
+    hue *= 60
+    saturation *= 100
+    lightness *= 100
+    return planes
+
+
+def quantizer_hue_array(rgb, chunk_size=1 << 16):
+    """
+    Unrounded hue as compare_hues.hue_quantize defines it.
+
+    Unlike rgb_to_hsl, red-sector hues at or below 0 are wrapped by adding
+    360 to the degrees, so pure red is 360 and the values keep the bits
+    the quantizer's hue bins were tuned on.
+
+    Args:
+        rgb: Array of shape (..., 3) with RGB values (0-255), or a PIL image
+        chunk_size (int): Number of colors converted at once
+
+    Returns:
+        numpy.ndarray: float64 array of shape (...) with hues in (0, 360],
+            0 for grays
+    """
+    if hasattr(rgb, 'getbands'):
+        rgb = np.asarray(rgb.convert('RGB'))
+    rgb = np.asarray(rgb)
+    if rgb.shape[-1:] != (3,):
+        raise ValueError("rgb must have shape (..., 3)")
+
+    flat = rgb.reshape(-1, 3)
+    hue = np.empty(len(flat), dtype=np.float64)
+    for start in range(0, len(flat), chunk_size):
+        hue[start:start + chunk_size] = _quantizer_hue_plane(flat[start:start + chunk_size])
+    return hue.reshape(rgb.shape[:-1])
+
+
+def _quantizer_hue_plane(rgb):
+    """quantizer_hue_array of an (N, 3) chunk"""
+    # Masked sectors as in _hsl_planes; only the wrap of negative red hues differs
+    rgb_norm = np.ascontiguousarray(np.asarray(rgb).T, dtype=np.float64)
+    rgb_norm /= 255.0
+    r_norm, g_norm, b_norm = rgb_norm
+    max_val = np.maximum(np.maximum(r_norm, g_norm), b_norm)
+    min_val = np.minimum(np.minimum(r_norm, g_norm), b_norm)
+    delta = max_val - min_val
+    achromatic = delta == 0
+
+    red_max = max_val == r_norm
+    green_max = (max_val == g_norm) & ~red_max
+    blue_max = ~(red_max | green_max)
+    hue = (g_norm - b_norm) * red_max
+    hue += (b_norm - r_norm) * green_max
+    hue += (r_norm - g_norm) * blue_max
+    hue /= delta + achromatic
+    hue += green_max * 2.0 + blue_max * 4.0
+
+    hue *= 60
+    hue += (hue <= 0) * 360.0
+    hue *= ~achromatic
+    return hue
+
+
+def round_like_python(values, ndigits=1):
+    """
+    Round an array exactly as Python's round() rounds each float.
+
+    round() rounds the exact binary value of a float, with ties going to
+    even, while np.round rounds the already-rounded product values * 10**n.
+    The product is therefore computed with its exact error term (Dekker's
+    two-product) and the rounding direction decided from both parts.
+
+    Args:
+        values (numpy.ndarray): float64 values
+        ndigits (int): Decimal places to round to
+
+    Returns:
+        numpy.ndarray: Rounded values, same shape as the input
+    """
+    scale = 10.0 ** ndigits
+    values = np.asarray(values, dtype=np.float64)
+
+    # scaled + error == values * scale exactly
+    scaled = values * scale
+    value_high, value_low = _split(values)
+    scale_high, scale_low = _split(scale)
+    error = ((value_high * scale_high - scaled) + value_high * scale_low
+             + value_low * scale_high) + value_low * scale_low
+
+    # Sign of (exact product - nearest .5 point); exact zero is a true tie
+    whole = np.floor(scaled)
+    direction = (scaled - (whole + 0.5)) + error
+    round_up = direction > 0
+    ties = direction == 0
+    if ties.any():
+        round_up[ties] = whole[ties] % 2 == 1
+    whole += round_up
+    whole /= scale
+    return whole
+
+
+def _split(values):
+    """Veltkamp split of float64 values into non-overlapping 26-bit halves"""
+    scaled = values * 134217729.0  # 2**27 + 1
+    high = scaled - (scaled - values)
+    return high, values - high
+
+
+# sRGB channel value (0-255) -> linear light, one entry per 8-bit value
+SRGB_TO_LINEAR = np.array([
+    value / 12.92 if value <= 0.04045 else ((value + 0.055) / 1.055) ** 2.4
+    for value in np.arange(256) / 255.0
+])
+
+# Linear sRGB -> CIE XYZ, already divided by the D65 reference white,
+# so each row gives X/Xn, Y/Yn and Z/Zn
+_XYZ_WHITE = np.array([0.95047, 1.0, 1.08883])
+_LINEAR_TO_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+]) / _XYZ_WHITE[:, None]
+
+_LAB_EPSILON = (6 / 29) ** 3
+_LAB_SLOPE = 1 / (3 * (6 / 29) ** 2)
+
+
+def rgb_to_lab(r, g, b):
+    """
+    Convert RGB values to CIELAB (D65 white point).
+
+    Args:
+        r, g, b (int): RGB values (0-255)
+
+    Returns:
+        tuple: (lightness, a, b) with lightness in 0-100
+    """
+    # Plain float arithmetic in the same order as rgb_to_lab_array gives
+    # identical values without the overhead of tiny arrays
+    red, green, blue = (float(SRGB_TO_LINEAR[int(c)]) for c in (r, g, b))
+    f = []
+    for row in _LINEAR_TO_XYZ.tolist():
+        value = row[0] * red + row[1] * green + row[2] * blue
+        f.append(float(np.cbrt(value)) if value > _LAB_EPSILON else value * _LAB_SLOPE + 4 / 29)
+    return 116 * f[1] - 16, 500 * (f[0] - f[1]), 200 * (f[1] - f[2])
+
+
+def rgb_to_lab_array(rgb):
+    """
+    Convert an array or image of RGB values to CIELAB (D65 white point).
+
+    Channels are linearized through the 256-entry SRGB_TO_LINEAR table,
+    so the only per-pixel work is a 3x3 transform and a cube root.
+
+    Args:
+        rgb: Integer array of shape (..., 3) with RGB values (0-255), or a PIL image
+
+    Returns:
+        numpy.ndarray: float64 array of shape (..., 3) with L*, a*, b*
+    """
+    if hasattr(rgb, 'getbands'):
+        rgb = np.asarray(rgb.convert('RGB'))
+    rgb = np.asarray(rgb)
+    if rgb.shape[-1:] != (3,):
+        raise ValueError("rgb must have shape (..., 3)")
+
+    linear = SRGB_TO_LINEAR[rgb.astype(np.intp, copy=False)]
+    red, green, blue = linear[..., 0], linear[..., 1], linear[..., 2]
+    # Written out rather than a matrix product, whose rounding depends on
+    # the array shape, so single colors and arrays convert identically
+    xyz = np.stack([row[0] * red + row[1] * green + row[2] * blue for row in _LINEAR_TO_XYZ], axis=-1)
+    f = np.where(xyz > _LAB_EPSILON, np.cbrt(xyz), xyz * _LAB_SLOPE + 4 / 29)
+
+    lab = np.empty(f.shape, dtype=np.float64)
+    lab[..., 0] = 116 * f[..., 1] - 16
+    lab[..., 1] = 500 * (f[..., 0] - f[..., 1])
+    lab[..., 2] = 200 * (f[..., 1] - f[..., 2])
+    return lab
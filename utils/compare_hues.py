@@ -1,4 +1,8 @@
+import numpy as np
+
 from .hues_lists import hues
+from .color_space import quantizer_hue_array
+
 def hue_quantize(colour, hue_subdivisions=12):
     """Returns a list with hue value, hue name, quantized hue value.
     The 'colour' argument is a list with rgb values,
@@ -15,41 +19,15 @@ def hue_quantize(colour, hue_subdivisions=12):
         hue_names = []
         hue_values = []
 
-    # Normalise RGB
-    colour_n = []
-    for i in range(3):
-        colour_n.append(colour[i]/255)
-    r_n = colour_n[0]
-    g_n = colour_n[1]
-    b_n = colour_n[2]
-
-    # Identify max and min
-    max_value = max(colour_n)
-    min_value = min(colour_n)
-    max_index = colour_n.index(max_value)
-
-    # Formula to get Hue value from RGB
-    # If max == 0 it's black, hue = 0
-    if max_value == min_value:
+    # Hue from the shared kernel, in (0, 360] with pure red at 360 so it quantizes to Red'
+    hue = float(quantizer_hue_array(colour[:3]))
+
+    # Zero hue means max == min: it's a neutral, hue = 0
+    if hue == 0:
         hue = 0
         closest_hue_name = "neutral"
         closest_hue_value = 0
     else:
-        # Max is red
-        if max_index == 0:
-            hue = (g_n - b_n) / (max_value - min_value)
-        # Max is green
-        elif max_index == 1:
-            hue = 2.0 + (b_n - r_n) / (max_value - min_value)
-        # Max is blue
-        elif max_index == 2:
-            hue = 4.0 + (r_n - g_n) / (max_value - min_value)
-
-        # Convert to degrees
-        hue *= 60
-        if hue <= 0:
-            hue += 360
-
         # Find closest hue
         min_distance = 360
         closest_hue_name = ""
@@ -134,3 +112,115 @@ def compare_colours(first_colour, second_colour, hue_subdivisions=12):
         # return the first and the second hue names
         else:
             return [colour1_data[1], colour2_data[1]]
+
+
+def hue_name_table(hue_subdivisions=12):
+    """Returns the hue names used by the array functions, indexed by hue-name index.
+    The names are those of the chosen hue list without the closing "Red'" alias
+    (which shares index 0 with "Red"), followed by "neutral".
+    Args: hue_subdivisions decides which hue list to use from hues_lists.py"""
+
+    hue_names = _get_hue_list(hue_subdivisions)[0]
+    return hue_names[:-1] + ["neutral"]
+
+
+def _get_hue_list(hue_subdivisions):
+    # The array functions need a valid list; the scalar ones fail later on unknown lists
+    if hue_subdivisions not in hues:
+        raise ValueError(f"unknown hue subdivisions {hue_subdivisions!r}, expected one of {sorted(hues)}")
+    return hues[hue_subdivisions]
+
+
+def hue_quantize_array(colours, hue_subdivisions=12):
+    """Array version of hue_quantize for a whole (N, 3) array or (H, W, 3) image.
+    Returns a dict of arrays shaped like the input without its last axis:
+        - hue: the original hue value (360 for pure reds, 0 for neutrals)
+        - index: the hue-name index into hue_name_table(hue_subdivisions)
+        - value: the quantized hue value (360 for "Red'", 0 for neutrals)
+    Every element equals what hue_quantize returns for the same colour.
+    Args: colours is an array of RGB values (or a PIL image),
+    hue_subdivisions decides which hue list to use from hues_lists.py"""
+
+    hue_names, hue_values = _get_hue_list(hue_subdivisions)
+    hue_values = np.asarray(hue_values)
+    last = len(hue_values) - 1
+
+    hue = quantizer_hue_array(colours)
+    neutral = hue == 0
+
+    # hue_quantize keeps the nearest list value below (or at) the hue unless the
+    # next value above is strictly closer, so only the two neighbours matter
+    lower = np.clip(np.searchsorted(hue_values, hue, side='right') - 1, 0, last)
+    upper = np.minimum(lower + 1, last)
+    closer_above = (hue_values[upper] - hue) < (hue - hue_values[lower])
+    wheel_index = np.where(closer_above, upper, lower)
+
+    # "Red'" shares the name index of "Red"; neutrals come after the hue names
+    index = np.where(wheel_index == last, 0, wheel_index)
+    index = np.where(neutral, last, index)
+    value = np.where(neutral, 0.0, hue_values[wheel_index])
+    return {'hue': hue, 'index': index.astype(np.intp), 'value': value}
+
+
+def compare_colours_array(first_colours, second_colours, hue_subdivisions=12):
+    """Array version of compare_colours for pairs of colours.
+    Returns a dict of arrays, one element per pair, encoding the list compare_colours returns:
+        - length: 1, 2 or 3, the length of that list
+        - first: hue-name index of the first colour
+        - second: hue-name index of the second colour
+        - lean: hue-name index the second hue is leaning into, -1 unless length is 3
+    Hue-name indexes are into hue_name_table(hue_subdivisions); a length of 1 means
+    [second], 2 means [first, second] and 3 means [first, second, lean].
+    decode_colour_comparisons turns the arrays back into those lists.
+    Args: first_colours and second_colours are arrays of RGB values with the same shape,
+    hue_subdivisions decides which hue list to use from hues_list.py"""
+
+    first_colours = np.asarray(first_colours)
+    second_colours = np.asarray(second_colours)
+    if first_colours.shape != second_colours.shape:
+        raise ValueError("first_colours and second_colours must have the same shape")
+
+    hue_names = _get_hue_list(hue_subdivisions)[0]
+    count = len(hue_names)
+    colour1_data = hue_quantize_array(first_colours, hue_subdivisions)
+    colour2_data = hue_quantize_array(second_colours, hue_subdivisions)
+
+    # Index of the second quantized value in the full list (neutrals are at 0, "Red'" is last)
+    hue2_index = np.where(colour2_data['value'] == 360, count - 1, colour2_data['index'])
+    hue2_index = np.where(colour2_data['index'] == count - 1, 0, hue2_index)
+
+    hue_difference = colour2_data['hue'] - colour1_data['hue']
+    same_name = colour1_data['index'] == colour2_data['index']
+
+    # Invert the leaning direction to account for the wrapping of the hues list (Red)
+    wrap = np.where((colour1_data['value'] == 0) | (colour2_data['value'] == 0), -1, 1)
+    step = np.where(hue_difference < 0, -wrap, wrap)
+    lean = (hue2_index + step) % count
+    # "Red'" leans are reported as "Red"
+    lean = np.where(lean == count - 1, 0, lean)
+
+    length = np.where(hue_difference == 0, 1, np.where(same_name, 3, 2))
+    return {
+        'length': length.astype(np.int8),
+        'first': colour1_data['index'],
+        'second': colour2_data['index'],
+        'lean': np.where(length == 3, lean, -1).astype(np.intp),
+    }
+
+
+def decode_colour_comparisons(result, hue_subdivisions=12):
+    """Turns the arrays from compare_colours_array into a list of compare_colours lists.
+    Args: result is the dict returned by compare_colours_array,
+    hue_subdivisions must be the value it was called with"""
+
+    names = hue_name_table(hue_subdivisions)
+    comparisons = []
+    for length, first, second, lean in zip(result['length'].ravel(), result['first'].ravel(),
+                                           result['second'].ravel(), result['lean'].ravel()):
+        if length == 1:
+            comparisons.append([names[second]])
+        elif length == 2:
+            comparisons.append([names[first], names[second]])
+        else:
+            comparisons.append([names[first], names[second], names[lean]])
+    return comparisons
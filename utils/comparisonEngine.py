@@ -44,75 +44,64 @@ for comparing     # Add soph    # Add sop    # Add sophisticated hue analysis fo
     return assessment, color, clipboard_textors and providing detailed similarity assessments.
 """
 
-import webcolors
+from types import MappingProxyType
+
+import numpy as np
 from .compare_hues import compare_colours
 from .hues_lists import hues
+from .color_space import rgb_to_hsl, rgb_to_hsl_array, rgb_to_lab, rgb_to_lab_array
+from .delta_e import check_metric, get_delta_e_function
+from .hue_wheel import get_hue_wheel
+from .palette_index import PaletteIndex
+from .palette_registry import get_palette
+from .comparison_cache import ComparisonCache, pack_color_pair
+from .comparison_result import ColorComparison, HSLAnalysis, HueTransition
+from .instrumentation import timed
 
 
-def rgb_to_hsl(r, g, b):
-    """
-    Convert RGB values to HSL (Hue, Saturation, Lightness).
-    
-    Args:
-        r, g, b (int): RGB values (0-255)
-    
-    Returns:
-        tuple: (hue, saturation, lightness) where:
-            - hue: 0-360 degrees
-            - saturation: 0-100 percent
-            - lightness: 0-100 percent
-    """
-    # Normalize RGB values to 0-1 range
-    r_norm = r / 255.0
-    g_norm = g / 255.0
-    b_norm = b / 255.0
-    
-    # Find max and min values
-    max_val = max(r_norm, g_norm, b_norm)
-    min_val = min(r_norm, g_norm, b_norm)
-    
-    # Calculate lightness
-    lightness = (max_val + min_val) / 2.0
-    
-    # Calculate saturation and hue
-    if max_val == min_val:
-        # Achromatic (gray)
-        saturation = 0.0
-        hue = 0.0
-    else:
-        # Calculate saturation
-        if lightness < 0.5:
-            saturation = (max_val - min_val) / (max_val + min_val)
-        else:
-            saturation = (max_val - min_val) / (2.0 - max_val - min_val)
-        
-        # Calculate hue
-        delta = max_val - min_val
-        
-        if max_val == r_norm:
-            hue = ((g_norm - b_norm) / delta) % 6
-        elif max_val == g_norm:
-            hue = (b_norm - r_norm) / delta + 2
-        else:  # max_val == b_norm
-            hue = (r_norm - g_norm) / delta + 4
-        
-        hue *= 60  # Convert to degrees
-    
-    # Convert to percentages and ensure proper ranges
-    hue = round(hue, 1)
-    saturation = round(saturation * 100, 1)
-    lightness = round(lightness * 100, 1)
-    
-    return hue, saturation, lightness
+# Similarity assessment buckets: (upper distance limit, assessment, display color).
+# Distance 0 is reported separately as IDENTICAL_ASSESSMENT.
+IDENTICAL_ASSESSMENT = ("Identical colors", "purple")
+SIMILARITY_BUCKETS = (
+    (10, "Nearly identical", "darkgreen"),
+    (25, "Very similar", "green"),
+    (50, "Similar", "olive"),
+    (100, "Somewhat different", "orange"),
+    (150, "Different", "darkorange"),
+    (float('inf'), "Very different", "red"),
+)
+
+# Buckets for the perceptual metrics ('cie76', 'ciede2000'), in delta E units;
+# a delta E around 1 is the smallest difference most viewers notice
+DELTA_E_BUCKETS = (
+    (1, "Nearly identical", "darkgreen"),
+    (3, "Very similar", "green"),
+    (6, "Similar", "olive"),
+    (12, "Somewhat different", "orange"),
+    (25, "Different", "darkorange"),
+    (float('inf'), "Very different", "red"),
+)
+
+# Compiled CSS3 palette, built lazily by get_css3_palette()
+_css3_palette = None
 
+# Memory-mapped 24-bit lookup tables by metric, loaded lazily by get_css3_lookup_table()
+_css3_lookup_tables = {}
 
-def calculate_color_similarity(color1, color2):
+# Memoized pairwise comparisons, shared by the preview and Tk threads
+comparison_cache = ComparisonCache()
+
+
+@timed('engine.calculate_color_similarity')
+def calculate_color_similarity(color1, color2, metric='rgb'):
     """
     Calculate similarity between two RGB colors and return detailed assessment.
     
     Args:
         color1 (tuple): RGB tuple (r, g, b) for first color
         color2 (tuple): RGB tuple (r, g, b) for second color
+        metric (str): Distance metric: 'rgb' (Euclidean RGB distance, "D"),
+            or 'cie76' / 'ciede2000' (perceptual delta E, "dE")
     
     Returns:
         tuple: (assessment_text, display_color, clipboard_text) where:
@@ -122,57 +111,176 @@ def calculate_color_similarity(color1, color2):
     """
     if not color1 or not color2:
         return "No comparison available", "gray", "no comparison"
+    return compare_colors(color1, color2, metric).as_tuple()
+
+
+def compare_colors(color1, color2, metric='rgb'):
+    """
+    Compare two RGB colors and return a structured result.
     
-    r1, g1, b1 = color1
-    r2, g2, b2 = color2
-    
-    # Calculate Euclidean distance in RGB space
-    distance = ((r1 - r2) ** 2 + (g1 - g2) ** 2 + (b1 - b2) ** 2) ** 0.5
+    The assessment and clipboard strings of calculate_color_similarity are
+    rendered from the result's fields on first access, so callers that only
+    need the numbers skip all string work.
     
-    # Get basic color categories for both colors
-    color1_matches = get_simple_color_name(color1)
-    color2_matches = get_simple_color_name(color2)
+    Args:
+        color1 (tuple): RGB tuple (r, g, b) for first color
+        color2 (tuple): RGB tuple (r, g, b) for second color
+        metric (str): 'rgb', 'cie76' or 'ciede2000', as in calculate_color_similarity
     
-    basic_color1 = color1_matches[0][0] if color1_matches else "unknown"
-    basic_color2 = color2_matches[0][0] if color2_matches else "unknown"
+    Returns:
+        ColorComparison: Distance, similarity bucket and HSL analysis
+    """
+    if not color1 or not color2:
+        raise ValueError("two colors are required for a comparison")
+    check_metric(metric)
+    
+    packed = pack_color_pair(color1, color2)
+    if packed is None:
+        return _compare_colors(color1, color2, metric)
+    return comparison_cache.get_or_compute(
+        ("similarity", packed, metric), lambda: _compare_colors(color1, color2, metric))
+
+
+def _compare_colors(color1, color2, metric='rgb'):
+    """Uncached compare_colors"""
+    if metric == 'rgb':
+        r1, g1, b1 = color1
+        r2, g2, b2 = color2
+        
+        # Calculate Euclidean distance in RGB space
+        distance = ((r1 - r2) ** 2 + (g1 - g2) ** 2 + (b1 - b2) ** 2) ** 0.5
+    else:
+        lab1 = rgb_to_lab(*color1)
+        lab2 = rgb_to_lab(*color2)
+        distance = get_delta_e_function(metric)(lab1, lab2)
+    buckets, distance_label = _get_similarity_buckets(metric)
     
     # Provide meaningful similarity assessment
     if distance == 0:
-        assessment = "Identical colors"
-        color = "purple"
-    elif distance < 10:
-        assessment = "Nearly identical"
-        color = "darkgreen"
-    elif distance < 25:
-        assessment = "Very similar"
-        color = "green"
-    elif distance < 50:
-        assessment = "Similar"
-        color = "olive"
-    elif distance < 100:
-        assessment = "Somewhat different"
-        color = "orange"
-    elif distance < 150:
-        assessment = "Different"
-        color = "darkorange"
+        bucket = 0
+        assessment, color = IDENTICAL_ASSESSMENT
     else:
-        assessment = "Very different"
-        color = "red"
+        for bucket, (limit, assessment, color) in enumerate(buckets, 1):
+            if distance < limit:
+                break
     
     # Add sophisticated hue analysis for all color comparisons
-    # Try new HSL analysis first, fallback to original if needed
+    analysis = analyze_HSL_first_neutral_only(color1, color2)
+    if analysis is not None:
+        return ColorComparison(distance, bucket, assessment, color, distance_label, analysis)
+    
+    # Fall back to free-form descriptions, which still need parsing for the clipboard
     try:
-        hue_analysis = get_HSL_hue_analysis_first_neutral_only(color1, color2)
-    except:
+        hue_analysis = get_basic_rgb_analysis(color1, color2)
+    except Exception:
         hue_analysis = get_hue_analysis(color1, color2)
+    return ColorComparison(distance, bucket, assessment, color, distance_label,
+                           fallback_text=hue_analysis, clipboard_text=create_clipboard_text(hue_analysis))
+
+
+def _get_similarity_buckets(metric):
+    """Bucket table and distance label ("D" or "dE") for a metric"""
+    if metric == 'rgb':
+        return SIMILARITY_BUCKETS, "D"
+    return DELTA_E_BUCKETS, "dE"
+
+
+def calculate_color_similarity_batch(colors1, colors2, include_text=False, metric='rgb'):
+    """
+    Vectorized calculate_color_similarity over arrays of color pairs.
     
-    # Create clipboard text from hue analysis
-    clipboard_text = create_clipboard_text(hue_analysis)
+    Args:
+        colors1 (array-like): RGB colors of shape (N, 3) for the first colors
+        colors2 (array-like): RGB colors of shape (N, 3) for the second colors
+        include_text (bool): Also build the assessment and clipboard strings,
+            exactly as calculate_color_similarity would
+        metric (str): 'rgb', 'cie76' or 'ciede2000', as in calculate_color_similarity
     
-    if hue_analysis:
-        assessment += f" ({hue_analysis})"
+    Returns:
+        dict: Arrays of length N:
+            - distance: Euclidean RGB distance, or delta E for perceptual metrics
+            - bucket: 0 for identical colors, otherwise 1 + index into
+              SIMILARITY_BUCKETS (DELTA_E_BUCKETS for perceptual metrics)
+            - assessment: Assessment label ("Nearly identical", ...)
+            - display_color: Color name for UI display
+            - hue_diff: Signed hue change in degrees, normalized to [-180, 180]
+            - saturation_diff: Saturation change in percent
+            - lightness_diff: Lightness change in percent
+            - assessment_text, clipboard_text: Lists of strings, only with include_text
+    """
+    colors1 = np.asarray(colors1, dtype=np.int64).reshape(-1, 3)
+    colors2 = np.asarray(colors2, dtype=np.int64).reshape(-1, 3)
+    if colors1.shape != colors2.shape:
+        raise ValueError("colors1 and colors2 must have the same shape")
+    check_metric(metric)
+    buckets, distance_label = _get_similarity_buckets(metric)
+    
+    if metric == 'rgb':
+        diff = colors1 - colors2
+        distance_sq = np.einsum('ij,ij->i', diff, diff)
+        distance = np.sqrt(distance_sq)
+        
+        # Squared distances are exact, so compare them against squared limits
+        limits_sq = np.array([limit ** 2 for limit, _, _ in buckets[:-1]])
+        bucket = np.where(distance_sq == 0, 0, 1 + np.searchsorted(limits_sq, distance_sq, side='right'))
+    else:
+        distance = get_delta_e_function(metric)(rgb_to_lab_array(colors1), rgb_to_lab_array(colors2))
+        limits = np.array([limit for limit, _, _ in buckets[:-1]])
+        bucket = np.where(distance == 0, 0, 1 + np.searchsorted(limits, distance, side='right'))
+    labels = np.array([IDENTICAL_ASSESSMENT[0]] + [label for _, label, _ in buckets], dtype=object)
+    display_colors = np.array([IDENTICAL_ASSESSMENT[1]] + [color for _, _, color in buckets], dtype=object)
+    
+    hsl1 = rgb_to_hsl_array(colors1)
+    hsl2 = rgb_to_hsl_array(colors2)
+    hue_diff = hsl2[:, 0] - hsl1[:, 0]
+    hue_diff = np.where(hue_diff > 180, hue_diff - 360, np.where(hue_diff < -180, hue_diff + 360, hue_diff))
+    
+    result = {
+        'distance': distance,
+        'bucket': bucket.astype(np.int8),
+        'assessment': labels[bucket],
+        'display_color': display_colors[bucket],
+        'hue_diff': hue_diff,
+        'saturation_diff': hsl2[:, 1] - hsl1[:, 1],
+        'lightness_diff': hsl2[:, 2] - hsl1[:, 2],
+    }
     
-    return f"{assessment} (D{distance:.1f})", color, clipboard_text
+    if include_text:
+        result['assessment_text'], result['clipboard_text'] = _render_batch_texts(
+            colors1, colors2, hsl1, hsl2, result, distance_label)
+    
+    return result
+
+
+def _render_batch_texts(colors1, colors2, hsl1, hsl2, result, distance_label):
+    """
+    Assessment and clipboard strings for calculate_color_similarity_batch.
+
+    The hue transitions are classified for all pairs at once, as the image
+    comparison maps do; only the string formatting runs per pair, through
+    the same result types compare_colors renders.
+    """
+    # Imported here: image_comparison builds on this module
+    from .image_comparison import TRANSITION_KINDS, TRANSITION_SHIFT, classify_hue_transitions, get_transition_names
+    
+    kind, source, target, hue_diff = classify_hue_transitions(colors1, colors2, hsl1, hsl2)
+    names = get_transition_names()
+    assessment_texts = []
+    clipboard_texts = []
+    for row in zip(kind.tolist(), source.tolist(), target.tolist(), hue_diff.tolist(),
+                   result['saturation_diff'].tolist(), result['lightness_diff'].tolist(),
+                   result['distance'].tolist(), result['bucket'].tolist(),
+                   result['assessment'], result['display_color']):
+        kind_code, source_id, target_id, delta, saturation_diff, lightness_diff = row[:6]
+        if kind_code == TRANSITION_SHIFT:
+            transition = HueTransition("shift", names[source_id], names[target_id], delta)
+        else:
+            transition = HueTransition(TRANSITION_KINDS[kind_code], delta=delta)
+        comparison = ColorComparison(*row[6:], distance_label,
+                                     HSLAnalysis(transition, saturation_diff, lightness_diff))
+        assessment_texts.append(comparison.assessment_text)
+        clipboard_texts.append(comparison.clipboard_text)
+    return assessment_texts, clipboard_texts
 
 
 def analyze_color_components(color1, color2):
@@ -239,41 +347,55 @@ def get_HSL_hue_analysis_first_neutral_only(color1, color2, hue_threshold=5, sat
     Returns:
         str: Description like "hue: neutral -> orange (+15.9deg), saturation: +2%, lightness: -1%"
     """
+    analysis = analyze_HSL_first_neutral_only(color1, color2, hue_threshold, saturation_threshold, lightness_threshold)
+    if analysis is None:
+        # Fallback to basic RGB analysis
+        return get_basic_rgb_analysis(color1, color2)
+    return analysis.render()
+
+
+def analyze_HSL_first_neutral_only(color1, color2, hue_threshold=5, saturation_threshold=10, lightness_threshold=10,
+                                   subdivisions=12):
+    """
+    Structured form of get_HSL_hue_analysis_first_neutral_only.
+    
+    Args:
+        color1 (tuple): RGB tuple (r, g, b) for first color
+        color2 (tuple): RGB tuple (r, g, b) for second color
+        hue_threshold (float): Threshold in degrees for significant hue change
+        saturation_threshold (float): Threshold in percentage for significant saturation change
+        lightness_threshold (float): Threshold in percentage for significant lightness change
+        subdivisions (int): Hue list used to name the hue transition
+    
+    Returns:
+        HSLAnalysis: Hue transition and saturation/lightness changes, or None
+            if the colors could not be analyzed
+    """
+    packed = pack_color_pair(color1, color2)
+    if packed is None:
+        return _analyze_HSL_first_neutral_only(color1, color2, hue_threshold, saturation_threshold, lightness_threshold,
+                                               subdivisions)
+    key = ("hsl_first_neutral_only", packed, hue_threshold, saturation_threshold, lightness_threshold, subdivisions)
+    return comparison_cache.get_or_compute(
+        key, lambda: _analyze_HSL_first_neutral_only(color1, color2, hue_threshold, saturation_threshold,
+                                                     lightness_threshold, subdivisions))
+
+
+def _analyze_HSL_first_neutral_only(color1, color2, hue_threshold, saturation_threshold, lightness_threshold,
+                                    subdivisions=12):
+    """Uncached analyze_HSL_first_neutral_only"""
     try:
         # Convert both colors to HSL
         h1, s1, l1 = rgb_to_hsl(*color1)
         h2, s2, l2 = rgb_to_hsl(*color2)
         
         # Analyze hue with NEW logic: only first color checked for neutrality + achromatic zone
-        hue_analysis = analyze_hue_direction_first_neutral_only(h1, h2, hue_threshold, saturation1=s1, saturation2=s2, color1_rgb=color1, color2_rgb=color2)
-        
-        # Analyze saturation change
-        saturation_diff = s2 - s1
-        if abs(saturation_diff) < saturation_threshold:
-            saturation_analysis = "same"
-        else:
-            sign = "+" if saturation_diff > 0 else ""
-            saturation_analysis = f"{sign}{saturation_diff:.0f}%"
-        
-        # Analyze lightness change
-        lightness_diff = l2 - l1
-        if abs(lightness_diff) < lightness_threshold:
-            lightness_analysis = "same"
-        else:
-            sign = "+" if lightness_diff > 0 else ""
-            lightness_analysis = f"{sign}{lightness_diff:.0f}%"
-        
-        # Combine analysis
-        components = []
-        components.append(f"hue: {hue_analysis}")
-        components.append(f"saturation: {saturation_analysis}")
-        components.append(f"lightness: {lightness_analysis}")
+        hue_transition = analyze_hue_transition_first_neutral_only(h1, h2, hue_threshold, subdivisions, saturation1=s1, saturation2=s2, color1_rgb=color1, color2_rgb=color2)
         
-        return ", ".join(components)
+        return HSLAnalysis(hue_transition, s2 - s1, l2 - l1, saturation_threshold, lightness_threshold)
         
     except Exception as e:
-        # Fallback to basic RGB analysis
-        return get_basic_rgb_analysis(color1, color2)
+        return None
 
 
 def get_HSL_hue_analysis(color1, color2, hue_threshold=1, saturation_threshold=10, lightness_threshold=10):
@@ -366,6 +488,29 @@ def analyze_hue_direction_first_neutral_only(hue1, hue2, threshold=15, subdivisi
     Returns:
         str: Direction analysis like "neutral -> orange (+15.9deg)" or "same" or "similar grays"
     """
+    return analyze_hue_transition_first_neutral_only(hue1, hue2, threshold, subdivisions, saturation1, saturation2, color1_rgb, color2_rgb).render()
+
+
+def analyze_hue_transition_first_neutral_only(hue1, hue2, threshold=15, subdivisions=12, saturation1=None, saturation2=None, color1_rgb=None, color2_rgb=None):
+    """
+    Structured form of analyze_hue_direction_first_neutral_only.
+    
+    Args:
+        Same as analyze_hue_direction_first_neutral_only
+    
+    Returns:
+        HueTransition: kind "same", "neutral" or "shift" with source/target names
+            and the signed hue difference
+    """
+    # Calculate circular hue difference
+    hue_diff = hue2 - hue1
+    
+    # Normalize to [-180, 180] range for circular distance
+    if hue_diff > 180:
+        hue_diff -= 360
+    elif hue_diff < -180:
+        hue_diff += 360
+    
     # ACHROMATIC ZONE LOGIC: Check if both colors are essentially grays
     if saturation1 is not None and saturation2 is not None and color1_rgb is not None and color2_rgb is not None:
         # If both colors have very low saturation, check for very similar grays only
@@ -376,21 +521,12 @@ def analyze_hue_direction_first_neutral_only(hue1, hue2, threshold=15, subdivisi
             
             # Only handle the most similar achromatic cases
             if rgb_distance < 10:
-                return "same"  # Very similar grays
+                return HueTransition("same", delta=hue_diff)  # Very similar grays
             # For all other cases, fall through to regular hue direction logic
     
     # Handle achromatic colors (grays) - legacy check
     if hue1 == 0 and hue2 == 0:
-        return "neutral"
-    
-    # Calculate circular hue difference
-    hue_diff = hue2 - hue1
-    
-    # Normalize to [-180, 180] range for circular distance
-    if hue_diff > 180:
-        hue_diff -= 360
-    elif hue_diff < -180:
-        hue_diff += 360
+        return HueTransition("neutral", delta=hue_diff)
     
     # NEW LOGIC: Only first color checked for neutrality
     if saturation1 is not None:
@@ -407,7 +543,7 @@ def analyze_hue_direction_first_neutral_only(hue1, hue2, threshold=15, subdivisi
     
     # Check if difference is significant
     if abs(hue_diff) < threshold:
-        return "same"
+        return HueTransition("same", delta=hue_diff)
     
     # If both colors are in the same simple color category, show directional movement
     if display1 == display2:
@@ -417,14 +553,14 @@ def analyze_hue_direction_first_neutral_only(hue1, hue2, threshold=15, subdivisi
         
         if next_simple != display1:
             # Show movement toward the next color category using consistent " -> " notation
-            return f"{display1} -> {next_simple} ({hue_diff:+.1f}deg)"
+            return HueTransition("shift", display1, next_simple, hue_diff)
         else:
             # This case should never occur with proper mapping
             # If it does, treat as negligible difference
-            return "same"
+            return HueTransition("same", delta=hue_diff)
     
     # Show transition from first to second (different categories)
-    return f"{display1} -> {display2} ({hue_diff:+.1f}deg)"
+    return HueTransition("shift", display1, display2, hue_diff)
 
 
 def analyze_hue_direction(hue1, hue2, threshold=15, subdivisions=12, saturation1=None, saturation2=None):
@@ -527,38 +663,10 @@ def get_hue_name_from_degrees(hue_degrees, subdivisions=12):
         subdivisions (int): Which hue list to use
     
     Returns:
-        str: Hue name
+        str: Hue name (an array of names if hue_degrees is a NumPy array)
     """
-    if subdivisions not in hues:
-        subdivisions = 12  # Default fallback
-    
-    hue_names = hues[subdivisions][0]
-    hue_values = hues[subdivisions][1]
-    
-    # Normalize hue to 0-360 range
-    normalized_hue = hue_degrees % 360
-    
-    # Find closest hue using circular distance
-    min_distance = 360
-    closest_index = 0
-    
-    for i, hue_value in enumerate(hue_values):
-        # Calculate circular distance
-        distance = abs(normalized_hue - hue_value)
-        if distance > 180:
-            distance = 360 - distance
-        
-        if distance < min_distance:
-            min_distance = distance
-            closest_index = i
-    
-    hue_name = hue_names[closest_index]
-    
-    # Remove apostrophe from Red' if present
-    if hue_name.endswith("'"):
-        hue_name = hue_name[:-1]
-    
-    return hue_name
+    return get_hue_wheel(subdivisions).name_of(hue_degrees)
+
 
 
 def hue_to_simple_color(hue_name):
@@ -634,42 +742,8 @@ def get_next_simple_color_in_direction(hue_degrees, clockwise=True, subdivisions
     Returns:
         str: Next simple color category in the specified direction
     """
-    if subdivisions not in hues:
-        subdivisions = 12
-    
-    hue_names = hues[subdivisions][0]
-    hue_values = hues[subdivisions][1]
-    
-    # Find current position
-    current_index = 0
-    min_distance = 360
-    
-    for i, hue_value in enumerate(hue_values):
-        distance = abs(hue_degrees - hue_value)
-        if distance > 180:
-            distance = 360 - distance
-        if distance < min_distance:
-            min_distance = distance
-            current_index = i
-    
-    # Get current simple color
-    current_hue_name = hue_names[current_index]
-    current_simple = hue_to_simple_color(current_hue_name)
-    
-    # Move in the specified direction to find the next different simple color
-    step = 1 if clockwise else -1
-    
-    for offset in range(1, len(hue_names)):
-        next_index = (current_index + (step * offset)) % len(hue_names)
-        next_hue_name = hue_names[next_index]
-        next_simple = hue_to_simple_color(next_hue_name)
-        
-        # Return the first different simple color we encounter
-        if next_simple != current_simple:
-            return next_simple
-    
-    # If we've gone full circle without finding a different simple color
-    return current_simple
+    return get_hue_wheel(subdivisions).next_simple_name(hue_degrees, clockwise)
+
 
 
 def get_adjacent_hue_name(hue_degrees, clockwise=True, subdivisions=12):
@@ -684,37 +758,8 @@ def get_adjacent_hue_name(hue_degrees, clockwise=True, subdivisions=12):
     Returns:
         str: Adjacent hue name or None
     """
-    if subdivisions not in hues:
-        subdivisions = 12
-    
-    hue_names = hues[subdivisions][0]
-    hue_values = hues[subdivisions][1]
-    
-    # Find current position
-    current_index = 0
-    min_distance = 360
-    
-    for i, hue_value in enumerate(hue_values):
-        distance = abs(hue_degrees - hue_value)
-        if distance > 180:
-            distance = 360 - distance
-        if distance < min_distance:
-            min_distance = distance
-            current_index = i
-    
-    # Get adjacent index
-    if clockwise:
-        adjacent_index = (current_index + 1) % len(hue_names)
-    else:
-        adjacent_index = (current_index - 1) % len(hue_names)
-    
-    adjacent_name = hue_names[adjacent_index]
-    
-    # Remove apostrophe if present
-    if adjacent_name.endswith("'"):
-        adjacent_name = adjacent_name[:-1]
-    
-    return adjacent_name
+    return get_hue_wheel(subdivisions).adjacent_name(hue_degrees, clockwise)
+
 
 
 def get_basic_rgb_analysis(color1, color2):
@@ -764,68 +809,255 @@ def get_basic_rgb_analysis(color1, color2):
     return ""
 
 
-def get_simple_color_name(rgb):
+def get_comparison_cache_stats():
+    """
+    Get hit, miss and eviction counters of the comparison cache.
+    
+    Returns:
+        dict: hits, misses, evictions, size and maxsize
+    """
+    return comparison_cache.stats()
+
+
+def set_comparison_cache_size(maxsize):
+    """
+    Set the maximum number of memoized comparisons (0 disables caching).
+    
+    Args:
+        maxsize (int): Maximum number of entries
+    """
+    comparison_cache.resize(maxsize)
+
+
+def clear_comparison_cache():
+    """Drop all memoized comparisons and reset the counters"""
+    comparison_cache.clear()
+
+
+@timed('engine.get_simple_color_name')
+def get_simple_color_name(rgb, metric='rgb', palette=None):
     """
     Convert RGB to simple color name using scientific CSS3 color matching.
     
     Args:
         rgb (tuple): RGB tuple (r, g, b)
+        metric (str): 'rgb', 'cie76' or 'ciede2000', as in get_top_color_matches
+        palette: Palette name or PaletteIndex, defaults to the active palette
+            (CSS3 unless another was selected, see utils.palette_registry)
     
     Returns:
         list: List of (simple_name, css_name, distance) tuples for top matches
     """
     try:
         # Find the closest CSS3 colors and return top 3
-        return get_top_color_matches(rgb)
+        return get_top_color_matches(rgb, metric=metric, palette=palette)
     except Exception:
         # Fallback to basic detection
         return [("unknown", "unknown", 999)]
 
 
-def get_top_color_matches(rgb, top_n=3):
+def get_top_color_matches(rgb, top_n=3, metric='rgb', palette=None):
     """
     Get top N closest color matches using CSS3 colors (deduplicated by RGB values).
     
     Args:
         rgb (tuple): RGB tuple (r, g, b) to match
         top_n (int): Number of top matches to return
+        metric (str): 'rgb' for Euclidean RGB distance, or 'cie76' / 'ciede2000'
+            for perceptual delta E against the palette's precomputed Lab values
+        palette: Palette name or PaletteIndex, defaults to the active palette
     
     Returns:
         list: List of (simple_name, css_name, distance) tuples
     """
-    target_r, target_g, target_b = rgb
-    distances = []
-    seen_rgb = set()  # Track RGB values we've already seen
+    return get_palette(palette).top_matches(rgb, top_n, metric)
+
+
+def get_color_names_batch(pixels, top_n=1, chunk_size=1 << 16, metric='rgb', palette=None):
+    """
+    Find the closest CSS3 colors for every pixel of an array or image.
     
-    # Get all CSS3 color names
-    css3_names = webcolors.names('css3')
+    Args:
+        pixels: uint8 array of shape (..., 3), e.g. (N, 3) or (height, width, 3),
+            or a PIL image
+        top_n (int): Number of top matches per pixel
+        chunk_size (int): Number of pixels processed at once, bounds memory use
+        metric (str): 'rgb', 'cie76' or 'ciede2000', as in get_top_color_matches
+        palette: Palette name or PaletteIndex, defaults to the active palette
     
-    for name in css3_names:
-        try:
-            css_rgb = webcolors.name_to_rgb(name, spec='css3')
-            css_r, css_g, css_b = css_rgb
-            
-            # Skip if we've already seen this exact RGB value
-            rgb_tuple = (css_r, css_g, css_b)
-            if rgb_tuple in seen_rgb:
+    Returns:
+        tuple: (css_indices, simple_indices, distances) arrays of shape (..., top_n) where:
+            - css_indices: indices into the palette's names (get_palette(palette).names)
+            - simple_indices: indices into the palette's simple_vocabulary
+            - distances: Distances in the chosen metric, closest first
+    """
+    if hasattr(pixels, 'getbands'):
+        # PIL image: name every pixel, keeping the (height, width) layout
+        pixels = np.asarray(pixels.convert('RGB'))
+    
+    palette = get_palette(palette)
+    css_indices, distances = palette.batch_top_matches(pixels, top_n, chunk_size, metric)
+    return css_indices, palette.simple_ids[css_indices], distances
+
+
+def lookup_color_names(pixels, build=True, metric='rgb'):
+    """
+    Find the closest CSS3 color for every pixel via the precomputed 24-bit table.
+    
+    Gives the same answer as get_top_color_matches(rgb, top_n=1, metric=metric)
+    but costs a single array index per pixel. The table is memory-mapped from
+    the cache and built on first use (see utils.color_lut).
+    
+    Args:
+        pixels: uint8 array of shape (..., 3) or a PIL image
+        build (bool): Build the table if it is not cached yet
+        metric (str): 'rgb', 'cie76' or 'ciede2000'
+    
+    Returns:
+        tuple: (css_indices, simple_indices) arrays of shape (...), indexing
+            get_css3_palette().names and get_css3_palette().simple_vocabulary
+    """
+    if hasattr(pixels, 'getbands'):
+        pixels = np.asarray(pixels.convert('RGB'))
+    
+    lookup_table = get_css3_lookup_table(build, metric)
+    if lookup_table is None:
+        raise FileNotFoundError(f"CSS3 lookup table for metric {metric!r} has not been built")
+    return lookup_table.lookup(pixels)
+
+
+def get_css3_lookup_table(build=True, metric='rgb'):
+    """
+    Get the memory-mapped CSS3 nearest-color table, loading it on first use.
+    
+    Args:
+        build (bool): Build the table if it is not cached yet
+        metric (str): 'rgb', 'cie76' or 'ciede2000'
+    
+    Returns:
+        ColorLookupTable: Mapped table, or None if missing and build is False
+    """
+    lookup_table = _css3_lookup_tables.get(metric)
+    if lookup_table is None:
+        from .color_lut import load_lookup_table
+        lookup_table = load_lookup_table(get_css3_palette(), build=build, metric=metric)
+        if lookup_table is not None:
+            _css3_lookup_tables[metric] = lookup_table
+    return lookup_table
+
+
+def get_css3_palette():
+    """
+    Get the compiled CSS3 palette index, building it on first use.
+    
+    Returns:
+        PaletteIndex: Deduplicated CSS3 colors with their simple names
+    """
+    global _css3_palette
+    if _css3_palette is None:
+        import webcolors
+        names = []
+        rgb_values = []
+        for name in webcolors.names('css3'):
+            try:
+                rgb_values.append(tuple(webcolors.name_to_rgb(name, spec='css3')))
+            except ValueError:
                 continue
-            seen_rgb.add(rgb_tuple)
-            
-            # Calculate Euclidean distance
-            distance = ((target_r - css_r) ** 2 + 
-                       (target_g - css_g) ** 2 + 
-                       (target_b - css_b) ** 2) ** 0.5
-            
-            # Map to simple color name
-            simple_name = map_css_to_simple(name)
-            distances.append((distance, simple_name, name, css_rgb))
-            
-        except ValueError:
-            continue
+            names.append(name)
+        check_css_to_simple(names)
+        simple_names = [CSS_TO_SIMPLE[name] for name in names]
+        _css3_palette = PaletteIndex(names, rgb_values, simple_names)
+    return _css3_palette
+
+
+# Comprehensive mapping from CSS3 color names to simple color names (read-only).
+# Every CSS3 name must be listed; check_css_to_simple() verifies this.
+CSS_TO_SIMPLE = MappingProxyType({
+    # Reds
+    'red': 'red', 'darkred': 'red', 'crimson': 'red', 'firebrick': 'red',
+    'indianred': 'red', 'lightcoral': 'red', 'salmon': 'red', 'darksalmon': 'red',
+    'lightsalmon': 'red', 'tomato': 'red', 'orangered': 'red',
+    
+    # Oranges
+    'orange': 'orange', 'darkorange': 'orange', 'coral': 'orange', 
+    'chocolate': 'orange', 'sandybrown': 'orange', 'peru': 'orange',
+    'sienna': 'orange', 'saddlebrown': 'orange',
+    
+    # Yellows
+    'yellow': 'yellow', 'gold': 'yellow', 'khaki': 'yellow', 'darkkhaki': 'yellow',
+    'palegoldenrod': 'yellow', 'goldenrod': 'yellow', 'darkgoldenrod': 'yellow',
+    'lightyellow': 'yellow', 'lemonchiffon': 'yellow', 'lightgoldenrodyellow': 'yellow',
+    'papayawhip': 'yellow', 'moccasin': 'yellow', 'peachpuff': 'yellow',
+    'wheat': 'yellow', 'navajowhite': 'yellow',
+    
+    # Yellow-Greens (the key ones!)
+    'burlywood': 'yellow-green', 'tan': 'yellow-green', 'greenyellow': 'yellow-green', 
+    'yellowgreen': 'yellow-green', 'olivedrab': 'yellow-green',
+    'darkolivegreen': 'yellow-green', 'olive': 'yellow-green',
+    
+    # Greens
+    'green': 'green', 'darkgreen': 'green', 'forestgreen': 'green', 'limegreen': 'green',
+    'lime': 'green', 'seagreen': 'green', 'mediumseagreen': 'green', 'springgreen': 'green',
+    'mediumspringgreen': 'green', 'darkseagreen': 'green', 'lightgreen': 'green',
+    'palegreen': 'green', 'lawngreen': 'green', 'chartreuse': 'green',
+    
+    # Blues
+    'blue': 'blue', 'darkblue': 'blue', 'mediumblue': 'blue', 'navy': 'blue',
+    'midnightblue': 'blue', 'royalblue': 'blue', 'steelblue': 'blue',
+    'dodgerblue': 'blue', 'deepskyblue': 'blue', 'cornflowerblue': 'blue',
+    'skyblue': 'blue', 'lightskyblue': 'blue', 'lightsteelblue': 'blue',
+    'lightblue': 'blue', 'powderblue': 'blue', 'cadetblue': 'blue',
+    'aqua': 'blue', 'cyan': 'blue', 'lightcyan': 'blue', 'paleturquoise': 'blue',
+    'aquamarine': 'blue-green', 'turquoise': 'blue-green', 'mediumturquoise': 'blue-green',
+    'darkturquoise': 'blue-green', 'lightseagreen': 'blue-green', 'teal': 'blue-green',
+    'darkcyan': 'blue-green',
+    
+    # Purples and Magentas
+    'purple': 'purple', 'indigo': 'purple', 'darkviolet': 'purple', 'darkorchid': 'purple',
+    'darkmagenta': 'magenta', 'violet': 'purple', 'plum': 'purple', 'thistle': 'purple',
+    'orchid': 'purple', 'mediumorchid': 'purple', 'mediumpurple': 'purple',
+    'blueviolet': 'purple', 'slateblue': 'purple', 'darkslateblue': 'purple',
+    'mediumslateblue': 'purple', 'magenta': 'magenta', 'fuchsia': 'magenta',
+    'deeppink': 'magenta', 'hotpink': 'pink', 'lightpink': 'pink', 'pink': 'pink',
+    'mistyrose': 'pink', 'lavenderblush': 'pink',
+    
+    # Browns
+    'brown': 'brown', 'maroon': 'brown', 'rosybrown': 'brown',
+    
+    # Grays and Whites
+    'white': 'white', 'snow': 'white', 'honeydew': 'white', 'mintcream': 'white',
+    'azure': 'white', 'aliceblue': 'white', 'ghostwhite': 'white', 'whitesmoke': 'white',
+    'seashell': 'white', 'beige': 'white', 'oldlace': 'white', 'floralwhite': 'white',
+    'ivory': 'white', 'antiquewhite': 'white', 'linen': 'white', 'lavender': 'white',
+    'black': 'black', 'dimgray': 'gray', 'dimgrey': 'gray', 'gray': 'gray', 'grey': 'gray',
+    'darkgray': 'gray', 'darkgrey': 'gray', 'silver': 'gray', 'lightgray': 'gray',
+    'lightgrey': 'gray', 'gainsboro': 'gray', 'slategray': 'gray', 'slategrey': 'gray',
+    'lightslategray': 'gray', 'lightslategrey': 'gray', 'darkslategray': 'gray',
+    'darkslategrey': 'gray',
+    
+    # Unsorted names that are their own simple name
+    'bisque': 'bisque', 'blanchedalmond': 'blanchedalmond', 'cornsilk': 'cornsilk',
+    'mediumaquamarine': 'mediumaquamarine', 'mediumvioletred': 'mediumvioletred',
+    'palevioletred': 'palevioletred',
+})
+
+
+def check_css_to_simple(css_names=None):
+    """
+    Check that every CSS3 color name has a simple-name mapping.
     
-    # Sort by distance and return top matches
-    distances.sort()
-    return [(simple_name, css_name, distance) for distance, simple_name, css_name, css_rgb in distances[:top_n]]
+    Args:
+        css_names (iterable): Names to check, defaults to all CSS3 names
+    
+    Raises:
+        ValueError: If any name is missing from CSS_TO_SIMPLE
+    """
+    if css_names is None:
+        import webcolors
+        css_names = webcolors.names('css3')
+    missing = sorted(name for name in css_names if name.lower() not in CSS_TO_SIMPLE)
+    if missing:
+        raise ValueError(f"CSS3 colors without a simple name mapping: {', '.join(missing)}")
 
 
 def map_css_to_simple(css_name):
@@ -836,73 +1068,7 @@ def map_css_to_simple(css_name):
         css_name (str): CSS3 color name
     
     Returns:
-        str: Simple color category name
+        str: Simple color category name (the name itself if it is not a CSS3 color)
     """
     css_name = css_name.lower()
-    
-    # Comprehensive mapping from CSS colors to simple names
-    color_mapping = {
-        # Reds
-        'red': 'red', 'darkred': 'red', 'crimson': 'red', 'firebrick': 'red',
-        'indianred': 'red', 'lightcoral': 'red', 'salmon': 'red', 'darksalmon': 'red',
-        'lightsalmon': 'red', 'tomato': 'red', 'orangered': 'red',
-        
-        # Oranges
-        'orange': 'orange', 'darkorange': 'orange', 'coral': 'orange', 
-        'chocolate': 'orange', 'sandybrown': 'orange', 'peru': 'orange',
-        'sienna': 'orange', 'saddlebrown': 'orange',
-        
-        # Yellows
-        'yellow': 'yellow', 'gold': 'yellow', 'khaki': 'yellow', 'darkkhaki': 'yellow',
-        'palegoldenrod': 'yellow', 'goldenrod': 'yellow', 'darkgoldenrod': 'yellow',
-        'lightyellow': 'yellow', 'lemonchiffon': 'yellow', 'lightgoldenrodyellow': 'yellow',
-        'papayawhip': 'yellow', 'moccasin': 'yellow', 'peachpuff': 'yellow',
-        'wheat': 'yellow', 'navajowhite': 'yellow',
-        
-        # Yellow-Greens (the key ones!)
-        'burlywood': 'yellow-green', 'tan': 'yellow-green', 'greenyellow': 'yellow-green', 
-        'yellowgreen': 'yellow-green', 'olivedrab': 'yellow-green',
-        'darkolivegreen': 'yellow-green', 'olive': 'yellow-green',
-        
-        # Greens
-        'green': 'green', 'darkgreen': 'green', 'forestgreen': 'green', 'limegreen': 'green',
-        'lime': 'green', 'seagreen': 'green', 'mediumseagreen': 'green', 'springgreen': 'green',
-        'mediumspringgreen': 'green', 'darkseagreen': 'green', 'lightgreen': 'green',
-        'palegreen': 'green', 'lawngreen': 'green', 'chartreuse': 'green',
-        
-        # Blues
-        'blue': 'blue', 'darkblue': 'blue', 'mediumblue': 'blue', 'navy': 'blue',
-        'midnightblue': 'blue', 'royalblue': 'blue', 'steelblue': 'blue',
-        'dodgerblue': 'blue', 'deepskyblue': 'blue', 'cornflowerblue': 'blue',
-        'skyblue': 'blue', 'lightskyblue': 'blue', 'lightsteelblue': 'blue',
-        'lightblue': 'blue', 'powderblue': 'blue', 'cadetblue': 'blue',
-        'aqua': 'blue', 'cyan': 'blue', 'lightcyan': 'blue', 'paleturquoise': 'blue',
-        'aquamarine': 'blue-green', 'turquoise': 'blue-green', 'mediumturquoise': 'blue-green',
-        'darkturquoise': 'blue-green', 'lightseagreen': 'blue-green', 'teal': 'blue-green',
-        'darkcyan': 'blue-green',
-        
-        # Purples and Magentas
-        'purple': 'purple', 'indigo': 'purple', 'darkviolet': 'purple', 'darkorchid': 'purple',
-        'darkmagenta': 'magenta', 'violet': 'purple', 'plum': 'purple', 'thistle': 'purple',
-        'orchid': 'purple', 'mediumorchid': 'purple', 'mediumpurple': 'purple',
-        'blueviolet': 'purple', 'slateblue': 'purple', 'darkslateblue': 'purple',
-        'mediumslateblue': 'purple', 'magenta': 'magenta', 'fuchsia': 'magenta',
-        'deeppink': 'magenta', 'hotpink': 'pink', 'lightpink': 'pink', 'pink': 'pink',
-        'mistyrose': 'pink', 'lavenderblush': 'pink',
-        
-        # Browns
-        'brown': 'brown', 'maroon': 'brown', 'rosybrown': 'brown',
-        
-        # Grays and Whites
-        'white': 'white', 'snow': 'white', 'honeydew': 'white', 'mintcream': 'white',
-        'azure': 'white', 'aliceblue': 'white', 'ghostwhite': 'white', 'whitesmoke': 'white',
-        'seashell': 'white', 'beige': 'white', 'oldlace': 'white', 'floralwhite': 'white',
-        'ivory': 'white', 'antiquewhite': 'white', 'linen': 'white', 'lavender': 'white',
-        'black': 'black', 'dimgray': 'gray', 'dimgrey': 'gray', 'gray': 'gray', 'grey': 'gray',
-        'darkgray': 'gray', 'darkgrey': 'gray', 'silver': 'gray', 'lightgray': 'gray',
-        'lightgrey': 'gray', 'gainsboro': 'gray', 'slategray': 'gray', 'slategrey': 'gray',
-        'lightslategray': 'gray', 'lightslategrey': 'gray', 'darkslategray': 'gray',
-        'darkslategrey': 'gray',
-    }
-    
-    return color_mapping.get(css_name, css_name)
\ No newline at end of file
+    return CSS_TO_SIMPLE.get(css_name, css_name)
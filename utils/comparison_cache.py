@@ -0,0 +1,122 @@
+"""
+Bounded, thread-safe memoization for pairwise color comparisons.
+
+Results are keyed on the two colors packed into one 48-bit integer plus
+any parameters that affect the result. The cache is shared by the preview
+thread and the Tk thread, so every operation takes a lock.
+"""
+
+import threading
+from collections import OrderedDict
+
+
+DEFAULT_MAXSIZE = 4096
+
+
+def pack_color_pair(color1, color2):
+    """
+    Pack two RGB colors into a single 48-bit integer.
+
+    Args:
+        color1 (tuple): RGB tuple (r, g, b) for first color
+        color2 (tuple): RGB tuple (r, g, b) for second color
+
+    Returns:
+        int: Packed pair, or None if either color is not three 0-255 integers
+    """
+    try:
+        r1, g1, b1 = color1
+        r2, g2, b2 = color2
+    except (TypeError, ValueError):
+        return None
+
+    packed = 0
+    for component in (r1, g1, b1, r2, g2, b2):
+        value = int(component)
+        if value != component or not 0 <= value <= 255:
+            return None
+        packed = (packed << 8) | value
+    return packed
+
+
+class ComparisonCache:
+    """
+    LRU cache with hit, miss and eviction counters.
+
+    A maxsize of 0 disables caching; lookups then always miss.
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, key, compute):
+        """
+        Return the cached value for key, computing and storing it on a miss.
+
+        The computation runs outside the lock, so two threads missing on the
+        same key may both compute it; the results are identical.
+
+        Args:
+            key: Hashable cache key
+            compute (callable): Function with no arguments producing the value
+
+        Returns:
+            The cached or freshly computed value
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        value = compute()
+
+        with self._lock:
+            if self._maxsize > 0:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                self._evict()
+        return value
+
+    def _evict(self):
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def resize(self, maxsize):
+        """Change the maximum number of entries, evicting the oldest if needed"""
+        if maxsize < 0:
+            raise ValueError("maxsize must be zero or positive")
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict()
+
+    def clear(self):
+        """Drop all entries and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        """
+        Get a snapshot of the cache counters.
+
+        Returns:
+            dict: hits, misses, evictions, size and maxsize
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "maxsize": self._maxsize,
+            }
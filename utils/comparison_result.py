@@ -0,0 +1,146 @@
+"""
+Structured results of color comparisons.
+
+The comparison engine fills these from numbers it has already computed;
+the assessment and clipboard strings are rendered from the fields only
+when first asked for, so callers that just need the values never pay for
+string formatting.
+"""
+
+from typing import NamedTuple
+
+
+class HueTransition(NamedTuple):
+    """
+    Hue change from a first (reference) color to a second color.
+
+    kind is "same" (no significant change), "neutral" (both colors have no
+    hue) or "shift" (source -> target). delta is the signed hue change in
+    degrees, normalized to [-180, 180].
+    """
+    kind: str
+    source: str = None
+    target: str = None
+    delta: float = 0.0
+
+    def render(self):
+        """Text like "neutral -> orange (+15.9deg)", "same" or "neutral" """
+        if self.kind == "shift":
+            return f"{self.source} -> {self.target} ({self.delta:+.1f}deg)"
+        return self.kind
+
+    def clipboard_text(self):
+        """Text like "tinted background: neutral (photos) -> orange (video)", empty for "same" """
+        if self.kind == "shift":
+            return f"tinted background: {self.source} (photos) -> {self.target} (video)"
+        if self.kind == "same":
+            return ""
+        return f"tinted background: {self.kind}"
+
+
+class HSLAnalysis(NamedTuple):
+    """Hue transition plus saturation and lightness changes in percent"""
+    hue: HueTransition
+    saturation_diff: float
+    lightness_diff: float
+    saturation_threshold: float = 10
+    lightness_threshold: float = 10
+
+    def render(self):
+        """Text like "hue: neutral -> orange (+15.9deg), saturation: +2%, lightness: same" """
+        saturation = _render_change(self.saturation_diff, self.saturation_threshold)
+        lightness = _render_change(self.lightness_diff, self.lightness_threshold)
+        return f"hue: {self.hue.render()}, saturation: {saturation}, lightness: {lightness}"
+
+
+def _render_change(diff, threshold):
+    """Percent change with sign, or "same" below the threshold"""
+    if abs(diff) < threshold:
+        return "same"
+    sign = "+" if diff > 0 else ""
+    return f"{sign}{diff:.0f}%"
+
+
+class ColorComparison:
+    """
+    Result of comparing two colors.
+
+    Attributes:
+        distance (float): Distance in the metric used (RGB or delta E)
+        bucket (int): 0 for identical colors, otherwise 1 + index into the
+            metric's similarity buckets
+        assessment (str): Similarity label, e.g. "Very similar"
+        display_color (str): Color name for UI display
+        distance_label (str): "D" for RGB distance, "dE" for delta E
+        analysis (HSLAnalysis): Structured hue/saturation/lightness changes,
+            or None when only a fallback description was available
+
+    Without an analysis, fallback_text and clipboard_text give the
+    free-form description and its clipboard text instead.
+    """
+
+    __slots__ = ('distance', 'bucket', 'assessment', 'display_color', 'distance_label',
+                 'analysis', '_fallback_text', '_assessment_text', '_clipboard_text')
+
+    def __init__(self, distance, bucket, assessment, display_color, distance_label="D",
+                 analysis=None, fallback_text="", clipboard_text=None):
+        self.distance = distance
+        self.bucket = bucket
+        self.assessment = assessment
+        self.display_color = display_color
+        self.distance_label = distance_label
+        self.analysis = analysis
+        self._fallback_text = fallback_text
+        self._assessment_text = None
+        self._clipboard_text = clipboard_text
+
+    @property
+    def hue_transition(self):
+        """HueTransition, or None without a structured analysis"""
+        return self.analysis.hue if self.analysis is not None else None
+
+    @property
+    def hue_delta(self):
+        """Signed hue change in degrees, or None without a structured analysis"""
+        return self.analysis.hue.delta if self.analysis is not None else None
+
+    @property
+    def saturation_diff(self):
+        return self.analysis.saturation_diff if self.analysis is not None else None
+
+    @property
+    def lightness_diff(self):
+        return self.analysis.lightness_diff if self.analysis is not None else None
+
+    @property
+    def hue_analysis_text(self):
+        """Hue/saturation/lightness description used in the assessment text"""
+        if self.analysis is not None:
+            return self.analysis.render()
+        return self._fallback_text
+
+    @property
+    def assessment_text(self):
+        """Text like "Very similar (hue: same, ...) (D12.3)", rendered on first use"""
+        if self._assessment_text is None:
+            text = self.assessment
+            hue_analysis = self.hue_analysis_text
+            if hue_analysis:
+                text += f" ({hue_analysis})"
+            self._assessment_text = f"{text} ({self.distance_label}{self.distance:.1f})"
+        return self._assessment_text
+
+    @property
+    def clipboard_text(self):
+        """Clipboard text like "tinted background: ...", rendered on first use"""
+        if self._clipboard_text is None:
+            self._clipboard_text = self.analysis.hue.clipboard_text() if self.analysis is not None else ""
+        return self._clipboard_text
+
+    def as_tuple(self):
+        """(assessment_text, display_color, clipboard_text), as calculate_color_similarity returns"""
+        return self.assessment_text, self.display_color, self.clipboard_text
+
+    def __repr__(self):
+        return (f"ColorComparison(distance={self.distance!r}, assessment={self.assessment!r}, "
+                f"hue_transition={self.hue_transition!r})")
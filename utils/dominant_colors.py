@@ -0,0 +1,161 @@
+"""
+Dominant-color extraction for screen regions and images.
+
+Answers "what are the main colors in this area", e.g. for background-tint
+checks. A fixed-size random subsample of the pixels is quantized with
+median cut, the box means are refined with a few k-means iterations, and
+each resulting color is named through the engine's compiled palette
+index. The subsample keeps the cost independent of the region size, so a
+full 1920x1080 region is analyzed in interactive time.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from .comparisonEngine import get_top_color_matches
+from .instrumentation import timed
+
+
+DEFAULT_COLOR_COUNT = 5
+DEFAULT_SAMPLE_SIZE = 1 << 16
+DEFAULT_KMEANS_ITERATIONS = 4
+# Colors closer than this (RGB distance) are reported as one
+DEFAULT_MERGE_DISTANCE = 12
+
+
+class DominantColor(NamedTuple):
+    """A main color of a region with its share of the pixels and its name"""
+    rgb: tuple
+    share: float
+    simple_name: str
+    name: str
+    distance: float
+
+
+@timed('dominant_colors.extract')
+def extract_dominant_colors(image, k=DEFAULT_COLOR_COUNT, sample_size=DEFAULT_SAMPLE_SIZE,
+                            iterations=DEFAULT_KMEANS_ITERATIONS, merge_distance=DEFAULT_MERGE_DISTANCE,
+                            seed=0, metric='rgb', palette=None):
+    """
+    Find the main colors of an image.
+
+    Args:
+        image: PIL image or array of shape (..., 3) with RGB values
+        k (int): Maximum number of colors returned; fewer when the image
+            has fewer distinct colors
+        sample_size (int): Pixels sampled for quantizing, or 0 for all pixels
+        iterations (int): k-means refinement steps after median cut
+        merge_distance (float): Colors closer than this RGB distance to a
+            larger one are merged into it, so noise does not split a flat area
+        seed (int): Random seed of the subsample, for repeatable results
+        metric (str): Naming metric, 'rgb', 'cie76' or 'ciede2000'
+        palette: Palette name or PaletteIndex for naming, defaults to the active palette
+
+    Returns:
+        list: DominantColor tuples, largest share first; shares sum to 1
+    """
+    if k < 1:
+        raise ValueError("k must be at least 1")
+    if hasattr(image, 'getbands'):
+        image = np.asarray(image.convert('RGB'))
+    pixels = np.asarray(image).reshape(-1, 3)
+    if len(pixels) == 0:
+        raise ValueError("image has no pixels")
+
+    if sample_size and len(pixels) > sample_size:
+        rng = np.random.default_rng(seed)
+        pixels = pixels[rng.integers(0, len(pixels), sample_size)]
+    pixels = pixels.astype(np.float64)
+
+    centroids = median_cut(pixels, k)
+    labels = _assign(pixels, centroids)
+    for _ in range(iterations):
+        centroids, labels = _kmeans_step(pixels, centroids, labels)
+
+    counts = np.bincount(labels, minlength=len(centroids))
+    kept, kept_counts = [], []
+    for index in np.argsort(-counts, kind='stable'):
+        if counts[index] == 0:
+            continue
+        centroid = centroids[index]
+        for i, larger in enumerate(kept):
+            if np.sqrt(((centroid - larger) ** 2).sum()) < merge_distance:
+                kept_counts[i] += counts[index]
+                break
+        else:
+            kept.append(centroid)
+            kept_counts.append(counts[index])
+
+    colors = []
+    for centroid, pixel_count in sorted(zip(kept, kept_counts), key=lambda item: -item[1]):
+        rgb = tuple(int(value) for value in np.clip(np.rint(centroid), 0, 255))
+        simple_name, name, distance = get_top_color_matches(rgb, 1, metric, palette)[0]
+        colors.append(DominantColor(rgb, float(pixel_count / len(pixels)), simple_name, name, distance))
+    return colors
+
+
+def capture_dominant_colors(screen_capture, left, top, width, height, **kwargs):
+    """
+    Capture a screen rectangle and find its main colors.
+
+    Args:
+        screen_capture (PlatformScreenCapture): Capture backend
+        left, top, width, height (int): Screen rectangle in pixels
+        **kwargs: Passed to extract_dominant_colors
+
+    Returns:
+        list: DominantColor tuples, or None if the capture fails
+    """
+    region = screen_capture.capture_rectangle(left, top, width, height)
+    if region is None:
+        return None
+    return extract_dominant_colors(region, **kwargs)
+
+
+def median_cut(pixels, k):
+    """
+    Quantize colors with median cut.
+
+    Repeatedly splits the box with the widest channel range (weighted by
+    its pixel count) at the median of that channel.
+
+    Args:
+        pixels: float array of shape (N, 3)
+        k (int): Maximum number of boxes
+
+    Returns:
+        numpy.ndarray: Box mean colors, shape (boxes, 3)
+    """
+    boxes = [pixels]
+    while len(boxes) < k:
+        ranges = [np.ptp(box, axis=0) for box in boxes]
+        scores = [r.max() * len(box) for r, box in zip(ranges, boxes)]
+        index = int(np.argmax(scores))
+        if scores[index] == 0:
+            # Every box is a single color
+            break
+        box = boxes.pop(index)
+        channel = int(np.argmax(ranges[index]))
+        order = np.argsort(box[:, channel], kind='stable')
+        half = len(box) // 2
+        boxes += [box[order[:half]], box[order[half:]]]
+    return np.array([box.mean(axis=0) for box in boxes])
+
+
+def _assign(pixels, centroids):
+    """Index of the nearest centroid for every pixel"""
+    distance_sq = (pixels * pixels).sum(axis=1)[:, None] - 2 * pixels @ centroids.T \
+        + (centroids * centroids).sum(axis=1)[None, :]
+    return np.argmin(distance_sq, axis=1)
+
+
+def _kmeans_step(pixels, centroids, labels):
+    """Move each centroid to the mean of its pixels, then reassign"""
+    counts = np.bincount(labels, minlength=len(centroids))
+    sums = np.stack([np.bincount(labels, weights=pixels[:, channel], minlength=len(centroids))
+                     for channel in range(3)], axis=1)
+    occupied = counts > 0
+    centroids = centroids.copy()
+    centroids[occupied] = sums[occupied] / counts[occupied, None]
+    return centroids, _assign(pixels, centroids)
@@ -0,0 +1,239 @@
+"""
+Compiled hue wheels for constant-time hue name lookups.
+
+Each wheel from hues_lists is compiled once into a fine-grained
+degree -> apex table plus per-apex neighbour tables, so hue naming and
+direction queries are array lookups instead of a scan over the wheel.
+Queries accept a single hue or a NumPy array of hues.
+"""
+
+import math
+
+import numpy as np
+
+from .hues_lists import hues
+
+
+# Table bins per degree
+_RESOLUTION = 10
+
+# Compiled wheels by subdivision count, built lazily by get_hue_wheel()
+_wheels = {}
+
+
+class HueWheel:
+    """
+    A validated hue wheel with precomputed lookup tables.
+
+    Apex i is the center of hue_names[i]. The last apex must be the first
+    name with an apostrophe at 360 degrees ("Red'"), closing the circle.
+    A hue belongs to the apex with the smallest circular distance; on an
+    exact tie the lower index wins, as in the original linear scan.
+    """
+
+    def __init__(self, hue_names, hue_values, resolution=_RESOLUTION):
+        """
+        Args:
+            hue_names (list): Apex names, ending with the first name plus "'"
+            hue_values (list): Apex hues in degrees, sorted, from 0 to 360
+            resolution (int): Table bins per degree
+        """
+        self._validate(hue_names, hue_values)
+
+        self.hue_names = list(hue_names)
+        self.hue_values = [float(value) for value in hue_values]
+        self.resolution = resolution
+        # Display names drop the apostrophe of the closing alias
+        self.names = [name[:-1] if name.endswith("'") else name for name in self.hue_names]
+        self.simple_names = [name.lower() for name in self.names]
+
+        self._build_bins()
+        self._build_neighbours()
+
+        self._values_array = np.array(self.hue_values)
+        self._names_array = np.array(self.names, dtype=object)
+        self._simple_names_array = np.array(self.simple_names, dtype=object)
+
+    @staticmethod
+    def _validate(hue_names, hue_values):
+        """Check the wheel is sorted, spans 0-360 and closes with the "'" alias"""
+        if len(hue_names) != len(hue_values):
+            raise ValueError("hue wheel needs one value per name")
+        if len(hue_values) < 3:
+            raise ValueError("hue wheel needs at least two hues plus the closing alias")
+        if any(b <= a for a, b in zip(hue_values, hue_values[1:])):
+            raise ValueError("hue wheel values must be strictly increasing")
+        if hue_values[0] != 0 or hue_values[-1] != 360:
+            raise ValueError("hue wheel must start at 0 and wrap at 360 degrees")
+        if hue_names[-1] != hue_names[0] + "'":
+            raise ValueError(f"hue wheel must close with the alias {hue_names[0]}'")
+
+    def _distance(self, hue, index):
+        """Circular distance, computed exactly as the original scan did"""
+        distance = abs(hue - self.hue_values[index])
+        if distance > 180:
+            distance = 360 - distance
+        return distance
+
+    def _scan(self, hue):
+        """Reference linear scan for a normalized hue"""
+        min_distance = 360
+        closest_index = 0
+        for i in range(len(self.hue_values)):
+            distance = self._distance(hue, i)
+            if distance < min_distance:
+                min_distance = distance
+                closest_index = i
+        return closest_index
+
+    def _build_bins(self):
+        """
+        For every bin, list the apexes that can be closest to a hue in it.
+
+        A bin's candidates come from scanning its (widened) edges and both
+        sides of every boundary inside it, so any hue that rounds into the
+        bin has its true answer among them.
+        """
+        values = self.hue_values
+        boundaries = [(a + b) / 2 for a, b in zip(values, values[1:])]
+        bin_count = 360 * self.resolution
+        width = 1.0 / self.resolution
+        last = len(values) - 1
+
+        candidates = []
+        for bin_index in range(bin_count):
+            low = max(0.0, (bin_index - 1) * width)
+            high = min(math.nextafter(360.0, 0.0), (bin_index + 2) * width)
+            samples = [low, high]
+            for boundary in boundaries:
+                if low < boundary < high:
+                    samples += [math.nextafter(boundary, 0.0), boundary, math.nextafter(boundary, 360.0)]
+            bin_candidates = {self._scan(sample) for sample in samples}
+            # The closing alias is as far as the first apex up to float
+            # rounding, so whichever wins by rounding must be compared
+            if 0 in bin_candidates or last in bin_candidates:
+                bin_candidates |= {0, last}
+            candidates.append(sorted(bin_candidates))
+
+        width = max(len(c) for c in candidates)
+        # Pad with the first candidate; duplicates never change the answer
+        padded = [c + [c[0]] * (width - len(c)) for c in candidates]
+        self._bins = padded
+        self._bins_array = np.array(padded, dtype=np.int16)
+
+    def _build_neighbours(self):
+        """Per apex: adjacent names and next distinct simple names both ways"""
+        count = len(self.hue_names)
+        self.next_simple = []
+        self.previous_simple = []
+        for index in range(count):
+            self.next_simple.append(self._next_distinct(index, 1))
+            self.previous_simple.append(self._next_distinct(index, -1))
+        self.adjacent_next = [self.names[(i + 1) % count] for i in range(count)]
+        self.adjacent_previous = [self.names[(i - 1) % count] for i in range(count)]
+
+        self._next_simple_array = np.array(self.next_simple, dtype=object)
+        self._previous_simple_array = np.array(self.previous_simple, dtype=object)
+        self._adjacent_next_array = np.array(self.adjacent_next, dtype=object)
+        self._adjacent_previous_array = np.array(self.adjacent_previous, dtype=object)
+
+    def _next_distinct(self, index, step):
+        """First simple name different from the apex's, walking in one direction"""
+        current = self.simple_names[index]
+        count = len(self.simple_names)
+        for offset in range(1, count):
+            candidate = self.simple_names[(index + step * offset) % count]
+            if candidate != current:
+                return candidate
+        return current
+
+    def index_of(self, hue_degrees):
+        """
+        Get the closest apex index.
+
+        Args:
+            hue_degrees: Hue in degrees, or a NumPy array of hues
+
+        Returns:
+            int or numpy.ndarray: Apex index into hue_names
+        """
+        if isinstance(hue_degrees, np.ndarray):
+            return self._index_of_array(hue_degrees)
+
+        hue = hue_degrees % 360
+        candidates = self._bins[min(int(hue * self.resolution), len(self._bins) - 1)]
+        best = candidates[0]
+        best_distance = self._distance(hue, best)
+        for candidate in candidates[1:]:
+            distance = self._distance(hue, candidate)
+            # Candidates are in index order, so strict < keeps the lower index on ties
+            if distance < best_distance:
+                best, best_distance = candidate, distance
+        return best
+
+    def _index_of_array(self, hue_degrees):
+        hue = np.mod(np.asarray(hue_degrees, dtype=np.float64), 360)
+        bins = np.minimum((hue * self.resolution).astype(np.int64), len(self._bins) - 1)
+        candidates = self._bins_array[bins]
+        best = candidates[..., 0].astype(np.intp)
+        best_distance = self._distance_array(hue, best)
+        for column in range(1, candidates.shape[-1]):
+            candidate = candidates[..., column].astype(np.intp)
+            distance = self._distance_array(hue, candidate)
+            closer = distance < best_distance
+            best = np.where(closer, candidate, best)
+            best_distance = np.where(closer, distance, best_distance)
+        return best
+
+    def _distance_array(self, hue, index):
+        distance = np.abs(hue - self._values_array[index])
+        return np.where(distance > 180, 360 - distance, distance)
+
+    def name_of(self, hue_degrees):
+        """Hue name of the closest apex (without the "'" alias)"""
+        index = self.index_of(hue_degrees)
+        if isinstance(index, np.ndarray):
+            return self._names_array[index]
+        return self.names[index]
+
+    def simple_name_of(self, hue_degrees):
+        """Lowercase simple color name of the closest apex"""
+        index = self.index_of(hue_degrees)
+        if isinstance(index, np.ndarray):
+            return self._simple_names_array[index]
+        return self.simple_names[index]
+
+    def next_simple_name(self, hue_degrees, clockwise=True):
+        """Next different simple color name from the closest apex, in one direction"""
+        index = self.index_of(hue_degrees)
+        if isinstance(index, np.ndarray):
+            table = self._next_simple_array if clockwise else self._previous_simple_array
+            return table[index]
+        return self.next_simple[index] if clockwise else self.previous_simple[index]
+
+    def adjacent_name(self, hue_degrees, clockwise=True):
+        """Name of the apex next to the closest one, in one direction"""
+        index = self.index_of(hue_degrees)
+        if isinstance(index, np.ndarray):
+            table = self._adjacent_next_array if clockwise else self._adjacent_previous_array
+            return table[index]
+        return self.adjacent_next[index] if clockwise else self.adjacent_previous[index]
+
+
+def get_hue_wheel(subdivisions=12):
+    """
+    Get the compiled hue wheel for a subdivision count, building it on first use.
+
+    Args:
+        subdivisions (int): Which hue list to use (6, 12 or 24); unknown values use 12
+
+    Returns:
+        HueWheel: Compiled wheel
+    """
+    if subdivisions not in hues:
+        subdivisions = 12
+    wheel = _wheels.get(subdivisions)
+    if wheel is None:
+        hue_names, hue_values = hues[subdivisions]
+        wheel = _wheels[subdivisions] = HueWheel(hue_names, hue_values)
+    return wheel
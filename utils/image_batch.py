@@ -0,0 +1,275 @@
+"""
+Headless batch analysis of image files.
+
+Each image is processed in horizontal tiles, so working arrays stay the
+size of one tile however large the image is. The decoded 8-bit image is
+still held whole (PIL decodes PNG and most other formats in one piece), so
+peak memory is about 3 bytes per pixel plus one tile's temporaries; name
+maps are written through a memory-mapped file.
+Per image it computes:
+
+- dominant colors, from a subsample drawn evenly across the tiles
+- hue composition: the share of pixels per hue name (plus "neutral")
+- optionally a per-pixel name map, written as a .npy array of palette
+  indices next to a names.json listing the palette names
+
+Images are analyzed in a process pool and results are yielded in input
+order as they complete, so callers can stream them to disk.
+"""
+
+import hashlib
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .compare_hues import hue_name_table, hue_quantize_array
+from .comparisonEngine import get_color_names_batch
+from .dominant_colors import DEFAULT_COLOR_COUNT, DEFAULT_SAMPLE_SIZE, extract_dominant_colors
+from .palette_registry import get_palette, get_palette_registry, load_palette_file, set_active_palette
+
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.gif', '.tif', '.tiff', '.webp')
+DEFAULT_TILE_PIXELS = 1 << 20
+NAME_MAP_NAMES_FILE = 'names.json'
+
+# Name-map directory -> palette whose names.json this process wrote there
+_names_written = {}
+
+CSV_FIELDS = ('path', 'width', 'height', 'dominant_colors', 'hue_composition', 'name_map', 'error')
+
+
+def iter_image_paths(paths, recursive=True):
+    """
+    Yield image files from files and directories, lazily and in sorted order.
+
+    Args:
+        paths (list): Image files and directories
+        recursive (bool): Descend into subdirectories
+
+    Yields:
+        str: Image file path
+    """
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, directories, files in os.walk(path):
+            directories.sort()
+            if not recursive:
+                directories.clear()
+            for file_name in sorted(files):
+                if file_name.lower().endswith(IMAGE_EXTENSIONS):
+                    yield os.path.join(root, file_name)
+
+
+def analyze_image(path, colors=DEFAULT_COLOR_COUNT, hue_subdivisions=12, metric='rgb',
+                  name_map_dir=None, tile_pixels=DEFAULT_TILE_PIXELS, sample_size=DEFAULT_SAMPLE_SIZE, seed=0):
+    """
+    Analyze one image file tile by tile.
+
+    Args:
+        path (str): Image file
+        colors (int): Number of dominant colors
+        hue_subdivisions (int): Hue list for the composition (6, 12 or 24)
+        metric (str): Naming metric, 'rgb', 'cie76' or 'ciede2000'
+        name_map_dir (str): Directory for per-pixel name maps, or None to skip
+        tile_pixels (int): Approximate pixels per tile
+        sample_size (int): Pixels sampled across the image for dominant colors
+        seed (int): Subsample random seed
+
+    Returns:
+        dict: path, width, height, dominant_colors (list of dicts with hex,
+            rgb, share, simple_name, name), hue_composition (name -> share,
+            largest first) and name_map (path or None)
+    """
+    from PIL import Image
+
+    # Not a with block: closing the image would also free the decoded pixels.
+    # load() reads single-frame files completely and closes them.
+    image = Image.open(path)
+    image.load()
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    width, height = image.size
+
+    total = width * height
+    tile_rows = max(1, tile_pixels // max(width, 1))
+    rng = np.random.default_rng(seed)
+    hue_names = hue_name_table(hue_subdivisions)
+    hue_counts = np.zeros(len(hue_names), dtype=np.int64)
+    samples = []
+
+    name_map = name_map_path = None
+    if name_map_dir:
+        palette = get_palette()
+        name_map_path = _name_map_path(name_map_dir, path)
+        dtype = np.uint8 if len(palette.names) <= 256 else np.uint16 if len(palette.names) <= 65536 else np.uint32
+        name_map = np.lib.format.open_memmap(name_map_path, mode='w+', dtype=dtype, shape=(height, width))
+
+    for top in range(0, height, tile_rows):
+        # Only the tile is copied into NumPy, never the whole image
+        tile = np.asarray(image.crop((0, top, width, min(top + tile_rows, height)))).reshape(-1, 3)
+
+        # Each tile contributes to the subsample in proportion to its size
+        tile_samples = min(len(tile), -(-sample_size * len(tile) // total))
+        samples.append(tile[rng.integers(0, len(tile), tile_samples)])
+
+        hue_counts += np.bincount(hue_quantize_array(tile, hue_subdivisions)['index'], minlength=len(hue_names))
+
+        if name_map is not None:
+            css_indices = get_color_names_batch(tile, 1, metric=metric)[0][:, 0]
+            name_map[top:top + tile_rows] = css_indices.reshape(-1, width)
+
+    if name_map is not None:
+        name_map.flush()
+        del name_map
+        _write_names_file(name_map_dir, palette)
+
+    dominant = extract_dominant_colors(np.concatenate(samples), k=colors, sample_size=0, metric=metric)
+    order = np.argsort(-hue_counts, kind='stable')
+    return {
+        'path': path,
+        'width': width,
+        'height': height,
+        'dominant_colors': [
+            {
+                'hex': '#{:02x}{:02x}{:02x}'.format(*color.rgb),
+                'rgb': list(color.rgb),
+                'share': round(color.share, 4),
+                'simple_name': color.simple_name,
+                'name': color.name,
+            }
+            for color in dominant
+        ],
+        'hue_composition': {hue_names[i]: round(hue_counts[i] / total, 4) for i in order if hue_counts[i]},
+        'name_map': name_map_path,
+    }
+
+
+def _name_map_path(name_map_dir, path):
+    """<name_map_dir>/<file name>-<path hash>.names.npy, unique across source directories"""
+    digest = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()[:8]
+    return os.path.join(name_map_dir, f"{os.path.basename(path)}-{digest}.names.npy")
+
+
+def _write_names_file(name_map_dir, palette):
+    """
+    Write the palette names indexed by the name maps.
+
+    The file is rewritten for the first image of each palette in a process,
+    so a rerun into the same directory with another palette never leaves a
+    stale id -> name table behind.
+    """
+    directory = os.path.abspath(name_map_dir)
+    if _names_written.get(directory) is palette:
+        return
+    names_path = os.path.join(directory, NAME_MAP_NAMES_FILE)
+    partial_path = f"{names_path}.{os.getpid()}.partial"
+    with open(partial_path, 'w', encoding='utf-8') as names_file:
+        json.dump({'palette': palette.name, 'names': list(palette.names),
+                   'simple_names': list(palette.simple_names)}, names_file)
+    os.replace(partial_path, names_path)
+    # Keeping the palette referenced also keeps the identity check meaningful
+    _names_written[directory] = palette
+
+
+def _safe_analyze(args):
+    """analyze_image for pool workers: errors become part of the result"""
+    path, options = args
+    try:
+        return analyze_image(path, **options)
+    except Exception as e:
+        return {'path': path, 'error': f"{type(e).__name__}: {e}"}
+
+
+def load_worker_palette(palette_path, name_maps=False):
+    """
+    Load a palette file once in the parent process, for _init_worker.
+
+    Workers then receive the compiled palette instead of each loading
+    (and on a cold cache, compiling) the file themselves.
+
+    Args:
+        palette_path (str): Palette file, or None for the built-in palette
+        name_maps (bool): Also build the candidate grid used by per-pixel
+            naming, so workers receive it ready-made
+
+    Returns:
+        tuple: initargs for _init_worker, (name, PaletteIndex) or (None, None)
+    """
+    if not palette_path:
+        return None, None
+    name = load_palette_file(palette_path)
+    palette = get_palette(name)
+    if name_maps:
+        get_color_names_batch(np.zeros((1, 3), dtype=np.uint8), palette=palette)
+    return name, palette
+
+
+def _init_worker(palette_name, palette):
+    """Make the compiled palette from load_worker_palette the active one, in a worker or inline"""
+    if palette is not None:
+        get_palette_registry().register(palette_name, palette)
+        set_active_palette(palette_name)
+
+
+def analyze_images(paths, workers=None, palette_path=None, **options):
+    """
+    Analyze many images, in a process pool unless workers is 1.
+
+    Paths are consumed lazily and only a few images per worker are in
+    flight at once, so memory does not grow with the number of files.
+
+    Args:
+        paths: Iterable of image files
+        workers (int): Worker processes (default: CPU count); 1 runs inline
+        palette_path (str): Palette file made active in every worker
+        **options: Passed to analyze_image
+
+    Yields:
+        dict: One result per image, in input order; failed images have
+            "path" and "error" only
+    """
+    if options.get('name_map_dir'):
+        os.makedirs(options['name_map_dir'], exist_ok=True)
+    initargs = load_worker_palette(palette_path, name_maps=bool(options.get('name_map_dir')) and workers != 1)
+    tasks = ((path, options) for path in paths)
+
+    if workers == 1:
+        _init_worker(*initargs)
+        for task in tasks:
+            yield _safe_analyze(task)
+        return
+
+    max_pending = 2 * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=initargs) as executor:
+        pending = deque()
+        for task in tasks:
+            pending.append(executor.submit(_safe_analyze, task))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def format_csv_row(result):
+    """
+    Flatten a result for CSV output.
+
+    Returns:
+        dict: CSV_FIELDS -> value; colors are "hex:share:name" and hue
+            shares "name:share", joined with ";"
+    """
+    return {
+        'path': result['path'],
+        'width': result.get('width', ''),
+        'height': result.get('height', ''),
+        'dominant_colors': ';'.join(f"{color['hex']}:{color['share']}:{color['name']}"
+                                    for color in result.get('dominant_colors', [])),
+        'hue_composition': ';'.join(f"{name}:{share}" for name, share in result.get('hue_composition', {}).items()),
+        'name_map': result.get('name_map') or '',
+        'error': result.get('error', ''),
+    }
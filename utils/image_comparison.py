@@ -0,0 +1,299 @@
+"""
+Image-vs-image tint comparison.
+
+Extends the dual-mode pixel comparison to two aligned images, e.g. a photo
+and a video frame of the same scene. Every pixel pair gets the RGB and HSL
+differences and the same hue transition analyze_HSL_first_neutral_only
+reports for two picked colors, computed with NumPy one chunk of rows at a
+time so 4K pairs stay within modest memory. The verdict is the engine's
+analysis of the two images' mean colors, in the familiar
+"tinted background: neutral (photos) -> orange (video)" vocabulary.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from .color_space import rgb_to_hsl_array
+from .comparisonEngine import IDENTICAL_ASSESSMENT, SIMILARITY_BUCKETS, analyze_HSL_first_neutral_only
+from .hue_wheel import get_hue_wheel
+from .instrumentation import timed
+
+
+# Per-pixel transition kinds, as HueTransition.kind
+TRANSITION_SAME = 0
+TRANSITION_NEUTRAL = 1
+TRANSITION_SHIFT = 2
+TRANSITION_KINDS = ("same", "neutral", "shift")
+
+DEFAULT_CHUNK_PIXELS = 1 << 18
+# RGB distance shown at full heat in the heatmap
+DEFAULT_HEATMAP_MAX = 100
+
+# Saturation below which the first color counts as neutral, as in the engine
+_NEUTRAL_SATURATION = 10
+# RGB distance below which two low-saturation colors are "same"
+_ACHROMATIC_DISTANCE = 10
+
+
+class ImageComparison(NamedTuple):
+    """
+    Result of compare_images.
+
+    analysis is the HSLAnalysis of the two images' mean colors. summary
+    holds aggregate statistics (see compare_images). maps holds the
+    per-pixel arrays, or is None when they were not requested. heatmap is
+    a PIL image of the per-pixel RGB distance.
+    """
+    analysis: object
+    summary: dict
+    maps: dict
+    heatmap: object
+
+    @property
+    def assessment_text(self):
+        """Text like "hue: neutral -> orange (+15.9deg), saturation: +2%, lightness: same" """
+        return self.analysis.render()
+
+    @property
+    def clipboard_text(self):
+        """Text like "tinted background: neutral (photos) -> orange (video)" """
+        return self.analysis.hue.clipboard_text()
+
+
+def get_transition_names(subdivisions=12):
+    """
+    Simple color names indexed by the source/target ids of the maps.
+
+    Args:
+        subdivisions (int): Hue list used for the comparison
+
+    Returns:
+        tuple: Sorted simple names of the hue wheel, then "neutral"
+    """
+    return _transition_tables(subdivisions)[0]
+
+
+def _transition_tables(subdivisions):
+    """Names, apex -> name id, apex -> next name id both ways, neutral id"""
+    wheel = get_hue_wheel(subdivisions)
+    names = tuple(sorted(set(wheel.simple_names))) + ("neutral",)
+    ids = {name: i for i, name in enumerate(names)}
+    apex_ids = np.array([ids[name] for name in wheel.simple_names], dtype=np.int16)
+    next_ids = np.array([ids[name] for name in wheel.next_simple], dtype=np.int16)
+    previous_ids = np.array([ids[name] for name in wheel.previous_simple], dtype=np.int16)
+    return names, apex_ids, next_ids, previous_ids, ids["neutral"]
+
+
+def classify_hue_transitions(rgb1, rgb2, hsl1, hsl2, threshold=5, subdivisions=12):
+    """
+    Vectorized analyze_hue_transition_first_neutral_only for pixel pairs.
+
+    Args:
+        rgb1, rgb2: (N, 3) integer RGB arrays
+        hsl1, hsl2: (N, 3) HSL arrays rounded as rgb_to_hsl rounds them
+        threshold (float): Hue change in degrees below which hues are "same"
+        subdivisions (int): Hue list
+
+    Returns:
+        tuple: (kind, source, target, hue_diff) arrays: kind codes
+            (TRANSITION_SAME/NEUTRAL/SHIFT), source and target name ids into
+            get_transition_names (-1 unless kind is shift), and the signed
+            hue change normalized to [-180, 180]
+    """
+    _, apex_ids, next_ids, previous_ids, neutral_id = _transition_tables(subdivisions)
+    wheel = get_hue_wheel(subdivisions)
+    hue1, saturation1 = hsl1[:, 0], hsl1[:, 1]
+    hue2, saturation2 = hsl2[:, 0], hsl2[:, 1]
+
+    hue_diff = hue2 - hue1
+    hue_diff = np.where(hue_diff > 180, hue_diff - 360, np.where(hue_diff < -180, hue_diff + 360, hue_diff))
+
+    difference = rgb1.astype(np.int64) - rgb2
+    distance_sq = np.einsum('ij,ij->i', difference, difference)
+    similar_grays = (saturation1 < _NEUTRAL_SATURATION) & (saturation2 < _NEUTRAL_SATURATION) \
+        & (distance_sq < _ACHROMATIC_DISTANCE ** 2)
+    both_zero = (hue1 == 0) & (hue2 == 0)
+
+    # First color can be neutral by saturation; the second is always named by hue
+    source = np.where(saturation1 < _NEUTRAL_SATURATION, neutral_id, apex_ids[wheel.index_of(hue1)])
+    apex2 = wheel.index_of(hue2)
+    target = apex_ids[apex2]
+    # Same category: show movement toward the next category in the hue's direction
+    toward = np.where(hue_diff > 0, next_ids[apex2], previous_ids[apex2])
+    same_category = source == target
+    target = np.where(same_category, toward, target)
+
+    kind = np.full(len(hue1), TRANSITION_SHIFT, dtype=np.int8)
+    kind[same_category & (toward == source)] = TRANSITION_SAME
+    kind[np.abs(hue_diff) < threshold] = TRANSITION_SAME
+    kind[both_zero] = TRANSITION_NEUTRAL
+    kind[similar_grays] = TRANSITION_SAME
+
+    shifted = kind == TRANSITION_SHIFT
+    return (kind, np.where(shifted, source, -1).astype(np.int16),
+            np.where(shifted, target, -1).astype(np.int16), hue_diff)
+
+
+def _heat_colors(distance, heatmap_max):
+    """Black -> red -> yellow -> white ramp over distance / heatmap_max"""
+    heat = np.clip(distance / heatmap_max, 0, 1) * 3
+    ramp = np.stack([heat, heat - 1, heat - 2], axis=-1)
+    return (np.clip(ramp, 0, 1) * 255).astype(np.uint8)
+
+
+def _as_rgb_array(image):
+    if hasattr(image, 'getbands'):
+        image = np.asarray(image.convert('RGB'))
+    image = np.asarray(image)
+    if image.ndim != 3 or image.shape[2] != 3:
+        raise ValueError("images must have shape (height, width, 3)")
+    return image
+
+
+@timed('image_comparison.compare_images')
+def compare_images(image1, image2, hue_threshold=5, saturation_threshold=10, lightness_threshold=10,
+                   subdivisions=12, include_maps=False, heatmap_max=DEFAULT_HEATMAP_MAX,
+                   chunk_pixels=DEFAULT_CHUNK_PIXELS):
+    """
+    Compare two aligned images pixel by pixel.
+
+    image1 is the reference (the "photos" side of the clipboard text) and
+    image2 the compared image ("video").
+
+    Args:
+        image1, image2: PIL images or (height, width, 3) RGB arrays of the same size
+        hue_threshold, saturation_threshold, lightness_threshold: As in
+            get_HSL_hue_analysis_first_neutral_only
+        subdivisions (int): Hue list for naming transitions
+        include_maps (bool): Also return the per-pixel maps, 24 bytes
+            per pixel (default: False); the summary and heatmap are always
+            computed
+        heatmap_max (float): RGB distance shown at full heat
+        chunk_pixels (int): Approximate pixels processed at once, bounds
+            temporary memory
+
+    Returns:
+        ImageComparison: With summary keys:
+            - pixels: Number of pixel pairs
+            - mean_color1, mean_color2: Mean RGB colors
+            - mean_distance, max_distance: Per-pixel RGB distance
+            - assessment: Similarity label of the mean distance
+            - mean_hue_diff: Mean signed hue change of pixels saturated in
+              both images, or 0.0 without any
+            - mean_saturation_diff, mean_lightness_diff: In percent
+            - kinds: Share of pixels per transition kind
+            - transitions: [(source, target, share), ...] most common first
+            and, with include_maps, maps:
+            - delta_rgb: int16 (height, width, 3), image2 - image1
+            - delta_hsl: float32 (height, width, 3), signed hue change and
+              saturation/lightness changes
+            - transition: int8 (height, width) kind codes
+            - hue_direction: int8 (height, width), +1 for a clockwise shift,
+              -1 for a counterclockwise shift, 0 otherwise
+            - source, target: int16 (height, width) ids into
+              get_transition_names, -1 unless the pixel shifted
+    """
+    image1 = _as_rgb_array(image1)
+    image2 = _as_rgb_array(image2)
+    if image1.shape != image2.shape:
+        raise ValueError(f"images must be aligned and the same size, got {image1.shape} and {image2.shape}")
+    height, width = image1.shape[:2]
+    total = height * width
+    if total == 0:
+        raise ValueError("images have no pixels")
+    names = get_transition_names(subdivisions)
+
+    heatmap = np.empty((height, width, 3), dtype=np.uint8)
+    maps = None
+    if include_maps:
+        maps = {
+            'delta_rgb': np.empty((height, width, 3), dtype=np.int16),
+            'delta_hsl': np.empty((height, width, 3), dtype=np.float32),
+            'transition': np.empty((height, width), dtype=np.int8),
+            'hue_direction': np.empty((height, width), dtype=np.int8),
+            'source': np.empty((height, width), dtype=np.int16),
+            'target': np.empty((height, width), dtype=np.int16),
+        }
+
+    rgb_sum1 = np.zeros(3, dtype=np.int64)
+    rgb_sum2 = np.zeros(3, dtype=np.int64)
+    distance_sum = 0.0
+    max_distance = 0.0
+    saturation_sum = lightness_sum = 0.0
+    hue_sum = 0.0
+    hue_count = 0
+    kind_counts = np.zeros(len(TRANSITION_KINDS), dtype=np.int64)
+    pair_counts = np.zeros(len(names) * len(names), dtype=np.int64)
+
+    rows = max(1, chunk_pixels // max(width, 1))
+    for top in range(0, height, rows):
+        rgb1 = image1[top:top + rows].reshape(-1, 3).astype(np.int16)
+        rgb2 = image2[top:top + rows].reshape(-1, 3).astype(np.int16)
+        hsl1 = rgb_to_hsl_array(rgb1)
+        hsl2 = rgb_to_hsl_array(rgb2)
+        kind, source, target, hue_diff = classify_hue_transitions(rgb1, rgb2, hsl1, hsl2, hue_threshold, subdivisions)
+
+        delta_rgb = rgb2 - rgb1
+        distance = np.sqrt(np.einsum('ij,ij->i', delta_rgb, delta_rgb, dtype=np.int64))
+        saturation_diff = hsl2[:, 1] - hsl1[:, 1]
+        lightness_diff = hsl2[:, 2] - hsl1[:, 2]
+
+        rgb_sum1 += rgb1.sum(axis=0)
+        rgb_sum2 += rgb2.sum(axis=0)
+        distance_sum += distance.sum()
+        max_distance = max(max_distance, float(distance.max()))
+        saturation_sum += saturation_diff.sum()
+        lightness_sum += lightness_diff.sum()
+        chromatic = (hsl1[:, 1] >= _NEUTRAL_SATURATION) & (hsl2[:, 1] >= _NEUTRAL_SATURATION)
+        hue_sum += hue_diff[chromatic].sum()
+        hue_count += int(chromatic.sum())
+        kind_counts += np.bincount(kind, minlength=len(TRANSITION_KINDS))
+        shifted = kind == TRANSITION_SHIFT
+        pair_counts += np.bincount(source[shifted].astype(np.int64) * len(names) + target[shifted],
+                                   minlength=len(pair_counts))
+
+        chunk_shape = (-1, width)
+        heatmap[top:top + rows] = _heat_colors(distance, heatmap_max).reshape(-1, width, 3)
+        if maps is not None:
+            maps['delta_rgb'][top:top + rows] = delta_rgb.reshape(-1, width, 3)
+            maps['delta_hsl'][top:top + rows] = np.stack([hue_diff, saturation_diff, lightness_diff],
+                                                          axis=-1).reshape(-1, width, 3)
+            maps['transition'][top:top + rows] = kind.reshape(chunk_shape)
+            maps['hue_direction'][top:top + rows] = (np.sign(hue_diff) * shifted).reshape(chunk_shape)
+            maps['source'][top:top + rows] = source.reshape(chunk_shape)
+            maps['target'][top:top + rows] = target.reshape(chunk_shape)
+
+    mean_color1 = tuple(int(value) for value in np.rint(rgb_sum1 / total))
+    mean_color2 = tuple(int(value) for value in np.rint(rgb_sum2 / total))
+    mean_distance = distance_sum / total
+    if max_distance == 0:
+        assessment = IDENTICAL_ASSESSMENT[0]
+    else:
+        assessment = next(label for limit, label, _ in SIMILARITY_BUCKETS if mean_distance < limit)
+
+    transitions = []
+    for pair in np.argsort(-pair_counts, kind='stable'):
+        if pair_counts[pair] == 0:
+            break
+        source_id, target_id = divmod(int(pair), len(names))
+        transitions.append((names[source_id], names[target_id], float(pair_counts[pair] / total)))
+
+    summary = {
+        'pixels': total,
+        'mean_color1': mean_color1,
+        'mean_color2': mean_color2,
+        'mean_distance': float(mean_distance),
+        'max_distance': max_distance,
+        'assessment': assessment,
+        'mean_hue_diff': float(hue_sum / hue_count) if hue_count else 0.0,
+        'mean_saturation_diff': float(saturation_sum / total),
+        'mean_lightness_diff': float(lightness_sum / total),
+        'kinds': {name: float(kind_counts[i] / total) for i, name in enumerate(TRANSITION_KINDS)},
+        'transitions': transitions,
+    }
+
+    analysis = analyze_HSL_first_neutral_only(mean_color1, mean_color2, hue_threshold,
+                                              saturation_threshold, lightness_threshold, subdivisions)
+    from PIL import Image
+    return ImageComparison(analysis, summary, maps, Image.fromarray(heatmap))
@@ -0,0 +1,247 @@
+"""
+Opt-in timers and counters for the capture, engine and GUI hot paths.
+
+Instrumentation is off by default and then costs one flag check per
+instrumented call. Set the COLOR_PICKER_INSTRUMENT environment variable to
+turn it on for a whole session:
+
+    COLOR_PICKER_INSTRUMENT=1            dump a JSON snapshot to stderr at exit
+    COLOR_PICKER_INSTRUMENT=profile.json write the snapshot to that file at exit
+
+Code can also call enable(), snapshot() and dump() directly. Timers keep a
+count, total, min and max plus the most recent durations for percentiles;
+gauges keep the latest value of a quantity such as a refresh rate.
+"""
+
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+
+ENV_VARIABLE = 'COLOR_PICKER_INSTRUMENT'
+
+# Recent durations kept per timer for percentiles
+RECENT_SAMPLES = 1024
+
+_enabled = False
+_lock = threading.Lock()
+_timers = {}
+_counters = {}
+_gauges = {}
+_started = time.time()
+
+
+class _TimerStats:
+    __slots__ = ('count', 'total', 'min', 'max', 'recent')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.recent.append(seconds)
+
+    def summary(self):
+        recent = sorted(self.recent)
+        summary = {
+            'count': self.count,
+            'total_ms': self.total * 1e3,
+            'mean_ms': self.total / self.count * 1e3,
+            'min_ms': self.min * 1e3,
+            'max_ms': self.max * 1e3,
+        }
+        for percentile in (50, 90, 99):
+            # Nearest-rank percentile of the recent samples
+            index = min(len(recent) - 1, max(0, -(-percentile * len(recent) // 100) - 1))
+            summary[f'p{percentile}_ms'] = recent[index] * 1e3
+        return summary
+
+
+class _Timer:
+    """Context manager recording its block's duration under a name"""
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        record_time(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _NullTimer:
+    """Shared do-nothing timer returned while instrumentation is disabled"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def is_enabled():
+    """Whether timers and counters are being recorded"""
+    return _enabled
+
+
+def enable():
+    """Start recording timers and counters"""
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """Stop recording; collected values are kept until reset()"""
+    global _enabled
+    _enabled = False
+
+
+def reset():
+    """Drop all collected timers and counters"""
+    global _started
+    with _lock:
+        _timers.clear()
+        _counters.clear()
+        _gauges.clear()
+        _started = time.time()
+
+
+def timer(name):
+    """
+    Time a block of code.
+
+    Args:
+        name (str): Timer name, e.g. "capture.capture_screen_area"
+
+    Returns:
+        Context manager recording the block's duration when enabled
+    """
+    if not _enabled:
+        return _NULL_TIMER
+    return _Timer(name)
+
+
+def timed(name):
+    """
+    Decorator timing every call of a function under a name.
+
+    Args:
+        name (str): Timer name
+
+    Returns:
+        callable: Decorator
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record_time(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def record_time(name, seconds):
+    """Add a measured duration to a timer, when enabled"""
+    if not _enabled:
+        return
+    with _lock:
+        stats = _timers.get(name)
+        if stats is None:
+            stats = _timers[name] = _TimerStats()
+        stats.add(seconds)
+
+
+def count(name, amount=1):
+    """Add to a counter, when enabled"""
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+
+
+def gauge(name, value):
+    """Set a gauge to its latest value, when enabled"""
+    if not _enabled:
+        return
+    with _lock:
+        _gauges[name] = value
+
+
+def snapshot():
+    """
+    Get the collected values.
+
+    Returns:
+        dict: enabled flag, elapsed seconds since enabled or reset, and
+            "timers" (name -> count, total/mean/min/max and p50/p90/p99 in
+            milliseconds), "counters" (name -> value) and "gauges"
+            (name -> latest value)
+    """
+    with _lock:
+        return {
+            'enabled': _enabled,
+            'elapsed_s': time.time() - _started,
+            'timers': {name: stats.summary() for name, stats in sorted(_timers.items())},
+            'counters': dict(sorted(_counters.items())),
+            'gauges': dict(sorted(_gauges.items())),
+        }
+
+
+def dump(path=None):
+    """
+    Write a snapshot as JSON.
+
+    Args:
+        path (str): Output file, or None for stderr
+
+    Returns:
+        dict: The snapshot written
+    """
+    data = snapshot()
+    text = json.dumps(data, indent=2)
+    if path:
+        with open(path, 'w', encoding='utf-8') as output_file:
+            output_file.write(text + '\n')
+    else:
+        print(text, file=sys.stderr)
+    return data
+
+
+def _enable_from_environment():
+    """Enable from COLOR_PICKER_INSTRUMENT and dump at interpreter exit"""
+    value = os.environ.get(ENV_VARIABLE, '').strip()
+    if value.lower() in ('', '0', 'false', 'no', 'off'):
+        return
+    path = None if value.lower() in ('1', 'true', 'yes', 'on') else value
+    enable()
+    atexit.register(dump, path)
+
+
+_enable_from_environment()
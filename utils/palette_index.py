@@ -0,0 +1,405 @@
+"""
+Compiled palette index for fast nearest-color lookups.
+
+A palette is compiled once into contiguous NumPy arrays (RGB values plus
+aligned CSS and simple names) so nearest-name queries become a single
+vectorized distance pass instead of a Python loop over every color.
+Matching uses Euclidean RGB distance by default, or a perceptual CIELAB
+metric (CIE76 or CIEDE2000) against the palette's precomputed Lab values.
+"""
+
+import os
+import tempfile
+
+import numpy as np
+
+from .color_space import rgb_to_lab, rgb_to_lab_array
+from .delta_e import check_metric, get_delta_e_function
+
+
+# Candidate grid cells are (1 << _GRID_SHIFT) RGB units wide per channel
+_GRID_SHIFT = 2
+_GRID_LEVELS = 256 >> _GRID_SHIFT
+
+# Colors per block in perceptual batch matching; a block's (colors, entries)
+# distance matrix stays around a few megabytes
+_PERCEPTUAL_BLOCK = 4096
+
+
+class PaletteIndex:
+    """
+    Deduplicated palette stored as contiguous arrays.
+
+    Entries are kept in (simple_name, name) order so that, for equal
+    distances, the position in the arrays is the tie-break order used by
+    the original sort-based matcher.
+    """
+
+    def __init__(self, names, rgb_values, simple_names, name=None):
+        """
+        Args:
+            names (list): Palette color names
+            rgb_values (list): RGB tuples (r, g, b) aligned with names
+            simple_names (list): Simple color category aligned with names
+            name (str): Palette name, if known
+        """
+        if not (len(names) == len(rgb_values) == len(simple_names)):
+            raise ValueError("names, rgb_values and simple_names must have the same length")
+
+        # Drop duplicate RGB values, keeping the first name seen
+        entries = []
+        seen_rgb = set()
+        for name, rgb, simple_name in zip(names, rgb_values, simple_names):
+            rgb_tuple = tuple(int(c) for c in rgb)
+            if rgb_tuple in seen_rgb:
+                continue
+            seen_rgb.add(rgb_tuple)
+            entries.append((simple_name, name, rgb_tuple))
+        entries.sort()
+
+        self._set_tables(
+            np.array([e[1] for e in entries], dtype=object),
+            np.ascontiguousarray([e[2] for e in entries], dtype=np.uint8).reshape(-1, 3),
+            np.array([e[0] for e in entries], dtype=object),
+        )
+        self.name = name
+
+    def _set_tables(self, names, rgb, simple_names, lab=None):
+        """Set the lookup tables from deduplicated entries in (simple_name, name) order"""
+        self.simple_names = simple_names
+        self.names = names
+        self.rgb = rgb
+        # Set by PaletteRegistry: candidate grids built later are added to this cache file
+        self.cache_path = None
+        self._rgb_int = self.rgb.astype(np.int64)
+        self._channels = tuple(np.ascontiguousarray(self.rgb[:, c], dtype=np.int32) for c in range(3))
+        self._rank = np.arange(len(names), dtype=np.int64)
+        # Entry indices (and per-cell candidate counts) fit int16 for typical
+        # palettes; larger user palettes switch to int32
+        self.index_dtype = np.int16 if len(names) <= np.iinfo(np.int16).max else np.int32
+        self._grids = {}
+        self.lab = rgb_to_lab_array(self.rgb) if lab is None else lab
+
+        # Simple names are also exposed as ids into a sorted vocabulary
+        self.simple_vocabulary = tuple(sorted(set(self.simple_names)))
+        self.simple_ids = np.searchsorted(self.simple_vocabulary, self.simple_names).astype(self.index_dtype)
+
+        # The compiled tables are shared by every lookup, so freeze them
+        for table in (self.simple_names, self.names, self.rgb, self.lab, self.simple_ids):
+            table.setflags(write=False)
+
+    def __len__(self):
+        return len(self.names)
+
+    def save(self, path):
+        """
+        Write the compiled palette, including built candidate grids, to an .npz file.
+
+        Args:
+            path: Output path or binary file object
+        """
+        arrays = {
+            'names': self.names.astype(str),
+            'rgb': self.rgb,
+            'simple_names': self.simple_names.astype(str),
+            'lab': self.lab,
+            'name': np.array(self.name or ''),
+        }
+        for top_n, (grid, counts) in self._grids.items():
+            arrays[f'grid_{top_n}'] = grid
+            arrays[f'counts_{top_n}'] = counts
+        np.savez(path, **arrays)
+
+    def save_atomic(self, path):
+        """
+        Write save() output to a temporary file and rename it into place.
+
+        Several processes may write the same cache file at once, so each
+        uses its own temporary file; whichever rename lands last wins. A
+        failed write is ignored, as the file is only a cache.
+
+        Args:
+            path (str): Output path
+        """
+        directory = os.path.dirname(path)
+        partial_path = None
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, partial_path = tempfile.mkstemp(dir=directory, prefix='.partial-', suffix='.npz')
+            with os.fdopen(fd, 'wb') as cache_file:
+                self.save(cache_file)
+            os.replace(partial_path, path)
+            partial_path = None
+        except OSError:
+            pass
+        finally:
+            if partial_path is not None:
+                try:
+                    os.remove(partial_path)
+                except OSError:
+                    pass
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a palette saved with save(), without recompiling it.
+
+        Args:
+            path (str): Path of the .npz file
+
+        Returns:
+            PaletteIndex: Compiled palette
+        """
+        palette = cls.__new__(cls)
+        with np.load(path) as data:
+            palette._set_tables(data['names'].astype(object), data['rgb'], data['simple_names'].astype(object),
+                                data['lab'])
+            palette.name = str(data['name']) or None
+            for key in data.files:
+                if key.startswith('grid_'):
+                    top_n = int(key[5:])
+                    palette._grids[top_n] = (data[key], data[f'counts_{top_n}'])
+        return palette
+
+    def top_matches(self, rgb, top_n=3, metric='rgb'):
+        """
+        Get the top N closest palette entries to an RGB color.
+
+        Args:
+            rgb (tuple): RGB tuple (r, g, b) to match
+            top_n (int): Number of top matches to return
+            metric (str): 'rgb', 'cie76' or 'ciede2000'
+
+        Returns:
+            list: List of (simple_name, name, distance) tuples, closest first
+        """
+        check_metric(metric)
+        top_n = min(top_n, len(self))
+        if top_n <= 0:
+            return []
+        if metric != 'rgb':
+            return self._top_matches_perceptual(rgb, top_n, metric)
+
+        target = np.asarray(rgb, dtype=np.int64)
+        diff = self._rgb_int - target
+        distance_sq = np.einsum('ij,ij->i', diff, diff)
+
+        # Squared distances are exact integers, so packing the tie-break
+        # rank into the low digits gives a strict total order
+        keys = distance_sq * len(self) + self._rank
+        if top_n < len(self):
+            candidates = np.argpartition(keys, top_n - 1)[:top_n]
+        else:
+            candidates = self._rank
+        best = candidates[np.argsort(keys[candidates])]
+
+        return [(self.simple_names[i], self.names[i], int(distance_sq[i]) ** 0.5) for i in best]
+
+    def _top_matches_perceptual(self, rgb, top_n, metric):
+        target = np.array(rgb_to_lab(*rgb))
+        distances = get_delta_e_function(metric)(self.lab, target)
+        # Stable sort keeps palette (rank) order on equal distances
+        best = np.argsort(distances, kind='stable')[:top_n]
+        return [(self.simple_names[i], self.names[i], float(distances[i])) for i in best]
+
+    def batch_top_matches(self, pixels, top_n=1, chunk_size=1 << 16, metric='rgb'):
+        """
+        Get the top N closest palette entries for every pixel of an array.
+
+        Pixels are processed in chunks so temporary memory stays bounded
+        regardless of input size.
+
+        Args:
+            pixels (numpy.ndarray): uint8 array of shape (..., 3)
+            top_n (int): Number of top matches per pixel
+            chunk_size (int): Number of pixels processed at once
+            metric (str): 'rgb', 'cie76' or 'ciede2000'
+
+        Returns:
+            tuple: (indices, distances) arrays of shape (..., top_n) where
+                indices are palette entry indices (index_dtype), closest first
+        """
+        check_metric(metric)
+        pixels = np.asarray(pixels)
+        if pixels.shape[-1:] != (3,):
+            raise ValueError("pixels must have shape (..., 3)")
+        top_n = min(top_n, len(self))
+        if top_n <= 0:
+            raise ValueError("top_n must be at least 1")
+
+        if pixels.dtype != np.uint8:
+            if pixels.size and (pixels.min() < 0 or pixels.max() > 255):
+                raise ValueError("pixel values must be in the 0-255 range")
+            pixels = pixels.astype(np.uint8)
+
+        lead_shape = pixels.shape[:-1]
+        flat = pixels.reshape(-1, 3)
+        indices = np.empty((len(flat), top_n), dtype=self.index_dtype)
+        distances = np.empty((len(flat), top_n), dtype=np.float32)
+
+        for start in range(0, len(flat), chunk_size):
+            stop = start + chunk_size
+            if metric != 'rgb':
+                indices[start:stop], distances[start:stop] = self._match_chunk_perceptual(
+                    flat[start:stop], top_n, metric)
+                continue
+            chunk_indices, chunk_distance_sq = self._match_chunk(flat[start:stop], top_n)
+            indices[start:stop] = chunk_indices
+            np.sqrt(chunk_distance_sq, out=distances[start:stop], dtype=np.float32)
+
+        return indices.reshape(lead_shape + (top_n,)), distances.reshape(lead_shape + (top_n,))
+
+    def _match_chunk(self, pixels, top_n):
+        """Match a chunk of uint8 pixels using the candidate grid"""
+        grid, counts = self._candidate_grid(top_n)
+        red = pixels[:, 0].astype(np.int32)
+        green = pixels[:, 1].astype(np.int32)
+        blue = pixels[:, 2].astype(np.int32)
+        cells = ((red >> _GRID_SHIFT) * _GRID_LEVELS + (green >> _GRID_SHIFT)) * _GRID_LEVELS + (blue >> _GRID_SHIFT)
+        cell_counts = counts.take(cells)
+
+        indices = np.empty((len(pixels), top_n), dtype=self.index_dtype)
+        distance_sq = np.empty((len(pixels), top_n), dtype=np.int32)
+
+        # Pixels are grouped by candidate count so each group is a dense block
+        groups = np.flatnonzero(np.bincount(cell_counts))
+        for count in groups:
+            if len(groups) == 1:
+                selected = slice(None)
+            else:
+                selected = np.flatnonzero(cell_counts == count)
+            group_cells = cells[selected]
+            group_rgb = (red[selected], green[selected], blue[selected])
+
+            # Candidate columns are in rank order, so a strict comparison
+            # keeps the lowest rank on distance ties
+            if top_n == 1:
+                best = grid[0].take(group_cells)
+                best_sq = self._distance_sq_to(best, group_rgb)
+                for column in range(1, count):
+                    candidate = grid[column].take(group_cells)
+                    candidate_sq = self._distance_sq_to(candidate, group_rgb)
+                    closer = candidate_sq < best_sq
+                    np.copyto(best, candidate, where=closer)
+                    np.copyto(best_sq, candidate_sq, where=closer)
+                indices[selected, 0] = best
+                distance_sq[selected, 0] = best_sq
+                continue
+
+            candidates = np.empty((len(group_cells), count), dtype=self.index_dtype)
+            candidate_sq = np.empty((len(group_cells), count), dtype=np.int32)
+            for column in range(count):
+                candidates[:, column] = grid[column].take(group_cells)
+                candidate_sq[:, column] = self._distance_sq_to(candidates[:, column], group_rgb)
+            keys = candidate_sq.astype(np.int64) * len(self) + candidates
+            best = np.argsort(keys, axis=1)[:, :top_n]
+            indices[selected] = np.take_along_axis(candidates, best, axis=1)
+            distance_sq[selected] = np.take_along_axis(candidate_sq, best, axis=1)
+
+        return indices, distance_sq
+
+    def _match_chunk_perceptual(self, pixels, top_n, metric):
+        """
+        Match a chunk of uint8 pixels with a perceptual metric.
+
+        Repeated colors are matched once, then every unique color is
+        compared against the whole palette's Lab table.
+        """
+        packed = (pixels[:, 0].astype(np.int32) << 16) | (pixels[:, 1].astype(np.int32) << 8) | pixels[:, 2]
+        unique_packed, inverse = np.unique(packed, return_inverse=True)
+        unique_rgb = np.stack([unique_packed >> 16, (unique_packed >> 8) & 0xFF, unique_packed & 0xFF], axis=1)
+        unique_lab = rgb_to_lab_array(unique_rgb)
+        delta_e = get_delta_e_function(metric)
+
+        indices = np.empty((len(unique_lab), top_n), dtype=self.index_dtype)
+        distances = np.empty((len(unique_lab), top_n), dtype=np.float64)
+        for start in range(0, len(unique_lab), _PERCEPTUAL_BLOCK):
+            stop = start + _PERCEPTUAL_BLOCK
+            block = delta_e(unique_lab[start:stop, None, :], self.lab[None, :, :])
+            # argmin and a stable sort both keep palette (rank) order on ties
+            if top_n == 1:
+                best = np.argmin(block, axis=1)[:, None]
+            else:
+                best = np.argsort(block, axis=1, kind='stable')[:, :top_n]
+            indices[start:stop] = best
+            distances[start:stop] = np.take_along_axis(block, best, axis=1)
+
+        return indices[inverse], distances[inverse]
+
+    def _distance_sq_to(self, entries, rgb):
+        """Squared distance from each (red, green, blue) column to its palette entry"""
+        total = None
+        for channel, values in zip(self._channels, rgb):
+            diff = channel.take(entries) - values
+            diff *= diff
+            if total is None:
+                total = diff
+            else:
+                total += diff
+        return total
+
+    def _candidate_grid(self, top_n):
+        """
+        Get the candidate table for top-N queries, building it on first use.
+
+        The RGB cube is split into coarse cells; each cell lists (in rank
+        order) every palette entry that can be among the top N for some
+        color inside it. An entry qualifies when its minimum distance to the
+        cell is no larger than the N-th smallest maximum distance.
+
+        Returns:
+            tuple: (grid, counts) where grid is an index_dtype array of shape
+                (max_candidates, cells) and counts the candidates per cell
+        """
+        if top_n in self._grids:
+            return self._grids[top_n]
+
+        palette = self._rgb_int
+        cell_size = 1 << _GRID_SHIFT
+        low = (np.arange(_GRID_LEVELS) * cell_size)[:, None]
+        high = low + cell_size - 1
+
+        # Per-channel squared distance bounds, shape (levels, entries);
+        # int32 holds any squared RGB distance
+        min_sq = []
+        max_sq = []
+        for channel in range(3):
+            value = palette[:, channel][None, :]
+            below = np.clip(low - value, 0, None)
+            above = np.clip(value - high, 0, None)
+            min_sq.append(((below + above) ** 2).astype(np.int32))
+            max_sq.append(np.maximum((value - low) ** 2, (value - high) ** 2).astype(np.int32))
+
+        # Qualifying entries are collected per red slab as (cell, entry)
+        # pairs; nonzero() yields them in rank order within each cell
+        slab_cells = _GRID_LEVELS * _GRID_LEVELS
+        counts = np.empty(_GRID_LEVELS * slab_cells, dtype=self.index_dtype)
+        cell_ids = []
+        entry_ids = []
+        for r_level in range(_GRID_LEVELS):
+            min_block = (min_sq[0][r_level][None, None, :] + min_sq[1][:, None, :]
+                         + min_sq[2][None, :, :]).reshape(-1, len(self))
+            max_block = (max_sq[0][r_level][None, None, :] + max_sq[1][:, None, :]
+                         + max_sq[2][None, :, :]).reshape(-1, len(self))
+            bound = np.partition(max_block, top_n - 1, axis=1)[:, top_n - 1]
+            cells, entries = np.nonzero(min_block <= bound[:, None])
+            counts[r_level * slab_cells:(r_level + 1) * slab_cells] = np.bincount(cells, minlength=slab_cells)
+            cell_ids.append(cells.astype(np.int32) + r_level * slab_cells)
+            entry_ids.append(entries.astype(self.index_dtype))
+        cell_ids = np.concatenate(cell_ids)
+        entry_ids = np.concatenate(entry_ids)
+
+        # Slot of each pair within its cell; stored column-major so each
+        # candidate slot is contiguous. Unused slots repeat the first
+        # candidate, which never changes a result.
+        starts = np.cumsum(counts, dtype=np.int64) - counts
+        slots = np.arange(len(cell_ids)) - starts[cell_ids]
+        grid = np.empty((counts.max(), len(counts)), dtype=self.index_dtype)
+        grid[:] = entry_ids[starts]
+        grid[slots, cell_ids] = entry_ids
+
+        self._grids[top_n] = (grid, counts)
+        if self.cache_path:
+            # The grid is the expensive part of a large palette; keep it
+            self.save_atomic(self.cache_path)
+        return grid, counts
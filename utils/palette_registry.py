@@ -0,0 +1,360 @@
+"""
+Registry of named color palettes for nearest-name lookups.
+
+The built-in CSS3 palette is always available as "css3". Further palettes
+(brand colors, X11 or other extended sets) are loaded from JSON or GIMP
+.gpl files and compiled into the same PaletteIndex arrays. Compiled
+palettes are cached on disk keyed by the file's content hash, so editing
+a palette file invalidates its cache entry automatically. A cache hit skips
+parsing and compiling entirely: the cache holds the compiled tables and
+every candidate grid built so far.
+
+JSON palettes may be a list of entries or a {"name": ..., "colors": ...}
+object. Colors are either a list of entries or a name -> color mapping;
+a color is "#rrggbb", "#rgb" or [r, g, b], and an entry is an object with
+"name", "hex" or "rgb", and an optional "simple" name. Entries without a
+simple name get the simple name of their nearest CSS3 color.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+
+import numpy as np
+
+from .palette_index import PaletteIndex
+
+
+DEFAULT_PALETTE = 'css3'
+
+# Bump when the parsing or simple-name rules change, to invalidate caches
+PALETTE_CACHE_VERSION = 3
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+class PaletteRegistry:
+    """
+    Named palettes plus the active palette used when a lookup names none.
+
+    Palettes can be registered as compiled PaletteIndex objects or as
+    functions that build one on first use. All methods are thread-safe.
+    """
+
+    def __init__(self, cache_dir=None):
+        """
+        Args:
+            cache_dir (str): Root directory for compiled palette caches,
+                defaults to utils.color_lut.get_cache_dir()
+        """
+        self.cache_dir = cache_dir
+        self._lock = threading.RLock()
+        self._palettes = {}
+        self._factories = {}
+        self._active = DEFAULT_PALETTE
+
+    def register(self, name, palette):
+        """
+        Add or replace a palette.
+
+        Args:
+            name (str): Palette name
+            palette: PaletteIndex, or a function with no arguments returning one
+        """
+        with self._lock:
+            self._palettes.pop(name, None)
+            self._factories.pop(name, None)
+            if isinstance(palette, PaletteIndex):
+                self._palettes[name] = palette
+            else:
+                self._factories[name] = palette
+
+    def load_file(self, path, name=None, use_cache=True):
+        """
+        Load a JSON or .gpl palette file and register it.
+
+        Args:
+            path (str): Palette file path
+            name (str): Registered name, defaults to the name inside the file
+                or the file name
+            use_cache (bool): Read and write the compiled on-disk cache
+
+        Returns:
+            str: Registered palette name
+        """
+        with open(path, 'rb') as palette_file:
+            content = palette_file.read()
+
+        cache_path = self.get_cache_path(content, path) if use_cache else None
+        palette = _load_cache(cache_path) if cache_path else None
+        if palette is None:
+            file_name, names, rgb_values, simple_names = parse_palette(content, path)
+            palette = compile_palette(names, rgb_values, simple_names)
+            palette.name = file_name
+            if cache_path:
+                palette.save_atomic(cache_path)
+        palette.cache_path = cache_path
+
+        name = name or palette.name
+        self.register(name, palette)
+        return name
+
+    def get_cache_path(self, content, path=''):
+        """
+        Get the cache file of a palette file's contents.
+
+        The cached palette keeps the name it was loaded under, which falls
+        back to the file name, so that name is part of the key too.
+
+        Args:
+            content (bytes): Raw palette file contents
+            path (str): Palette file path
+
+        Returns:
+            str: Path of the compiled .npz cache
+        """
+        if self.cache_dir:
+            cache_dir = self.cache_dir
+        else:
+            from .color_lut import get_cache_dir
+            cache_dir = get_cache_dir()
+        digest = hashlib.sha256(content)
+        digest.update(f"\ndefault name\t{_default_name(path)}".encode())
+        digest = digest.hexdigest()[:16]
+        return os.path.join(cache_dir, f"palettes-v{PALETTE_CACHE_VERSION}", f"{digest}.npz")
+
+    def get(self, name=None):
+        """
+        Get a compiled palette, building it on first use.
+
+        Args:
+            name (str): Palette name, defaults to the active palette
+
+        Returns:
+            PaletteIndex: Compiled palette
+        """
+        with self._lock:
+            name = name or self._active
+            palette = self._palettes.get(name)
+            if palette is None:
+                if name not in self._factories:
+                    raise KeyError(f"unknown palette {name!r}")
+                palette = self._palettes[name] = self._factories.pop(name)()
+            return palette
+
+    def names(self):
+        """Registered palette names, sorted"""
+        with self._lock:
+            return sorted(set(self._palettes) | set(self._factories))
+
+    @property
+    def active(self):
+        """Name of the palette used when a lookup names none"""
+        return self._active
+
+    def set_active(self, name):
+        """
+        Select the palette used when a lookup names none.
+
+        Args:
+            name (str): Registered palette name
+        """
+        with self._lock:
+            if name not in self._palettes and name not in self._factories:
+                raise KeyError(f"unknown palette {name!r}")
+            self._active = name
+
+
+def _load_cache(cache_path):
+    """Load a cached palette, or None if it is missing or unreadable (it is then rebuilt and rewritten)"""
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        return PaletteIndex.load(cache_path)
+    except Exception:
+        return None
+
+
+
+def get_palette_registry():
+    """
+    Get the shared registry, creating it with the built-in CSS3 palette.
+
+    Returns:
+        PaletteRegistry: Shared registry
+    """
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            from .comparisonEngine import get_css3_palette
+            _registry = PaletteRegistry()
+            _registry.register(DEFAULT_PALETTE, get_css3_palette)
+        return _registry
+
+
+def get_palette(palette=None):
+    """
+    Resolve a palette argument to a compiled palette.
+
+    Args:
+        palette: PaletteIndex, registered name, or None for the active palette
+
+    Returns:
+        PaletteIndex: Compiled palette
+    """
+    if isinstance(palette, PaletteIndex):
+        return palette
+    return get_palette_registry().get(palette)
+
+
+def load_palette_file(path, name=None, use_cache=True):
+    """Load a palette file into the shared registry; see PaletteRegistry.load_file"""
+    return get_palette_registry().load_file(path, name, use_cache)
+
+
+def set_active_palette(name):
+    """Select the shared registry's active palette by name"""
+    get_palette_registry().set_active(name)
+
+
+def get_active_palette_name():
+    """Name of the shared registry's active palette"""
+    return get_palette_registry().active
+
+
+def parse_palette(content, path=''):
+    """
+    Parse palette file contents.
+
+    Args:
+        content (bytes): Raw file contents
+        path (str): File path, used for the format and default name
+
+    Returns:
+        tuple: (palette_name, names, rgb_values, simple_names) where
+            simple_names has None for entries without one
+    """
+    text = content.decode('utf-8-sig')
+    default_name = _default_name(path)
+    if path.lower().endswith('.gpl') or text.startswith('GIMP Palette'):
+        return _parse_gpl(text, default_name)
+    return _parse_json(text, default_name)
+
+
+def compile_palette(names, rgb_values, simple_names):
+    """
+    Compile parsed entries, filling in missing simple names.
+
+    Entries without a simple name use the CSS3 mapping when their name is a
+    CSS3 color, otherwise the simple name of the nearest CSS3 color.
+
+    Returns:
+        PaletteIndex: Compiled palette
+    """
+    if not names:
+        raise ValueError("palette has no colors")
+
+    from .comparisonEngine import CSS_TO_SIMPLE, get_css3_palette
+    missing = [i for i, simple_name in enumerate(simple_names) if not simple_name]
+    if missing:
+        css3 = get_css3_palette()
+        nearest = css3.simple_names[np.argmin(
+            ((np.asarray([rgb_values[i] for i in missing], dtype=np.int64)[:, None, :]
+              - css3.rgb.astype(np.int64)[None, :, :]) ** 2).sum(axis=2), axis=1)]
+        simple_names = list(simple_names)
+        for i, nearest_name in zip(missing, nearest):
+            key = re.sub(r'[\s_-]', '', names[i].lower())
+            simple_names[i] = CSS_TO_SIMPLE.get(key, nearest_name)
+    return PaletteIndex(names, rgb_values, simple_names)
+
+
+def _parse_gpl(text, default_name):
+    """GIMP palette: header, optional Name/Columns lines, then "R G B name" rows"""
+    lines = text.splitlines()
+    if not lines or lines[0].strip() != 'GIMP Palette':
+        raise ValueError("not a GIMP palette: missing 'GIMP Palette' header")
+
+    palette_name = default_name
+    names, rgb_values = [], []
+    for line_number, line in enumerate(lines[1:], 2):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        if line.startswith('Name:'):
+            palette_name = line[5:].strip() or palette_name
+            continue
+        if line.startswith('Columns:'):
+            continue
+        parts = line.split(None, 3)
+        try:
+            rgb = _check_rgb([int(part) for part in parts[:3]])
+        except ValueError:
+            raise ValueError(f"line {line_number}: expected 'R G B name', got {line!r}")
+        names.append(parts[3].strip() if len(parts) > 3 and parts[3].strip() else _hex_name(rgb))
+        rgb_values.append(rgb)
+    return palette_name, names, rgb_values, [None] * len(names)
+
+
+def _default_name(path):
+    """Palette name used when the file does not name one"""
+    return os.path.splitext(os.path.basename(path))[0] or 'palette'
+
+
+def _parse_json(text, default_name):
+    data = json.loads(text)
+    palette_name = default_name
+    if isinstance(data, dict) and 'colors' in data:
+        palette_name = _optional_string(data, 'name') or palette_name
+        data = data['colors']
+
+    if isinstance(data, dict):
+        entries = [{'name': name, 'color': color} for name, color in data.items()]
+    elif isinstance(data, list):
+        entries = data
+    else:
+        raise ValueError("JSON palette must be a list or an object of colors")
+
+    names, rgb_values, simple_names = [], [], []
+    for entry in entries:
+        if not isinstance(entry, dict):
+            entry = {'color': entry}
+        color = entry.get('hex', entry.get('rgb', entry.get('color')))
+        rgb = _parse_color(color)
+        names.append(_optional_string(entry, 'name') or _hex_name(rgb))
+        rgb_values.append(rgb)
+        simple_names.append(_optional_string(entry, 'simple'))
+    return palette_name, names, rgb_values, simple_names
+
+
+def _optional_string(entry, key):
+    value = entry.get(key)
+    if value is not None and not isinstance(value, str):
+        raise ValueError(f"{key!r} must be a string, got {value!r}")
+    return value
+
+
+def _parse_color(color):
+    """Parse "#rrggbb", "#rgb" or [r, g, b]"""
+    if isinstance(color, str):
+        hex_digits = color.strip().lstrip('#')
+        if len(hex_digits) == 3:
+            hex_digits = ''.join(digit * 2 for digit in hex_digits)
+        if len(hex_digits) != 6:
+            raise ValueError(f"invalid hex color {color!r}")
+        return _check_rgb([int(hex_digits[i:i + 2], 16) for i in (0, 2, 4)])
+    if isinstance(color, (list, tuple)) and len(color) == 3:
+        return _check_rgb([int(component) for component in color])
+    raise ValueError(f"invalid color {color!r}")
+
+
+def _check_rgb(rgb):
+    if len(rgb) != 3 or not all(0 <= component <= 255 for component in rgb):
+        raise ValueError(f"RGB components must be three values in 0-255, got {rgb!r}")
+    return tuple(rgb)
+
+
+def _hex_name(rgb):
+    return '#{:02x}{:02x}{:02x}'.format(*rgb)
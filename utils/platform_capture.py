@@ -4,14 +4,37 @@ Optimizes screen capture methods based on the operating system
 """
 
 import platform
+import threading
 import time
 from PIL import Image, ImageGrab
 from typing import Tuple, Optional
 
+from .instrumentation import timed, count
+from .region_sampling import DEFAULT_REGION_SIZE, DEFAULT_TRIM_FRACTION, sample_region
+
 class PlatformScreenCapture:
     def __init__(self):
         self.os_type = self.detect_os()
         self.capture_method = self.get_optimal_capture_method()
+        # MSS sessions hold a display connection and are not thread-safe, so
+        # each thread keeps its own and closes it itself
+        self._mss_local = threading.local()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+    
+    def close(self):
+        """
+        Close the calling thread's capture session; a later capture opens a new one.
+
+        Sessions of other threads belong to those threads, which close them
+        with release_thread_session before they exit.
+        """
+        self._drop_mss_session()
         
     def detect_os(self) -> str:
         """Detect the current operating system"""
@@ -59,6 +82,7 @@ class PlatformScreenCapture:
             except ImportError:
                 return 'pil'
     
+    @timed('capture.capture_screen_area')
     def capture_screen_area(self, x: int, y: int, capture_size: int = 15) -> Optional[Image.Image]:
         """
         Capture a screen area around the specified coordinates
@@ -75,28 +99,125 @@ class PlatformScreenCapture:
                 return self._capture_with_pil(x, y, capture_size)
         except Exception as e:
             print(f"Screen capture failed with {self.capture_method}: {e}")
+            count('capture.capture_screen_area.fallback')
             # Try fallback method
             return self._capture_fallback(x, y, capture_size)
     
+    @timed('capture.capture_rectangle')
+    def capture_rectangle(self, left: int, top: int, width: int, height: int) -> Optional[Image.Image]:
+        """
+        Capture an arbitrary screen rectangle, e.g. for region analysis
+        Uses MSS when available, otherwise PIL ImageGrab, then pyautogui
+        Returns PIL Image or None if capture fails
+        """
+        try:
+            if self.capture_method == 'mss':
+                # Only the part of the rectangle that is on screen can be grabbed
+                monitor = self._fit_to_virtual_screen({"top": top, "left": left, "width": width, "height": height},
+                                                      keep_size=False)
+                if monitor is None:
+                    return None
+                screenshot_mss = self._mss_grab(monitor)
+                return Image.frombytes("RGB", screenshot_mss.size, screenshot_mss.bgra, "raw", "BGRX")
+            # ImageGrab uses the native APIs on macOS and Windows
+            bbox = (left, top, left + width, top + height)
+            try:
+                return ImageGrab.grab(bbox=bbox, all_screens=True)
+            except Exception:
+                return ImageGrab.grab(bbox=bbox)
+        except Exception as e:
+            print(f"Rectangle capture failed with {self.capture_method}: {e}")
+            count('capture.capture_rectangle.fallback')
+            try:
+                import pyautogui
+                return pyautogui.screenshot(region=(left, top, width, height))
+            except Exception as e:
+                print(f"Fallback capture failed: {e}")
+                return None
+    
+    def _get_mss_session(self):
+        """The calling thread's MSS session, opened on first use"""
+        session = getattr(self._mss_local, 'session', None)
+        if session is None:
+            import mss
+            session = mss.mss()
+            self._mss_local.session = session
+            # Virtual desktop bounds, read once per connection
+            self._mss_local.virtual_screen = dict(session.monitors[0])
+            count('capture.mss.connect')
+        return session
+    
+    def release_thread_session(self):
+        """Close the calling thread's capture session; call before a capturing thread exits"""
+        self._drop_mss_session()
+    
+    def _drop_mss_session(self):
+        """Close the calling thread's session, e.g. after the display connection failed"""
+        session = getattr(self._mss_local, 'session', None)
+        if session is None:
+            return
+        self._mss_local.session = None
+        try:
+            session.close()
+        except Exception:
+            pass
+    
+    def _mss_grab(self, monitor: dict):
+        """Grab with the thread's session, reconnecting once if the grab fails"""
+        try:
+            return self._get_mss_session().grab(monitor)
+        except Exception:
+            count('capture.mss.reconnect')
+            self._drop_mss_session()
+            return self._get_mss_session().grab(monitor)
+    
+    def get_virtual_screen(self) -> Optional[dict]:
+        """Bounds of the virtual desktop (left, top, width, height) from the MSS session, or None"""
+        if self.capture_method != 'mss':
+            return None
+        self._get_mss_session()
+        return self._mss_local.virtual_screen
+    
+    def _fit_to_virtual_screen(self, monitor: dict, keep_size: bool) -> Optional[dict]:
+        """
+        Move a grab box onto the virtual desktop, where grabs cannot fail.
+
+        With keep_size the box is shifted inside the desktop, as the
+        pyautogui fallback does at screen edges; otherwise it is clipped to
+        the desktop, giving None if nothing of it is on screen.
+        """
+        screen = self.get_virtual_screen()
+        if not screen:
+            return monitor
+        screen_right = screen["left"] + screen["width"]
+        screen_bottom = screen["top"] + screen["height"]
+        if keep_size:
+            width = min(monitor["width"], screen["width"])
+            height = min(monitor["height"], screen["height"])
+            left = max(screen["left"], min(monitor["left"], screen_right - width))
+            top = max(screen["top"], min(monitor["top"], screen_bottom - height))
+        else:
+            left = max(monitor["left"], screen["left"])
+            top = max(monitor["top"], screen["top"])
+            width = min(monitor["left"] + monitor["width"], screen_right) - left
+            height = min(monitor["top"] + monitor["height"], screen_bottom) - top
+            if width <= 0 or height <= 0:
+                return None
+        return {"top": top, "left": left, "width": width, "height": height}
+    
     def _capture_with_mss(self, x: int, y: int, capture_size: int) -> Image.Image:
         """Capture using MSS library (preferred for macOS/Linux)"""
-        import mss
-        
         half_size = capture_size // 2
+        monitor = {
+            "top": y - half_size,
+            "left": x - half_size,
+            "width": capture_size,
+            "height": capture_size
+        }
         
-        with mss.mss() as sct:
-            monitor = {
-                "top": y - half_size,
-                "left": x - half_size,
-                "width": capture_size,
-                "height": capture_size
-            }
-            
-            # MSS captures all monitors as one virtual desktop
-            screenshot_mss = sct.grab(monitor)
-            screenshot = Image.frombytes("RGB", screenshot_mss.size, screenshot_mss.bgra, "raw", "BGRX")
-            
-        return screenshot
+        # MSS captures all monitors as one virtual desktop
+        screenshot_mss = self._mss_grab(self._fit_to_virtual_screen(monitor, keep_size=True))
+        return Image.frombytes("RGB", screenshot_mss.size, screenshot_mss.bgra, "raw", "BGRX")
     
     def _capture_with_pyobjc(self, x: int, y: int, capture_size: int) -> Image.Image:
         """Capture using PyObjC (native macOS)"""
@@ -235,6 +356,7 @@ class PlatformScreenCapture:
             print(f"Fallback capture failed: {e}")
             return None
     
+    @timed('capture.get_pixel_color')
     def get_pixel_color(self, x: int, y: int, magnifier_size: int = 21) -> Tuple[int, int, int]:
         """Get the color of a single pixel at the specified coordinates
         
@@ -269,18 +391,36 @@ class PlatformScreenCapture:
                 return self._get_pixel_fallback(x, y)
         except Exception:
             # Fallback to pyautogui
+            count('capture.get_pixel_color.fallback')
             return self._get_pixel_fallback(x, y)
     
+    @timed('capture.sample_region')
+    def sample_region(self, x: int, y: int, size: int = DEFAULT_REGION_SIZE,
+                      trim_fraction: float = DEFAULT_TRIM_FRACTION):
+        """Sample the colors of a size x size area centered on the coordinates
+        
+        The area is captured once and summarized with NumPy, giving the
+        center pixel, mean, median, trimmed mean and per-channel spread.
+        
+        Args:
+            x, y: Screen coordinates of the area center
+            size: Width and height of the area in pixels
+            trim_fraction: Fraction dropped from each end for the trimmed mean
+        
+        Returns:
+            RegionSample, or None if the capture fails
+        """
+        region = self.capture_screen_area(x, y, size)
+        if region is None:
+            return None
+        return sample_region(region, trim_fraction)
+    
     def _get_pixel_mss(self, x: int, y: int) -> Tuple[int, int, int]:
         """Get pixel color using MSS"""
-        import mss
-        
-        with mss.mss() as sct:
-            monitor = {"top": y, "left": x, "width": 1, "height": 1}
-            screenshot = sct.grab(monitor)
-            # MSS returns BGRA, we need RGB
-            bgra = screenshot.pixel(0, 0)
-            return (bgra[2], bgra[1], bgra[0])  # Convert BGRA to RGB
+        screenshot = self._mss_grab({"top": y, "left": x, "width": 1, "height": 1})
+        # MSS returns BGRA, we need RGB
+        bgra = screenshot.pixel(0, 0)
+        return (bgra[2], bgra[1], bgra[0])  # Convert BGRA to RGB
     
     def _get_pixel_pyobjc(self, x: int, y: int) -> Tuple[int, int, int]:
         """Get pixel color using PyObjC (native macOS)"""
@@ -0,0 +1,81 @@
+"""
+Motion-gated refresh scheduling for the live preview.
+
+The preview loop captures a small patch under the cursor every tick. When
+the cursor has not moved and the patch is byte-identical to the previous
+one, naming and redrawing would only repeat the last frame, so the frame
+is skipped and the loop slows down step by step towards the minimum rate.
+Cursor movement jumps straight to the maximum rate; a content change under
+a still cursor (e.g. playing video) returns to the normal rate.
+"""
+
+from . import instrumentation
+
+
+DEFAULT_MIN_RATE = 4.0
+DEFAULT_NORMAL_RATE = 20.0
+DEFAULT_MAX_RATE = 60.0
+# Interval growth per unchanged frame while idle
+IDLE_BACKOFF = 1.5
+
+
+class PreviewScheduler:
+    """
+    Decide per tick whether the preview must update, and how long to wait.
+
+    Args:
+        min_rate (float): Ticks per second when idle
+        max_rate (float): Ticks per second while the cursor moves
+        normal_rate (float): Ticks per second when only the screen changes;
+            clamped to [min_rate, max_rate]
+    """
+
+    def __init__(self, min_rate=DEFAULT_MIN_RATE, max_rate=DEFAULT_MAX_RATE, normal_rate=DEFAULT_NORMAL_RATE):
+        if not 0 < min_rate <= max_rate:
+            raise ValueError("rates must satisfy 0 < min_rate <= max_rate")
+        self.min_interval = 1.0 / min_rate
+        self.max_interval = 1.0 / max_rate
+        self.normal_interval = min(max(1.0 / normal_rate, self.max_interval), self.min_interval)
+        self.interval = self.normal_interval
+        self._position = None
+        self._patch = None
+
+    @property
+    def rate(self):
+        """Current ticks per second"""
+        return 1.0 / self.interval
+
+    def invalidate(self):
+        """Force the next frame to update, e.g. after the sampling mode changed"""
+        self._position = None
+        self._patch = None
+
+    def observe(self, position, patch):
+        """
+        Record a tick and adapt the interval.
+
+        Args:
+            position (tuple): Cursor (x, y)
+            patch (bytes): Raw bytes of the captured patch, or None if the
+                capture failed (always treated as changed)
+
+        Returns:
+            bool: True if the preview should name and redraw this frame
+        """
+        moved = position != self._position
+        changed = moved or patch is None or patch != self._patch
+        self._position = position
+        self._patch = patch
+
+        if moved:
+            self.interval = self.max_interval
+        elif changed:
+            self.interval = self.normal_interval
+        else:
+            self.interval = min(self.interval * IDLE_BACKOFF, self.min_interval)
+
+        instrumentation.count('gui.preview.frames')
+        if not changed:
+            instrumentation.count('gui.preview.skipped')
+        instrumentation.gauge('gui.preview.rate', self.rate)
+        return changed
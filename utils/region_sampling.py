@@ -0,0 +1,90 @@
+"""
+Region sampling: robust colors from an N x N screen area.
+
+A single pixel of dithered or compressed video content is noisy; the mean,
+median and trimmed mean of a small area around it are repeatable. All
+statistics come from one captured image and are computed per channel
+with NumPy.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+
+SAMPLING_MODES = ('pixel', 'mean', 'median', 'trimmed_mean')
+DEFAULT_REGION_SIZE = 5
+DEFAULT_TRIM_FRACTION = 0.1
+
+
+class RegionSample(NamedTuple):
+    """
+    Per-channel statistics of a sampled region.
+
+    Colors are RGB tuples of ints. spread is the per-channel standard
+    deviation, so a flat area has (0.0, 0.0, 0.0).
+    """
+    center: tuple
+    mean: tuple
+    median: tuple
+    trimmed_mean: tuple
+    spread: tuple
+    pixel_count: int
+
+    def color(self, mode):
+        """
+        Get the color for a sampling mode.
+
+        Args:
+            mode (str): One of SAMPLING_MODES; "pixel" is the center pixel
+
+        Returns:
+            tuple: RGB color
+        """
+        if mode == 'pixel':
+            return self.center
+        if mode not in SAMPLING_MODES:
+            raise ValueError(f"unknown sampling mode {mode!r}, expected one of {SAMPLING_MODES}")
+        return getattr(self, mode)
+
+
+def sample_region(region, trim_fraction=DEFAULT_TRIM_FRACTION):
+    """
+    Summarize the colors of a captured region.
+
+    Args:
+        region: PIL image or array of shape (height, width, 3) with RGB values
+        trim_fraction (float): Fraction of values dropped from each end of
+            every channel for the trimmed mean, in [0, 0.5)
+
+    Returns:
+        RegionSample: Center pixel, mean, median, trimmed mean and spread
+    """
+    if not 0 <= trim_fraction < 0.5:
+        raise ValueError("trim_fraction must be in [0, 0.5)")
+    if hasattr(region, 'getbands'):
+        if region.mode != 'RGB':
+            region = region.convert('RGB')
+        region = np.asarray(region)
+    pixels = np.asarray(region)
+    if pixels.ndim != 3 or pixels.shape[2] != 3 or pixels.shape[0] == 0 or pixels.shape[1] == 0:
+        raise ValueError("region must have shape (height, width, 3)")
+
+    height, width = pixels.shape[:2]
+    center = pixels[height // 2, width // 2]
+    values = np.sort(pixels.reshape(-1, 3).astype(np.float64), axis=0)
+    count = len(values)
+    trim = int(count * trim_fraction)
+
+    return RegionSample(
+        center=_to_color(center),
+        mean=_to_color(values.mean(axis=0)),
+        median=_to_color(np.median(values, axis=0)),
+        trimmed_mean=_to_color(values[trim:count - trim].mean(axis=0)),
+        spread=tuple(float(value) for value in values.std(axis=0)),
+        pixel_count=count,
+    )
+
+
+def _to_color(values):
+    return tuple(int(value) for value in np.clip(np.rint(values), 0, 255))
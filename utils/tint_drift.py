@@ -0,0 +1,186 @@
+"""
+Tint drift of a frame sequence against a still reference.
+
+Grading checks compare a reference still with exported video frames. Each
+frame's background tint (its largest dominant color) is compared with the
+reference's tint using the engine's HSL analysis, so drift is reported in
+the same wording as analyze_hue_direction_first_neutral_only, e.g.
+"neutral -> orange (+15.9deg)".
+
+Frames come from a folder of images or a multi-frame file (animated GIF,
+APNG, multi-page TIFF) and are processed as a stream: one frame at a time
+inline, or a bounded window of frames across worker processes.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+import numpy as np
+
+from .comparisonEngine import analyze_HSL_first_neutral_only
+from .dominant_colors import extract_dominant_colors
+from .image_batch import iter_image_paths
+
+
+# Dominant colors considered when picking the background, and pixels sampled
+TINT_COLOR_COUNT = 3
+TINT_SAMPLE_SIZE = 1 << 14
+
+
+class FrameDrift(NamedTuple):
+    """Tint of one frame compared with the reference tint"""
+    index: int
+    label: str
+    tint: tuple
+    distance: float
+    hue_delta: float
+    hue_text: str
+    saturation_diff: float
+    lightness_diff: float
+    clipboard_text: str
+
+
+def background_tint(image, seed=0):
+    """
+    Get the background tint of an image: its largest dominant color.
+
+    Args:
+        image: PIL image or (height, width, 3) RGB array
+        seed (int): Subsample random seed
+
+    Returns:
+        tuple: RGB color
+    """
+    return extract_dominant_colors(image, k=TINT_COLOR_COUNT, sample_size=TINT_SAMPLE_SIZE, seed=seed)[0].rgb
+
+
+def iter_frames(source):
+    """
+    Yield the frames of a sequence one at a time.
+
+    Args:
+        source (str): Directory of image files (sorted by name), or a
+            single image file; every frame of a multi-frame file is yielded
+
+    Yields:
+        tuple: (index, label, frame) where frame is a file path for
+            directory sequences (loaded by whoever computes the tint) or an
+            RGB array for frames of a multi-frame file
+    """
+    if os.path.isdir(source):
+        for index, path in enumerate(iter_image_paths([source], recursive=False)):
+            yield index, os.path.basename(path), path
+        return
+
+    from PIL import Image, ImageSequence
+    with Image.open(source) as image:
+        for index, frame in enumerate(ImageSequence.Iterator(image)):
+            yield index, f"{os.path.basename(source)}#{index}", np.asarray(frame.convert('RGB'))
+
+
+def _frame_tint(frame):
+    """Background tint of a frame given as a path or an RGB array"""
+    if isinstance(frame, str):
+        from PIL import Image
+        with Image.open(frame) as image:
+            frame = np.asarray(image.convert('RGB'))
+    return background_tint(frame)
+
+
+def _drift(index, label, tint, reference_tint, hue_threshold):
+    analysis = analyze_HSL_first_neutral_only(reference_tint, tint, hue_threshold)
+    distance = float(np.sqrt(sum((a - b) ** 2 for a, b in zip(reference_tint, tint))))
+    return FrameDrift(index, label, tint, distance, analysis.hue.delta, analysis.hue.render(),
+                      analysis.saturation_diff, analysis.lightness_diff, analysis.hue.clipboard_text())
+
+
+def analyze_tint_drift(reference, source, hue_threshold=5, workers=1):
+    """
+    Compare the background tint of every frame with a reference.
+
+    Args:
+        reference: Reference still as a file path, PIL image or RGB array
+        source (str): Frame directory or multi-frame file, see iter_frames
+        hue_threshold (float): Hue change in degrees below which hues are "same"
+        workers (int): Worker processes for the frame tints; 1 runs inline,
+            None uses the CPU count
+
+    Yields:
+        FrameDrift: One per frame, in sequence order
+    """
+    reference_tint = _frame_tint(reference) if isinstance(reference, str) else background_tint(reference)
+    frames = iter_frames(source)
+
+    if workers == 1:
+        for index, label, frame in frames:
+            yield _drift(index, label, _frame_tint(frame), reference_tint, hue_threshold)
+        return
+
+    # Keep a bounded window of frames in flight so the sequence is never held whole
+    max_pending = 2 * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(workers) as executor:
+        pending = deque()
+        for index, label, frame in frames:
+            pending.append((index, label, executor.submit(_frame_tint, frame)))
+            if len(pending) >= max_pending:
+                index, label, future = pending.popleft()
+                yield _drift(index, label, future.result(), reference_tint, hue_threshold)
+        while pending:
+            index, label, future = pending.popleft()
+            yield _drift(index, label, future.result(), reference_tint, hue_threshold)
+
+
+def summarize_drift(drifts, distance_threshold=10):
+    """
+    Summarize a drift sequence.
+
+    Args:
+        drifts: Iterable of FrameDrift
+        distance_threshold (float): RGB distance counted as drifted
+
+    Returns:
+        dict: frames, drifted_frames (count beyond the threshold),
+            first_drifted (label or None), worst (label, distance and hue
+            text of the largest distance), hue_delta_range (min, max)
+    """
+    summary = {'frames': 0, 'drifted_frames': 0, 'first_drifted': None, 'worst': None, 'hue_delta_range': None}
+    worst = None
+    low = high = None
+    for drift in drifts:
+        summary['frames'] += 1
+        if drift.distance > distance_threshold:
+            summary['drifted_frames'] += 1
+            if summary['first_drifted'] is None:
+                summary['first_drifted'] = drift.label
+        if worst is None or drift.distance > worst.distance:
+            worst = drift
+        low = drift.hue_delta if low is None else min(low, drift.hue_delta)
+        high = drift.hue_delta if high is None else max(high, drift.hue_delta)
+    if worst is not None:
+        summary['worst'] = {'label': worst.label, 'distance': worst.distance, 'hue_text': worst.hue_text}
+        summary['hue_delta_range'] = (low, high)
+    return summary
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import sys
+
+    parser = argparse.ArgumentParser(description="Report background tint drift of frames against a reference still")
+    parser.add_argument('reference', help="reference still image")
+    parser.add_argument('frames', help="frame directory or animated GIF/APNG/TIFF")
+    parser.add_argument('--workers', type=int, default=1, help="worker processes (default: 1, 0 for CPU count)")
+    parser.add_argument('--hue-threshold', type=float, default=5, help="hue change treated as same (default: 5)")
+    parser.add_argument('--distance-threshold', type=float, default=10,
+                        help="RGB distance counted as drift in the summary (default: 10)")
+    args = parser.parse_args()
+
+    def stream():
+        for drift in analyze_tint_drift(args.reference, args.frames, args.hue_threshold, args.workers or None):
+            print(json.dumps(drift._asdict()), flush=True)
+            yield drift
+
+    print(json.dumps(summarize_drift(stream(), args.distance_threshold)), file=sys.stderr)